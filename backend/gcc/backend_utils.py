@@ -1,56 +1,38 @@
-from itertools import chain
 from shutil import copyfile
+import numpy as np
 import os
+import weight_storage
 
-#? Definition of the layer names/class names
-DENSE_LAYER = 'Dense'
-CONV_2D_LAYER = 'Conv2D'
-CONV_1D_LAYER = 'Conv1D'
-MAX_POOL_2D_LAYER = 'MaxPooling2D'
-MAX_POOL_1D_LAYER = 'MaxPooling1D'
-AVG_POOL_2D_LAYER = 'AveragePooling2D'
-AVG_POOL_1D_LAYER = 'AveragePooling1D'
-FLATTEN_LAYER = 'Flatten'
-ACTIVATION_LAYER = 'Activation'
-
-def replace_markers(file, markers):
-    """ Replaces all given markes in given file with their respective value"""
-    for marker, value in markers.items():
-        file = file.replace(marker,str(value))
-    return file
-
-def read_marker_file(filename):
-    """ Reads given filename"""
-    with open(filename, 'r') as file:
-        return file.read()
-
-def write_header_and_c_file(out_dir, c_file, c_file_name, h_file_source, h_file_name, exec_file):
-    """Writes header- and c-file in given output directory (created if necessary)"""
+#? The layer names and the backend-neutral shape helpers are defined in layer_utils, they are imported here for the modules of the GCC backend
+from layer_utils import (DENSE_LAYER, CONV_2D_LAYER, CONV_1D_LAYER, CONV_3D_LAYER, MAX_POOL_2D_LAYER, MAX_POOL_1D_LAYER, AVG_POOL_2D_LAYER, AVG_POOL_1D_LAYER,
+                         FLATTEN_LAYER, ACTIVATION_LAYER, DROPOUT_LAYER, CONV_LAYERS, ONE_DIMENSIONAL_LAYERS, WEIGHTED_LAYERS,
+                         get_output_dimensions, get_convolution_parameters, get_convolution_output_size, get_dilations, get_convolution_paddings, get_pool_sizes, get_strides, get_paddings,
+                         get_number_of_units, get_bias_start_indices, get_flatten_index, get_kernel_row_permutation, get_kernel_matrix, is_quantized, get_quantization_information)
+
+def write_executable_file(out_dir, exec_file):
+    """Copies the executable file (if given) in given output directory (created if necessary)"""
     #? Creating directory if not existing
     if not os.path.exists(out_dir):
         os.makedirs(out_dir)
 
-    c_filename = out_dir + '/' + c_file_name
-    with open(c_filename, 'w') as file:
-        file.write(c_file)
-
-    h_file_dest = out_dir + '/' + h_file_name
-
-    #? Copying files in defined output directory
-    copyfile(h_file_source, h_file_dest)
-
     if (exec_file is not None):
         exec_file_dest = out_dir + '/' + os.path.basename(out_dir) + os.path.splitext(exec_file)[-1]
         copyfile(exec_file, exec_file_dest)
 
 def convert_array_to_string(array):
     """Returns a string containing the given array"""
-    string = '{'
-    for value in array:
-        string = string + str(value) + ','
-    if (len(string)!=1):
-        string = string[:-1]
-    return string + '}'
+    return '{' + ','.join([str(value) for value in array]) + '}'
+
+def write_array_file(filename, chunks):
+    """Writes the values of the given numpy arrays as comma separated list to the given file, to be included into a C initializer.
+       Only one chunk is formatted at a time, so that the memory usage does not depend on the total number of values.
+       Floating point values are written with 9 significant digits, which represents each float value exactly"""
+    with open(filename, 'w') as file:
+        for chunk in chunks:
+            if (chunk.size == 0):
+                continue
+            number_format = '%.9g' if chunk.dtype.kind == 'f' else '%d'
+            file.write(','.join([number_format] * chunk.size) % tuple(chunk.tolist()) + ',\n')
 
 def get_number_of_layers(input):
     """Returns the number of layers in the neural network"""
@@ -67,196 +49,248 @@ def get_layer_types_string(input, layer_types):
         array.append(str(layer_types[layer['class_name'].lower()]))
     return convert_array_to_string(array)
 
-def get_output_dimensions(input):
-    """Returns an array with height values, an array with width values and an array with depth values of the given input"""
-    height_array = []
-    last_output_height=0
-    width_array = []
-    last_output_width=0
-    depth_array = []
-    last_output_depth =0
+def get_dilation_strings(input):
+    """Returns a string containing an array with vertical and a string containing an array with horizontal dilation rates of the given input"""
+    height_array, width_array = get_dilations(input)
+    return convert_array_to_string(height_array), convert_array_to_string(width_array)
 
-    for layer in input['config']['layers']:
-        input_height = last_output_height
-        input_width = last_output_width
-        input_depth = last_output_depth
-
-        if 'batch_input_shape' in layer['config']:
-            #? Extraction of 1st dimension (height)
-            height_array.append(layer['config']['batch_input_shape'][1])
-            input_height = layer['config']['batch_input_shape'][1]
-
-            last_output_height = input_height
-
-            #? Extraction of 2nd dimension (width)
-            if (len(layer['config']['batch_input_shape'])>2):
-                width_array.append(layer['config']['batch_input_shape'][2])
-                input_width = layer['config']['batch_input_shape'][2]
-
-                last_output_width = input_width
-
-                #? Extraction of 3rd dimension (depth)
-                if (len(layer['config']['batch_input_shape'])>3):
-                    depth_array.append(layer['config']['batch_input_shape'][3])
-                    input_depth = layer['config']['batch_input_shape'][3]
-
-                    last_output_depth = input_depth
-                else:
-                    depth_array.append(1)
-                    input_depth = 1
-                    last_output_depth = input_depth
-            else:
-                width_array.append(1)
-                input_width = 1
-                last_output_width = input_width
-                depth_array.append(1)
-                input_depth = 1
-                last_output_depth = input_depth
-
-        #? Differentiation between layer types and specific processing
-        if (layer['class_name']==DENSE_LAYER):
-            act_height = len(layer['kernel_values'][0])
-            act_width = 1
-            act_depth = 1
-        if (layer['class_name']==FLATTEN_LAYER):
-            act_height = last_output_height * last_output_width * last_output_depth
-            act_width = 1
-            act_depth = 1
-        if (layer['class_name']==AVG_POOL_1D_LAYER or layer['class_name']==MAX_POOL_1D_LAYER):
-            vertical_padding = 0
-            #? Only calculating padding if it is enabled in the layer definition
-            if (layer['config']['padding'].lower() == 'same'):
-                vertical_padding = int((layer['config']['pool_size'][0] - 1) / 2)
-
-            #? Calculating height in dependence of padding
-            act_height = ((input_height - layer['config']['pool_size'][0] + 2 * vertical_padding) / layer['config']['strides'][0]) + 1
-            act_width=1
-            act_depth = last_output_depth
-
-        if (layer['class_name']==AVG_POOL_2D_LAYER or layer['class_name']==MAX_POOL_2D_LAYER):
-            vertical_padding = 0
-            horizontal_padding = 0
-
-            #? Only calculating padding if it is enabled in the layer definition
-            if (layer['config']['padding'].lower() == 'same'):
-                vertical_padding = int((layer['config']['pool_size'][0] - 1) / 2)
-                horizontal_padding = int((layer['config']['pool_size'][1] - 1) / 2)
-
-            #? Calculating height and width in dependence of padding
-            act_height = ((input_height - layer['config']['pool_size'][0] + 2 * vertical_padding) / layer['config']['strides'][0]) + 1
-            act_width = ((input_width - layer['config']['pool_size'][1] + 2 * horizontal_padding) / layer['config']['strides'][1]) + 1
-            act_depth = last_output_depth
-
-        height_array.append(int(act_height))
-        width_array.append(int(act_width))
-        depth_array.append(int(act_depth))
-
-        last_output_height = act_height
-        last_output_width = act_width
-        last_output_depth = act_depth
-
-    return height_array, width_array, depth_array
+def get_convolution_padding_strings(input, layerOutputHeight, layerOutputWidth):
+    """Returns a string containing an array with the top and a string containing an array with the left padding of the convolution layers of the given input"""
+    top_array, left_array = get_convolution_paddings(input, layerOutputHeight, layerOutputWidth)
+    return convert_array_to_string(top_array), convert_array_to_string(left_array)
 
 def get_pool_size_strings(input):
-    """Returns an array with pool height values and an array with pool width values of the given input"""
-    width_array=[]
-    height_array=[]
-
-    for layer in input['config']['layers']:
-        if (layer['class_name']==MAX_POOL_2D_LAYER or layer['class_name']==AVG_POOL_2D_LAYER):
-            height_array.append(layer['config']['pool_size'][0])
-            width_array.append(layer['config']['pool_size'][1])
-        elif (layer['class_name']==MAX_POOL_1D_LAYER or layer['class_name']==AVG_POOL_1D_LAYER):
-            height_array.append(layer['config']['pool_size'][0])
-            width_array.append(1)
-        else:
-            height_array.append(0)
-            width_array.append(0)
-
+    """Returns a string containing an array with pool height values and a string containing an array with pool width values of the given input"""
+    height_array, width_array = get_pool_sizes(input)
     return convert_array_to_string(height_array), convert_array_to_string(width_array)
 
 def get_strides_strings(input):
-    """Returns an array with stride height values and an array with stride width values of the given input"""
-    width_array=[]
-    height_array=[]
-    for layer in input['config']['layers']:
-        if (layer['class_name']==MAX_POOL_2D_LAYER or layer['class_name']==AVG_POOL_2D_LAYER):
-            height_array.append(layer['config']['strides'][0])
-            width_array.append(layer['config']['strides'][1])
-        elif (layer['class_name']==MAX_POOL_1D_LAYER or layer['class_name']==AVG_POOL_1D_LAYER):
-            height_array.append(layer['config']['pool_size'][0])
-            width_array.append(1)
-        else:
-            height_array.append(0)
-            width_array.append(0)
-
+    """Returns a string containing an array with stride height values and a string containing an array with stride width values of the given input"""
+    height_array, width_array = get_strides(input)
     return convert_array_to_string(height_array), convert_array_to_string(width_array)
 
 def get_padding_string(input, padding_types):
-    array=[]
+    """Returns a string containing an array of indices representing the padding type for each layer"""
+    return convert_array_to_string(get_paddings(input, padding_types))
+
+def get_activation_functions(input, activation_functions):
+    """Returns an array of indices representing the activation function for each layer"""
+    array = []
     for layer in input['config']['layers']:
-        if (layer['class_name']==MAX_POOL_2D_LAYER or layer['class_name']==AVG_POOL_2D_LAYER):
-            array.append(padding_types[layer['config']['padding']])
+        #? Dictionary activation_functions contains the mapping to the indices
+        if (layer['class_name'] in WEIGHTED_LAYERS or layer['class_name']==ACTIVATION_LAYER):
+            array.append(activation_functions[layer['config']['activation'].lower()])
         else:
             array.append(0)
-
-    return convert_array_to_string(array)
+    return array
 
 def get_activation_function_string(input, activation_functions):
     """Returns a string containing an array of indices representing the activation function for each layer"""
-    array = []
-    for layer in input['config']['layers']:
-        #? Dictionary activation_functions contains the mapping to the indices
-        if (layer['class_name']==DENSE_LAYER):
-            array.append(str(activation_functions[layer['config']['activation'].lower()]))
-        else:
-            array.append('0')
-    return convert_array_to_string(array)
+    return convert_array_to_string(get_activation_functions(input, activation_functions))
 
-def get_bias_information(input):
-    """Returns a string containing an array of bools indicating the usage of biases,
-       a string containing an array of indices indicating the start position of biases for each layer,
-       and a flattened array of weights values"""
-    last_layer_values = 0
-    count=0
-    output= []
-    bias_indices_array=[]
+def get_number_of_unit_inputs(layer, layer_input_height):
+    """Returns the number of input values each unit of the given weighted layer is connected to, layer_input_height is the height of the input of the layer"""
+    if (layer['class_name']==DENSE_LAYER):
+        return layer_input_height
+    return int(np.prod(weight_storage.get_array(layer['kernel_values']).shape[:-1]))
+
+def get_use_bias(input):
+    """Returns an array of bools indicating the usage of biases for each layer"""
     use_bias_array = []
     for layer in input['config']['layers']:
-        if (layer['class_name']==DENSE_LAYER):
+        if (layer['class_name'] in WEIGHTED_LAYERS):
             use_bias_array.append(int(layer['config']['use_bias']))
-            bias_indices_array.append(int(last_layer_values))
-            last_layer_values = last_layer_values + layer['config']['units']
-            output.append(layer['bias_values'])
-            count = count + 1
         else:
             use_bias_array.append(0)
-            bias_indices_array.append(0)
+    return use_bias_array
+
+def get_bias_chunks(input):
+    """Yields the bias values of each weighted layer as flattened numpy array, layers without bias values yield zeros"""
+    for layer in input['config']['layers']:
+        if (layer['class_name'] in WEIGHTED_LAYERS):
+            if ('bias_values' in layer):
+                yield weight_storage.get_array(layer['bias_values']).reshape(-1)
+            else:
+                yield np.zeros(get_number_of_units(layer), dtype=np.float32)
+
+def get_number_of_biases(input):
+    """Returns the number of bias values of all weighted layers"""
+    return sum(get_number_of_units(layer) for layer in input['config']['layers'] if layer['class_name'] in WEIGHTED_LAYERS)
+
+def get_bias_information(input):
+    """Returns a string containing an array of bools indicating the usage of biases,
+       a string containing an array of indices indicating the start position of biases for each layer,
+       and a flattened numpy array of bias values"""
+    output = list(get_bias_chunks(input))
 
     #? Flattening the array before returning
-    bias_array = list(chain.from_iterable(output))
-    return convert_array_to_string(use_bias_array), convert_array_to_string(bias_indices_array), bias_array
+    bias_array = np.concatenate(output) if output else np.zeros(0)
+    return convert_array_to_string(get_use_bias(input)), convert_array_to_string(get_bias_start_indices(input)), bias_array
+
+def is_sparse(layer):
+    """Returns whether the weights of the given layer are stored as sparse matrix instead of the WEIGHTS, see the pruning conversion.
+       Quantized layers are always stored densely"""
+    return layer['class_name']==DENSE_LAYER and 'sparsity' in layer and 'quantization' not in layer
+
+def get_weights_row_length(number_of_previous_units, alignment):
+    """Returns the number of elements of a row of weights in the unit major layout, padded to a multiple of alignment"""
+    return int((number_of_previous_units + alignment - 1) // alignment) * alignment
+
+def get_weight_alignment(input, layerOutputHeight, simd_width=4, max_overhead=0.125):
+    """Returns simd_width if padding the rows of weights of all weighted layers to a multiple of simd_width
+       increases the number of weights by at most max_overhead, otherwise 1"""
+    number_of_weights = 0
+    number_of_padded_weights = 0
+    count = 0
+    for layer in input['config']['layers']:
+        if (layer['class_name'] in WEIGHTED_LAYERS and not is_sparse(layer)):
+            unit_inputs = get_number_of_unit_inputs(layer, layerOutputHeight[count])
+            number_of_weights = number_of_weights + get_number_of_units(layer) * unit_inputs
+            number_of_padded_weights = number_of_padded_weights + get_number_of_units(layer) * get_weights_row_length(unit_inputs, simd_width)
+        count = count + 1
 
-def get_weight_information(input, layerOutputHeight):
-    """Returns a string containing an array of indices indicating the start position of weights for each layer,
-       and a flattened array of weights values"""
+    if (number_of_padded_weights <= number_of_weights * (1 + max_overhead)):
+        return simd_width
+    return 1
+
+def get_weight_start_indices(input, layerOutputHeight, alignment=1):
+    """Returns an array of indices indicating the start position of weights for each layer,
+       the rows of weights are padded to a multiple of alignment"""
     previous_layer_values = 0
-    units_previous_dense_layer = 0
     count=0
-    is_first_dense_layer=True
-    output= []
     weights_indices_array=[]
     for layer in input['config']['layers']:
-        if (layer['class_name']==DENSE_LAYER):
+        if (layer['class_name'] in WEIGHTED_LAYERS and not is_sparse(layer)):
             weights_indices_array.append(int(previous_layer_values))
-            previous_layer_values = previous_layer_values + int(layer['config']['units']) * layerOutputHeight[count]
-
-            units_previous_dense_layer = int(layer['config']['units'])
-            output.append(list(chain.from_iterable(layer['kernel_values'])))
+            previous_layer_values = previous_layer_values + get_number_of_units(layer) * get_weights_row_length(get_number_of_unit_inputs(layer, layerOutputHeight[count]), alignment)
         else:
             weights_indices_array.append(0)
         count = count + 1
+    return weights_indices_array
+
+def get_number_of_weights(input, layerOutputHeight, alignment=1):
+    """Returns the number of weight values of all weighted layers, the rows of weights are padded to a multiple of alignment"""
+    number_of_weights = 0
+    count = 0
+    for layer in input['config']['layers']:
+        if (layer['class_name'] in WEIGHTED_LAYERS and not is_sparse(layer)):
+            number_of_weights = number_of_weights + get_number_of_units(layer) * get_weights_row_length(get_number_of_unit_inputs(layer, layerOutputHeight[count]), alignment)
+        count = count + 1
+    return number_of_weights
+
+def get_weight_chunks(input, layout='input_major', alignment=1, chunk_size=65536):
+    """Yields the weight values of all weighted layers as flattened numpy arrays of about chunk_size elements, see get_kernel_matrix.
+       In the 'input_major' layout the weights of each input value are stored contiguously,
+       in the 'unit_major' layout the weights of each unit are stored contiguously and each row is padded with zeros to a multiple of alignment.
+       The weights of sparse layers are not included, see get_sparse_weight_chunks"""
+    if (layout not in ['input_major', 'unit_major']):
+        raise ValueError('Unknown weight layout "' + layout + '"')
+
+    layerOutputHeight, layerOutputWidth, layerOutputDepth = get_output_dimensions(input)
+    for index, layer in enumerate(input['config']['layers']):
+        if (layer['class_name'] in WEIGHTED_LAYERS and not is_sparse(layer)):
+            kernel = weight_storage.get_array(layer['kernel_values'])
+            permutation = None
+            if (layer['class_name'] in CONV_LAYERS):
+                kernel = get_kernel_matrix(input, index, layerOutputHeight, layerOutputWidth, layerOutputDepth)
+            else:
+                permutation = get_kernel_row_permutation(input, index, layerOutputHeight, layerOutputWidth, layerOutputDepth)
+
+            if (layout == 'unit_major'):
+                #? Transposing the kernel for a number of units at a time, so that each row contains the weights of one unit
+                row_length = get_weights_row_length(kernel.shape[0], alignment)
+                units_per_chunk = max(1, chunk_size // row_length)
+                for unit_index in range(0, kernel.shape[1], units_per_chunk):
+                    rows = kernel[:, unit_index:unit_index + units_per_chunk]
+                    if (permutation is not None):
+                        rows = rows[permutation]
+                    yield np.pad(rows.T, ((0, 0), (0, row_length - kernel.shape[0]))).reshape(-1)
+            else:
+                #? Permuting the rows for a number of input values at a time
+                rows_per_chunk = max(1, chunk_size // kernel.shape[1])
+                for row_index in range(0, kernel.shape[0], rows_per_chunk):
+                    rows = slice(row_index, row_index + rows_per_chunk) if permutation is None else permutation[row_index:row_index + rows_per_chunk]
+                    yield kernel[rows].reshape(-1)
+
+def get_weight_information(input, layerOutputHeight, layout='input_major', alignment=1):
+    """Returns a string containing an array of indices indicating the start position of weights for each layer,
+       and a flattened numpy array of weights values in the given layout, see get_weight_chunks"""
+    if (layout == 'input_major'):
+        alignment = 1
+    output = list(get_weight_chunks(input, layout, alignment))
 
     #? Flattening the array before returning
-    weights_array = list(chain.from_iterable(output))
-    return convert_array_to_string(weights_indices_array), weights_array
\ No newline at end of file
+    weights_array = np.concatenate(output) if output else np.zeros(0)
+    return convert_array_to_string(get_weight_start_indices(input, layerOutputHeight, alignment)), weights_array
+
+def get_sparse_layers(input):
+    """Returns an array of bools indicating whether the weights of each layer are stored as sparse matrix"""
+    return [int(is_sparse(layer)) for layer in input['config']['layers']]
+
+def get_sparse_rows_start_indices(input):
+    """Returns an array of indices indicating the start position of the rows of each sparse layer in the array of row start indices,
+       each sparse layer has one row for each unit and an additional entry for the end of its last row"""
+    previous_layer_rows = 0
+    rows_indices_array = []
+    for layer in input['config']['layers']:
+        if (is_sparse(layer)):
+            rows_indices_array.append(int(previous_layer_rows))
+            previous_layer_rows = previous_layer_rows + get_number_of_units(layer) + 1
+        else:
+            rows_indices_array.append(0)
+    return rows_indices_array
+
+def get_number_of_sparse_rows(input):
+    """Returns the number of row start indices of all sparse layers"""
+    return sum(get_number_of_units(layer) + 1 for layer in input['config']['layers'] if is_sparse(layer))
+
+def get_number_of_sparse_weights(input):
+    """Returns the number of non-zero weights of all sparse layers"""
+    return sum(int(np.count_nonzero(weight_storage.get_array(layer['kernel_values']))) for layer in input['config']['layers'] if is_sparse(layer))
+
+def get_sparse_weight_chunks(input):
+    """Yields a tuple of flattened numpy arrays for each sparse layer in compressed sparse row format: the non-zero weights,
+       the index of the input value each non-zero weight is multiplied with and the index of the first non-zero weight of each row.
+       Each row holds the weights of one unit, the last index of a layer is the end of its last row. The indices of the non-zero weights
+       continue over all sparse layers, the input values are in the layout of the c-file, see get_kernel_matrix"""
+    layerOutputHeight, layerOutputWidth, layerOutputDepth = get_output_dimensions(input)
+    previous_layer_values = 0
+    for index, layer in enumerate(input['config']['layers']):
+        if (is_sparse(layer)):
+            rows = get_kernel_matrix(input, index, layerOutputHeight, layerOutputWidth, layerOutputDepth).T
+            row_indices, column_indices = np.nonzero(rows)
+            row_starts = np.concatenate(([0], np.cumsum(np.bincount(row_indices, minlength=rows.shape[0])))) + previous_layer_values
+            previous_layer_values = previous_layer_values + row_indices.size
+            yield rows[row_indices, column_indices], column_indices.astype(np.uint16), row_starts
+
+def get_half_precision_dtype(input):
+    """Returns the dtype the weights and biases of the given input are stored as by the float2half conversion ('float16' or 'bfloat16'),
+       or None if they are stored as float values"""
+    dtypes = [layer['half_precision']['dtype'] if 'half_precision' in layer else None for layer in input['config']['layers'] if layer['class_name'] in WEIGHTED_LAYERS]
+    if (len(set(dtypes)) > 1):
+        raise ValueError('Either all or none of the weighted layers must be converted to the same half precision dtype')
+    if (dtypes and dtypes[0] is not None and is_quantized(input)):
+        raise ValueError('Models with quantized weights can not store their weights as half precision values')
+    return dtypes[0] if dtypes else None
+
+def get_half_precision_chunks(chunks, dtype):
+    """Yields the given chunks of float values as numpy arrays of the uint16 bits of IEEE half precision ('float16') or bfloat16 ('bfloat16') values.
+       Values which are not representable are rounded to the nearest value, ties to the value with an even last bit. If dtype is None the chunks are yielded unchanged"""
+    for chunk in chunks:
+        if (dtype is None):
+            yield chunk
+        elif (dtype == 'float16'):
+            yield np.asarray(chunk, dtype=np.float32).astype(np.float16).view(np.uint16)
+        else:
+            bits = np.ascontiguousarray(chunk, dtype=np.float32).view(np.uint32).astype(np.uint64)
+            yield ((bits + 0x7fff + ((bits >> 16) & 1)) >> 16).astype(np.uint16)
+
+def get_quantized_input_size(input, layerOutputHeight):
+    """Returns the number of elements required to hold the largest quantized input of a dense layer"""
+    buffer_size = 1
+    count = 0
+    for layer in input['config']['layers']:
+        if (layer['class_name']==DENSE_LAYER):
+            buffer_size = max(buffer_size, layerOutputHeight[count])
+        count = count + 1
+    return buffer_size
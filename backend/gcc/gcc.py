@@ -1,6 +1,9 @@
 from plugin_collection import BackendPlugin
 import backend.gcc.backend_utils as backend_utils
-import os
+import backend.gcc.memory_planner as memory_planner
+import backend.gcc.specialized_codegen as specialized_codegen
+import backend.gcc.template_engine as template_engine
+import warnings
 
 class GCC(BackendPlugin):
     """GCC backend plugin translates the intermediate format to native C-code"""
@@ -12,29 +15,110 @@ class GCC(BackendPlugin):
                    'averagepooling1d':4, 'averagepooling2d':4, 'averagepooling3d':4,
                    'conv1d':5, 'conv2d':5,'conv3d':5, 'dropout':0, 'activation':6}
     padding_types = {'valid':0, 'same':1}
+    #? Available code generation modes, table-driven code is compact while specialized code is faster
+    codegen_modes = ['table', 'specialized']
+    #? Available convolution variants, direct convolutions require no additional memory while im2col convolutions are faster on hosts with caches
+    convolution_modes = ['direct', 'im2col']
+    #? Available activation modes, exact activation functions use the math library while fast ones approximate the exponential function
+    activation_modes = ['exact', 'fast']
+    #? Half precision dtypes of the weights and biases as numbered by NNT_WEIGHTS_HALF
+    half_precision_dtypes = ['float16', 'bfloat16']
+    #? Files the weight and bias values are written to, included by the c-file
+    weights_file_name = 'nn_model_weights.h'
+    biases_file_name = 'nn_model_biases.h'
+    #? Files the non-zero weights of sparse layers, their input indices and the start indices of their rows are written to
+    sparse_weights_file_name = 'nn_model_sparse_weights.h'
+    sparse_columns_file_name = 'nn_model_sparse_columns.h'
+    sparse_rows_file_name = 'nn_model_sparse_rows.h'
 
     def __init__(self):
         super().__init__('gcc','GCC Backend Plugin', None)
 
-    def translate_to_native_code(self, input, outputfile, executable_file):
-        """Translates the given input (intermediate format) to native C-code and writes a header- and a c-file"""
-
-        markers = self.build_markers(input)
-
-        #? Reading the c file with markers and replacing them with the markers array
-        c_file = backend_utils.replace_markers(backend_utils.read_marker_file('./backend/gcc/nn_model.c-template'), markers)
+    def translate_to_native_code(self, input, outputfile, executable_file, options=None):
+        """Translates the given input (intermediate format) to native C-code and writes a header- and a c-file.
+           The option 'codegen' selects between table-driven ('table', default) and specialized code ('specialized'),
+           the option 'weight_alignment' sets the multiple the rows of weights are padded to ('auto' by default),
+           the option 'convolution' selects between direct ('direct', default) and matrix multiplication based convolutions ('im2col'),
+           the option 'activations' selects between exact ('exact', default) and approximated activation functions ('fast').
+           Returns a summary dict with the statically allocated memory of the generated code"""
+        if (options is None):
+            options = dict()
+
+        codegen = options.get('codegen', 'table')
+        if (codegen not in self.codegen_modes):
+            raise ValueError('Unknown codegen mode "' + codegen + '", available modes: ' + ', '.join(self.codegen_modes))
+
+        weight_alignment = options.get('weight_alignment', 'auto')
+        if (weight_alignment != 'auto'):
+            if (not str(weight_alignment).isdigit() or int(weight_alignment) < 1):
+                raise ValueError('Invalid weight alignment "' + str(weight_alignment) + '", must be auto or a positive integer')
+            weight_alignment = int(weight_alignment)
+
+        convolution = options.get('convolution', 'direct')
+        if (convolution not in self.convolution_modes):
+            raise ValueError('Unknown convolution mode "' + convolution + '", available modes: ' + ', '.join(self.convolution_modes))
+
+        activations = options.get('activations', 'exact')
+        if (activations not in self.activation_modes):
+            raise ValueError('Unknown activation mode "' + activations + '", available modes: ' + ', '.join(self.activation_modes))
+
+        memory_plan = memory_planner.plan_memory(input, convolution)
+        markers = self.build_markers(input, None if weight_alignment == 'auto' else weight_alignment, memory_plan)
+        markers['###specializedCodegen###'] = int(codegen == 'specialized')
+        markers['###convolutionIm2col###'] = int(convolution == 'im2col')
+        markers['###fastActivations###'] = int(activations == 'fast')
+
+        h_template = template_engine.load_template('./backend/gcc/nn_model.h-template')
+        c_template = template_engine.load_template('./backend/gcc/nn_model.c-template')
+        table_template = template_engine.load_template('./backend/gcc/nn_model_table.c-template')
+
+        #? Building the model code either from the layer tables or specialized for each layer
+        if (codegen == 'specialized'):
+            markers['###modelCode###'] = specialized_codegen.get_model_code(input, self.layer_types, self.activation_functions, self.padding_types, markers['###weightsRowAlignment###'], memory_plan, convolution)
+        else:
+            markers['###modelCode###'] = table_template.render_to_string(markers)
+
+        #? Markers which are not used by any template indicate an inconsistency between the backend and the templates
+        unused_markers = template_engine.get_unused_markers(markers, [h_template, c_template, table_template])
+        if (unused_markers):
+            warnings.warn('Markers not used by any template of the GCC backend: ' + ', '.join(unused_markers))
 
         #? Creating directory if not existing
-        out_dir_path = '_out/' + os.path.splitext(outputfile)[0]
-        h_file_source_path = './backend/gcc/nn_model.h-template'
+        out_dir_path = self.get_output_directory(outputfile)
         c_file_name = 'nn_model.c'
         h_file_name = 'nn_model.h'
 
-        backend_utils.write_header_and_c_file(out_dir_path, c_file, c_file_name, h_file_source_path, h_file_name, executable_file)
-
-    def build_markers(self, input):
-        """Returns a markers dict built from intermediate input information """
+        #? Writing the header and the c file in one pass from the parsed templates
+        backend_utils.write_executable_file(out_dir_path, executable_file)
+        with open(out_dir_path + '/' + h_file_name, 'w') as file:
+            h_template.render(markers, file)
+        with open(out_dir_path + '/' + c_file_name, 'w') as file:
+            c_template.render(markers, file)
+        self.write_weight_files(input, out_dir_path, markers['###weightsRowAlignment###'])
+
+        return {'Peak RAM of predict (bytes)': markers['###peakRamBytes###'],
+                'RAM of predict_batch per sample of a tile (bytes)': markers['###batchRamBytesPerSample###']}
+
+    def write_weight_files(self, input, out_dir, weight_alignment):
+        """Writes the weight and bias values to the files included by the c-file. The values are streamed in chunks,
+           so that the memory usage does not depend on the size of the model. Half precision values are written as their bits"""
+        dtype = backend_utils.get_half_precision_dtype(input)
+        backend_utils.write_array_file(out_dir + '/' + self.weights_file_name, backend_utils.get_half_precision_chunks(backend_utils.get_weight_chunks(input, 'unit_major', weight_alignment), dtype))
+        backend_utils.write_array_file(out_dir + '/' + self.biases_file_name, backend_utils.get_half_precision_chunks(backend_utils.get_bias_chunks(input), dtype))
+
+        #? The sparse layers are read once for each file, so that only the arrays of a single layer are held at a time
+        if (any(backend_utils.get_sparse_layers(input))):
+            backend_utils.write_array_file(out_dir + '/' + self.sparse_weights_file_name, backend_utils.get_half_precision_chunks((values for values, _, _ in backend_utils.get_sparse_weight_chunks(input)), dtype))
+            backend_utils.write_array_file(out_dir + '/' + self.sparse_columns_file_name, (columns for _, columns, _ in backend_utils.get_sparse_weight_chunks(input)))
+            backend_utils.write_array_file(out_dir + '/' + self.sparse_rows_file_name, (rows for _, _, rows in backend_utils.get_sparse_weight_chunks(input)))
+
+    def build_markers(self, input, weight_alignment=None, memory_plan=None):
+        """Returns a markers dict built from intermediate input information.
+           The rows of weights are padded to a multiple of weight_alignment, chosen automatically if None.
+           The buffers are located at the offsets of the given MemoryPlan, planned for the input if None"""
         markers = dict()
+        if (memory_plan is None):
+            memory_plan = memory_planner.plan_memory(input)
 
         #? common markers
         markers['###numberLayers###'] = backend_utils.get_number_of_layers(input)
@@ -46,19 +130,58 @@ class GCC(BackendPlugin):
         markers['###layerOutputHeight###'] = backend_utils.convert_array_to_string(layerOutputHeight)
         markers['###layerOutputDepth###'] = backend_utils.convert_array_to_string(layerOutputDepth)
 
+        #? Static memory markers, the arena holds the layer outputs and the im2col column buffers
+        markers['###arenaSize###'] = memory_plan.arena_size
+        markers['###layerOutputOffsets###'] = backend_utils.convert_array_to_string(memory_plan.output_offsets)
+        markers['###columnBufferOffsets###'] = backend_utils.convert_array_to_string(memory_plan.column_offsets)
+        markers['###im2colBlock###'] = memory_planner.IM2COL_BLOCK
+
         #? Dense layer specific markers
         markers['###activationFunctions###'] = backend_utils.get_activation_function_string(input, self.activation_functions)
 
-        weight_indices_string, weights_array = backend_utils.get_weight_information(input, layerOutputHeight)
-        markers['###weights###'] = backend_utils.convert_array_to_string(weights_array)
-        markers['###dimWeights###'] = len(weights_array)
-        markers['###indicesWeights###'] = weight_indices_string
-
-        use_bias_string, bias_indices_string, bias_array = backend_utils.get_bias_information(input)
-        markers['###bias###'] = backend_utils.convert_array_to_string(bias_array)
-        markers['###dimBias###'] = len(bias_array)
-        markers['###indicesBias###'] = bias_indices_string
-        markers['###useBias###'] = use_bias_string
+        #? The weights of each unit are stored contiguously, so that the dense kernels stream them from memory
+        if (weight_alignment is None):
+            weight_alignment = backend_utils.get_weight_alignment(input, layerOutputHeight)
+        markers['###weightsRowAlignment###'] = weight_alignment
+
+        #? The weight and bias values are written to separate files by write_weight_files and included by the c-file
+        markers['###weights###'] = '{\n#include "' + self.weights_file_name + '"\n}'
+        #? The weights of sparse layers are not contained in WEIGHTS, which holds at least one element if all dense layers are sparse
+        markers['###dimWeights###'] = max(1, backend_utils.get_number_of_weights(input, layerOutputHeight, weight_alignment))
+        markers['###indicesWeights###'] = backend_utils.convert_array_to_string(backend_utils.get_weight_start_indices(input, layerOutputHeight, weight_alignment))
+
+        markers['###bias###'] = '{\n#include "' + self.biases_file_name + '"\n}'
+        markers['###dimBias###'] = backend_utils.get_number_of_biases(input)
+        markers['###indicesBias###'] = backend_utils.convert_array_to_string(backend_utils.get_bias_start_indices(input))
+        markers['###useBias###'] = backend_utils.convert_array_to_string(backend_utils.get_use_bias(input))
+
+        #? Sparse weight specific markers, the sparse matrices are only compiled if any layer is marked as sparse by the pruning conversion
+        sparse_layers = backend_utils.get_sparse_layers(input)
+        markers['###sparseWeightsEnabled###'] = int(any(sparse_layers))
+        markers['###sparseLayers###'] = backend_utils.convert_array_to_string(sparse_layers)
+        markers['###sparseWeights###'] = '{\n#include "' + self.sparse_weights_file_name + '"\n}'
+        markers['###sparseColumns###'] = '{\n#include "' + self.sparse_columns_file_name + '"\n}'
+        markers['###sparseRows###'] = '{\n#include "' + self.sparse_rows_file_name + '"\n}'
+        markers['###dimSparseWeights###'] = max(1, backend_utils.get_number_of_sparse_weights(input))
+        markers['###dimSparseRows###'] = max(1, backend_utils.get_number_of_sparse_rows(input))
+        markers['###indicesSparseRows###'] = backend_utils.convert_array_to_string(backend_utils.get_sparse_rows_start_indices(input))
+
+        #? Quantization specific markers, the scales are only compiled if the weights are quantized
+        quantized = backend_utils.is_quantized(input)
+        kernel_scales, kernel_zero_points = backend_utils.get_quantization_information(input)
+        markers['###weightsInt8###'] = int(quantized)
+        markers['###weightType###'] = 'int8_t' if quantized else 'weight_value'
+        markers['###kernelScales###'] = backend_utils.convert_array_to_string(kernel_scales)
+        markers['###kernelZeroPoints###'] = backend_utils.convert_array_to_string(kernel_zero_points)
+        markers['###quantizedInputSize###'] = backend_utils.get_quantized_input_size(input, layerOutputHeight)
+
+        #? Half precision specific markers, the kernels widen the stored values to float values
+        half_precision_dtype = backend_utils.get_half_precision_dtype(input)
+        markers['###weightsHalf###'] = self.half_precision_dtypes.index(half_precision_dtype) + 1 if half_precision_dtype is not None else 0
+
+        #? The quantized input of dense layers is only allocated if the weights are quantized
+        markers['###batchRamBytesPerSample###'] = memory_plan.arena_size * 4
+        markers['###peakRamBytes###'] = markers['###batchRamBytesPerSample###'] + (markers['###quantizedInputSize###'] if quantized else 0)
 
         #? Pooling layer specific markers
         poolHeights, poolWidths = backend_utils.get_pool_size_strings(input)
@@ -70,4 +193,12 @@ class GCC(BackendPlugin):
         markers['###verticalStride###'] = verticalStrides
         markers['###padding###'] = backend_utils.get_padding_string(input, self.padding_types)
 
+        #? Convolution layer specific markers, kernel sizes and strides are stored with the pool sizes and strides
+        verticalDilations, horizontalDilations = backend_utils.get_dilation_strings(input)
+        markers['###horizontalDilation###'] = horizontalDilations
+        markers['###verticalDilation###'] = verticalDilations
+        paddingTops, paddingLefts = backend_utils.get_convolution_padding_strings(input, layerOutputHeight, layerOutputWidth)
+        markers['###paddingLeft###'] = paddingLefts
+        markers['###paddingTop###'] = paddingTops
+
         return markers
\ No newline at end of file
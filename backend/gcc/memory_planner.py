@@ -0,0 +1,92 @@
+import backend.gcc.backend_utils as backend_utils
+
+#? Layer classes whose output is their unchanged input, their output shares the buffer of their input
+ALIAS_LAYERS = [backend_utils.FLATTEN_LAYER, backend_utils.DROPOUT_LAYER]
+#? Number of output positions whose input patches are held in the column buffer of a convolution layer with im2col, see NNT_IM2COL_BLOCK
+IM2COL_BLOCK = 64
+
+class Buffer(object):
+    """Buffer in the arena which is live from the layer with index first_step up to and including the layer with index last_step.
+       The size is given in float elements"""
+
+    def __init__(self, name, size, first_step, last_step):
+        self.name = name
+        self.size = size
+        self.first_step = first_step
+        self.last_step = last_step
+        self.offset = None
+
+    def overlaps(self, other):
+        """Returns whether the lifetimes of this and the given buffer overlap, such buffers must not share memory"""
+        return self.first_step <= other.last_step and other.first_step <= self.last_step
+
+class MemoryPlan(object):
+    """Offsets of all layer outputs and temporary buffers in one shared arena.
+       The offsets are indexed like the layers of the model (without the input layer), layers without such a buffer have offset 0"""
+
+    def __init__(self, buffers, output_offsets, column_offsets):
+        self.buffers = buffers
+        self.output_offsets = output_offsets
+        self.column_offsets = column_offsets
+        self.arena_size = max([buffer.offset + buffer.size for buffer in buffers], default=1)
+
+    def get_lower_bound(self):
+        """Returns the largest number of elements which are live at the same time, no arrangement of the buffers requires less memory"""
+        steps = [step for buffer in self.buffers for step in (buffer.first_step, buffer.last_step)]
+        return max([sum(buffer.size for buffer in self.buffers if buffer.first_step <= step <= buffer.last_step) for step in steps], default=1)
+
+def get_buffers(input, heights, widths, depths, convolution='direct'):
+    """Returns a list of the buffers of the given model with their lifetimes, together with the output buffer and the column buffer
+       of each layer (None for layers without such a buffer). The input of the model is not located in the arena.
+       Column buffers are only required by convolution layers if convolution is 'im2col', pooling layers read their input in place"""
+    pool_heights, pool_widths = backend_utils.get_pool_sizes(input)
+
+    buffers = []
+    output_buffers = []
+    column_buffers = []
+    current_buffer = None
+
+    for index, layer in enumerate(input['config']['layers']):
+        #? The current buffer is read by this layer, layers without transformation extend its lifetime
+        if (current_buffer is not None):
+            current_buffer.last_step = index
+        if (layer['class_name'] in ALIAS_LAYERS):
+            output_buffers.append(None)
+            column_buffers.append(None)
+            continue
+
+        #? The input patches of a block of output positions are only live during the layer, see convolution_im2col_apply
+        column_buffer = None
+        if (convolution == 'im2col' and layer['class_name'] in backend_utils.CONV_LAYERS):
+            patch_length = pool_heights[index] * pool_widths[index] * depths[index]
+            column_buffer = Buffer('columns_' + str(index), min(heights[index + 1] * widths[index + 1], IM2COL_BLOCK) * patch_length, index, index)
+            buffers.append(column_buffer)
+
+        current_buffer = Buffer('output_' + str(index), heights[index + 1] * widths[index + 1] * depths[index + 1], index, index)
+        buffers.append(current_buffer)
+        output_buffers.append(current_buffer)
+        column_buffers.append(column_buffer)
+
+    return buffers, output_buffers, column_buffers
+
+def assign_offsets(buffers):
+    """Assigns an offset in the arena to each of the given buffers. The largest buffers are placed first, each at the lowest offset
+       which does not overlap a placed buffer that is live at the same time"""
+    placed = []
+    for buffer in sorted(buffers, key=lambda buffer: (-buffer.size, buffer.first_step)):
+        offset = 0
+        for other in sorted((other for other in placed if other.overlaps(buffer)), key=lambda other: other.offset):
+            if (offset + buffer.size <= other.offset):
+                break
+            offset = max(offset, other.offset + other.size)
+        buffer.offset = offset
+        placed.append(buffer)
+
+def plan_memory(input, convolution='direct'):
+    """Returns the MemoryPlan of the given model in intermediate format for the given convolution variant ('direct' or 'im2col')"""
+    heights, widths, depths = backend_utils.get_output_dimensions(input)
+    buffers, output_buffers, column_buffers = get_buffers(input, heights, widths, depths, convolution)
+    assign_offsets(buffers)
+    output_offsets = [0 if buffer is None else buffer.offset for buffer in output_buffers]
+    column_offsets = [0 if buffer is None else buffer.offset for buffer in column_buffers]
+    return MemoryPlan(buffers, output_offsets, column_offsets)
@@ -0,0 +1,263 @@
+import backend.gcc.backend_utils as backend_utils
+import backend.gcc.memory_planner as memory_planner
+
+#? Layer type indices as defined in the layer_types dictionary of the GCC backend
+LT_DENSE = 1
+LT_MAX_POOLING = 3
+LT_AVG_POOLING = 4
+LT_CONVOLUTION = 5
+LT_ACTIVATION = 6
+
+def get_dense_function(number_of_previous_units, number_of_current_units, use_bias, activation_name, quantized=False):
+    """Returns the name and the C definition of a dense layer function with literal sizes,
+       quantized functions use the int8 kernel and receive the scales and zero points as arguments"""
+    name = 'dense_' + str(number_of_previous_units) + 'x' + str(number_of_current_units) + '_' + activation_name
+    if (not use_bias):
+        name = name + '_nobias'
+
+    if (quantized):
+        name = name + '_int8'
+        parameters = 'const int8_t weights[], const float kernel_scales[], const int8_t kernel_zero_points[], const float biases[]'
+        arguments = (str(number_of_previous_units) + ', ' + str(number_of_current_units) + ', weights, 0, kernel_scales, kernel_zero_points, biases, 0, '
+                     + str(int(use_bias)) + ', af_' + activation_name)
+        comment = '/* Dense layer with ' + str(number_of_previous_units) + ' inputs, ' + str(number_of_current_units) + ' units, int8 weights and ' + activation_name + ' activation function */\n'
+        definition = (comment +
+                      'static void ' + name + '(const float * input, float * output, ' + parameters + ')\n'
+                      '{\n'
+                      '  dense_int8_apply(input, output, QUANTIZED_INPUT, ' + arguments + ');\n'
+                      '}\n\n'
+                      'static void ' + name + '_batch(const float * input, float * output, uint32_t number_of_samples, ' + parameters + ')\n'
+                      '{\n'
+                      '  uint32_t sample_index;\n'
+                      '  for (sample_index = 0; sample_index < number_of_samples; sample_index++)\n'
+                      '  {\n'
+                      '    dense_int8_apply(input + sample_index * ' + str(number_of_previous_units) + ', output + sample_index * ' + str(number_of_current_units)
+                      + ', QUANTIZED_INPUT, ' + arguments + ');\n'
+                      '  }\n'
+                      '}\n')
+        return name, definition
+
+    arguments = str(number_of_previous_units) + ', ' + str(number_of_current_units) + ', weights, 0, biases, 0, ' + str(int(use_bias)) + ', af_' + activation_name
+    definition = ('/* Dense layer with ' + str(number_of_previous_units) + ' inputs, ' + str(number_of_current_units) + ' units and ' + activation_name + ' activation function */\n'
+                  'static void ' + name + '(const float * input, float * output, const weight_value weights[], const weight_value biases[])\n'
+                  '{\n'
+                  '  dense_apply(input, output, ' + arguments + ');\n'
+                  '}\n\n'
+                  'static void ' + name + '_batch(const float * input, float * output, uint32_t number_of_samples, const weight_value weights[], const weight_value biases[])\n'
+                  '{\n'
+                  '  dense_batch_apply(input, output, number_of_samples, ' + arguments + ');\n'
+                  '}\n')
+    return name, definition
+
+def get_dense_sparse_function(number_of_previous_units, number_of_current_units, use_bias, activation_name):
+    """Returns the name and the C definition of a dense layer function with literal sizes for weights stored as sparse matrix.
+       The functions receive the rows of the layer, so that layers of the same size share the function"""
+    name = 'dense_' + str(number_of_previous_units) + 'x' + str(number_of_current_units) + '_' + activation_name
+    if (not use_bias):
+        name = name + '_nobias'
+    name = name + '_sparse'
+
+    parameters = 'const weight_value weights[], const uint16_t columns[], const uint32_t rows[], const weight_value biases[]'
+    arguments = 'weights, columns, rows, 0, biases, 0, ' + str(int(use_bias)) + ', af_' + activation_name
+    definition = ('/* Dense layer with ' + str(number_of_previous_units) + ' inputs, ' + str(number_of_current_units) + ' units, sparse weights and ' + activation_name + ' activation function */\n'
+                  'static void ' + name + '(const float * input, float * output, ' + parameters + ')\n'
+                  '{\n'
+                  '  dense_sparse_apply(input, output, ' + str(number_of_current_units) + ', ' + arguments + ');\n'
+                  '}\n\n'
+                  'static void ' + name + '_batch(const float * input, float * output, uint32_t number_of_samples, ' + parameters + ')\n'
+                  '{\n'
+                  '  dense_sparse_batch_apply(input, output, number_of_samples, ' + str(number_of_previous_units) + ', ' + str(number_of_current_units) + ', ' + arguments + ');\n'
+                  '}\n')
+    return name, definition
+
+def get_per_sample_function(name, comment, call, input_length, output_length, parameters=''):
+    """Returns the C definition of a layer function which applies the given kernel call to each sample.
+       The given parameters are appended to the parameters of both functions"""
+    return ('/* ' + comment + ' */\n'
+            'static void ' + name + '(const float * input, float * output' + parameters + ')\n'
+            '{\n'
+            '  ' + call.replace('###input###', 'input').replace('###output###', 'output') + ';\n'
+            '}\n\n'
+            'static void ' + name + '_batch(const float * input, float * output, uint32_t number_of_samples' + parameters + ')\n'
+            '{\n'
+            '  uint32_t sample_index;\n'
+            '  for (sample_index = 0; sample_index < number_of_samples; sample_index++)\n'
+            '  {\n'
+            '    ' + call.replace('###input###', 'input + sample_index * ' + str(input_length)).replace('###output###', 'output + sample_index * ' + str(output_length)) + ';\n'
+            '  }\n'
+            '}\n')
+
+def get_pooling_function(pooling_type, input_dimensions, output_dimensions, pool_size, strides, padding_name):
+    """Returns the name and the C definition of a pooling layer function with literal sizes, windows of layers with padding_same are clamped to the input"""
+    input_rows, input_columns, input_depth = input_dimensions
+    output_rows, output_columns, output_depth = output_dimensions
+    type_name = 'max' if pooling_type == LT_MAX_POOLING else 'avg'
+
+    name = (type_name + '_pooling_' + str(input_rows) + 'x' + str(input_columns) + 'x' + str(input_depth)
+            + '_' + str(pool_size[0]) + 'x' + str(pool_size[1]) + '_s' + str(strides[0]) + 'x' + str(strides[1]) + '_' + padding_name)
+    call = ('pooling_apply(###input###, ###output###, ' + str(input_columns) + ', ' + str(input_rows) + ', ' + str(input_depth)
+            + ', lt_' + type_name + '_pooling, ' + str(pool_size[1]) + ', ' + str(pool_size[0]) + ', ' + str(strides[1]) + ', ' + str(strides[0])
+            + ', padding_' + padding_name + ', ' + str(output_columns) + ', ' + str(output_rows) + ')')
+    comment = type_name.capitalize() + ' pooling layer with ' + str(input_rows) + 'x' + str(input_columns) + 'x' + str(input_depth) + ' inputs'
+    return name, get_per_sample_function(name, comment, call, input_rows * input_columns * input_depth, output_rows * output_columns * output_depth)
+
+def get_convolution_function(input_dimensions, output_dimensions, kernel_size, strides, dilations, paddings, use_bias, activation_name):
+    """Returns the name and the C definition of a convolution layer function with literal sizes. The functions receive the weights,
+       the biases and the column buffer of convolution_im2col_apply as arguments"""
+    input_rows, input_columns, input_depth = input_dimensions
+    output_rows, output_columns, output_depth = output_dimensions
+
+    name = ('convolution_' + str(input_rows) + 'x' + str(input_columns) + 'x' + str(input_depth) + '_' + str(kernel_size[0]) + 'x' + str(kernel_size[1]) + 'x' + str(output_depth)
+            + '_s' + str(strides[0]) + 'x' + str(strides[1]) + '_d' + str(dilations[0]) + 'x' + str(dilations[1]) + '_p' + str(paddings[0]) + 'x' + str(paddings[1]) + '_' + activation_name)
+    if (not use_bias):
+        name = name + '_nobias'
+    call = ('convolution_apply(###input###, ###output###, column_buffer, ' + str(input_columns) + ', ' + str(input_rows) + ', ' + str(input_depth)
+            + ', ' + str(kernel_size[1]) + ', ' + str(kernel_size[0]) + ', ' + str(strides[1]) + ', ' + str(strides[0]) + ', ' + str(dilations[1]) + ', ' + str(dilations[0])
+            + ', ' + str(paddings[1]) + ', ' + str(paddings[0]) + ', ' + str(output_columns) + ', ' + str(output_rows) + ', ' + str(output_depth)
+            + ', weights, 0, biases, 0, ' + str(int(use_bias)) + ', af_' + activation_name + ')')
+    comment = ('Convolution layer with ' + str(input_rows) + 'x' + str(input_columns) + 'x' + str(input_depth) + ' inputs, ' + str(output_depth) + ' '
+               + str(kernel_size[0]) + 'x' + str(kernel_size[1]) + ' filters and ' + activation_name + ' activation function')
+    return name, get_per_sample_function(name, comment, call, input_rows * input_columns * input_depth, output_rows * output_columns * output_depth,
+                                         ', const weight_value weights[], const weight_value biases[], float * column_buffer')
+
+def get_activation_function(input_dimensions, activation_name):
+    """Returns the name and the C definition of an activation layer function with literal sizes"""
+    rows, columns, depth = input_dimensions
+    name = 'activation_' + str(rows) + 'x' + str(columns) + 'x' + str(depth) + '_' + activation_name
+    call = 'activation_apply(###input###, ###output###, ' + str(columns) + ', ' + str(rows) + ', ' + str(depth) + ', af_' + activation_name + ')'
+    comment = 'Activation layer with ' + str(rows) + 'x' + str(columns) + 'x' + str(depth) + ' inputs and ' + activation_name + ' activation function'
+    length = rows * columns * depth
+    return name, get_per_sample_function(name, comment, call, length, length)
+
+def get_model_code(input, layer_types, activation_functions, padding_types, weight_alignment=1, memory_plan=None, convolution='direct'):
+    """Returns the C code of the layer functions, predict and predict_batch with literal sizes and offsets for each layer.
+       The weight offsets are calculated for rows of weights padded to a multiple of weight_alignment,
+       the buffers are located at the offsets of the given MemoryPlan (planned for the input and the convolution variant if None)"""
+    heights, widths, depths = backend_utils.get_output_dimensions(input)
+    sizes = [height * width * depth for height, width, depth in zip(heights, widths, depths)]
+    if (memory_plan is None):
+        memory_plan = memory_planner.plan_memory(input, convolution)
+
+    activation_names = {index: name for name, index in activation_functions.items()}
+    padding_names = {index: name for name, index in padding_types.items()}
+    activations = backend_utils.get_activation_functions(input, activation_functions)
+    pool_heights, pool_widths = backend_utils.get_pool_sizes(input)
+    vertical_strides, horizontal_strides = backend_utils.get_strides(input)
+    paddings = backend_utils.get_paddings(input, padding_types)
+    vertical_dilations, horizontal_dilations = backend_utils.get_dilations(input)
+    padding_tops, padding_lefts = backend_utils.get_convolution_paddings(input, heights, widths)
+    weight_indices = backend_utils.get_weight_start_indices(input, heights, weight_alignment)
+    bias_indices = backend_utils.get_bias_start_indices(input)
+    sparse_rows_indices = backend_utils.get_sparse_rows_start_indices(input)
+    quantized = backend_utils.is_quantized(input)
+
+    functions = dict()
+    predict_calls = []
+    batch_calls = []
+    input_expression = 'input'
+
+    for index, layer in enumerate(input['config']['layers']):
+        layer_type = layer_types[layer['class_name'].lower()]
+        input_dimensions = (heights[index], widths[index], depths[index])
+        output_dimensions = (heights[index + 1], widths[index + 1], depths[index + 1])
+
+        if (layer_type == LT_DENSE and backend_utils.is_sparse(layer)):
+            name, definition = get_dense_sparse_function(heights[index], heights[index + 1], bool(layer['config']['use_bias']), activation_names[activations[index]])
+            arguments = ', SPARSE_WEIGHTS, SPARSE_COLUMNS, SPARSE_ROWS + ' + str(sparse_rows_indices[index]) + ', BIASES + ' + str(bias_indices[index])
+            batch_arguments = arguments
+        elif (layer_type == LT_DENSE):
+            name, definition = get_dense_function(heights[index], heights[index + 1], bool(layer['config']['use_bias']), activation_names[activations[index]], quantized)
+            if (quantized):
+                arguments = (', WEIGHTS + ' + str(weight_indices[index]) + ', KERNEL_SCALES + ' + str(bias_indices[index]) + ', KERNEL_ZERO_POINTS + ' + str(bias_indices[index])
+                             + ', BIASES + ' + str(bias_indices[index]))
+            else:
+                arguments = ', WEIGHTS + ' + str(weight_indices[index]) + ', BIASES + ' + str(bias_indices[index])
+            batch_arguments = arguments
+        elif (layer_type == LT_MAX_POOLING or layer_type == LT_AVG_POOLING):
+            name, definition = get_pooling_function(layer_type, input_dimensions, output_dimensions,
+                                                    (pool_heights[index], pool_widths[index]), (vertical_strides[index], horizontal_strides[index]), padding_names[paddings[index]])
+            arguments = ''
+            batch_arguments = ''
+        elif (layer_type == LT_CONVOLUTION):
+            name, definition = get_convolution_function(input_dimensions, output_dimensions, (pool_heights[index], pool_widths[index]),
+                                                        (vertical_strides[index], horizontal_strides[index]), (vertical_dilations[index], horizontal_dilations[index]),
+                                                        (padding_tops[index], padding_lefts[index]), bool(layer['config']['use_bias']), activation_names[activations[index]])
+            #? Direct convolutions do not use the column buffer
+            arguments = ', WEIGHTS + ' + str(weight_indices[index]) + ', BIASES + ' + str(bias_indices[index])
+            batch_arguments = arguments
+            if (convolution == 'im2col'):
+                arguments = arguments + ', ARENA + ' + str(memory_plan.column_offsets[index])
+                batch_arguments = batch_arguments + ', batch_arena + number_of_tile_samples * ' + str(memory_plan.column_offsets[index])
+            else:
+                arguments = arguments + ', NULL'
+                batch_arguments = batch_arguments + ', NULL'
+        elif (layer_type == LT_ACTIVATION):
+            name, definition = get_activation_function(input_dimensions, activation_names[activations[index]])
+            arguments = ''
+            batch_arguments = ''
+        else:
+            #? Flatten and dropout layers do not transform their input
+            continue
+
+        functions[name] = definition
+
+        #? The output is placed at its planned offset, as in the table-driven code
+        output_offset = memory_plan.output_offsets[index]
+        output_expression = 'ARENA + ' + str(output_offset)
+        batch_output_expression = 'batch_arena + number_of_tile_samples * ' + str(output_offset) if output_offset else 'batch_arena'
+
+        #? The measurement macros of NNT_PROFILE expand to nothing if profiling is disabled
+        predict_calls.append('  NNT_PROFILE_BEGIN();\n'
+                             '  ' + name + '(' + input_expression + ', ' + output_expression + arguments + ');\n'
+                             '  NNT_PROFILE_END(' + str(index) + ', 1);')
+        batch_calls.append('    output = ' + batch_output_expression + ';\n'
+                           '    NNT_PROFILE_BEGIN();\n'
+                           '    ' + name + '_batch(input, output, number_of_tile_samples' + batch_arguments + ');\n'
+                           '    NNT_PROFILE_END(' + str(index) + ', number_of_tile_samples);\n'
+                           '    input = output;')
+
+        input_expression = output_expression
+
+    result_expression = '(float *)input' if input_expression == 'input' else input_expression
+
+    code = '\n'.join(functions.values())
+    code = code + ('\n/*\n'
+                   'Purpose: Generates the output predictions for the input samples.\n'
+                   'Each layer is calculated by a function specialized for its sizes. The layer outputs are located at literal offsets in the ARENA.\n'
+                   'Arguments:\n'
+                   '- input: A reference to the input values as a flattened array\n'
+                   'Returns: A reference to the output as a flattened array. The output is located in the ARENA and is only valid until the next call of predict.\n'
+                   '*/\n'
+                   'float * predict(const float * input)\n'
+                   '{\n'
+                   + ''.join(call + '\n' for call in predict_calls) +
+                   '  return ' + result_expression + ';\n'
+                   '}\n\n'
+                   '/*\n'
+                   'Purpose: Generates the output predictions for a batch of input samples, see predict_batch.\n'
+                   'The samples are processed in tiles of NNT_BATCH_TILE samples by the specialized layer functions.\n'
+                   'Arguments:\n'
+                   '- inputs: A reference to the input values of all samples as flattened arrays, stored one sample after the other\n'
+                   '- outputs: A reference to the buffer the outputs of all samples are written to, stored one sample after the other\n'
+                   '- number_of_samples: The number of samples in inputs\n'
+                   '- batch_arena: A reference to the part of the BATCH_ARENA of NNT_BATCH_TILE * ARENA_SIZE elements the layer outputs are placed in\n'
+                   '*/\n'
+                   'static void predict_batch_tiles(const float * inputs, float * outputs, uint32_t number_of_samples, float * batch_arena)\n'
+                   '{\n'
+                   '  uint32_t tile_start_index;\n'
+                   '  uint32_t number_of_tile_samples;\n'
+                   '  const float * input;\n'
+                   + ('  float * output;\n' if batch_calls else '') + '\n'
+                   '  for (tile_start_index = 0; tile_start_index < number_of_samples; tile_start_index += NNT_BATCH_TILE)\n'
+                   '  {\n'
+                   '    number_of_tile_samples = number_of_samples - tile_start_index;\n'
+                   '    if (number_of_tile_samples > NNT_BATCH_TILE)\n'
+                   '    {\n'
+                   '      number_of_tile_samples = NNT_BATCH_TILE;\n'
+                   '    }\n\n'
+                   '    input = inputs + tile_start_index * ' + str(sizes[0]) + ';\n'
+                   + ''.join(call + '\n' for call in batch_calls) +
+                   '    memcpy(outputs + tile_start_index * ' + str(sizes[-1]) + ', input, number_of_tile_samples * ' + str(sizes[-1]) + ' * sizeof(float));\n'
+                   '  }\n'
+                   '}')
+    return code
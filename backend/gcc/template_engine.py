@@ -0,0 +1,54 @@
+import io
+import os
+import re
+
+#? Markers are written as ###name### in the templates
+MARKER_PATTERN = re.compile(r'(###\w+###)')
+
+#? Parsed templates by file name, together with the modification time of the file when it was parsed
+template_cache = dict()
+
+class Template(object):
+    """Template which is split into literal text and markers once and can be rendered any number of times"""
+
+    def __init__(self, text, name='<string>'):
+        self.name = name
+        #? Splitting with a capturing group alternates literal text (even indices) and markers (odd indices)
+        self.segments = MARKER_PATTERN.split(text)
+        self.markers = set(self.segments[1::2])
+
+    def render(self, markers, output):
+        """Writes the template with all markers replaced by their value from the given markers dict to the given file object.
+           Raises a ValueError if the template contains markers without value"""
+        missing = self.markers - set(markers)
+        if (missing):
+            raise ValueError('Template "' + self.name + '" contains markers without value: ' + ', '.join(sorted(missing)))
+
+        for index, segment in enumerate(self.segments):
+            if (index % 2 == 0):
+                output.write(segment)
+            else:
+                output.write(str(markers[segment]))
+
+    def render_to_string(self, markers):
+        """Returns the template with all markers replaced by their value from the given markers dict"""
+        output = io.StringIO()
+        self.render(markers, output)
+        return output.getvalue()
+
+def load_template(filename):
+    """Returns the parsed template of the given file, the template is parsed again only if the file was modified"""
+    modification_time = os.path.getmtime(filename)
+    cached = template_cache.get(filename)
+    if (cached is None or cached[0] != modification_time):
+        with open(filename, 'r') as file:
+            cached = (modification_time, Template(file.read(), filename))
+        template_cache[filename] = cached
+    return cached[1]
+
+def get_unused_markers(markers, templates):
+    """Returns a sorted list of the markers in the given markers dict which do not occur in any of the given templates"""
+    used = set()
+    for template in templates:
+        used = used | template.markers
+    return sorted(set(markers) - used)
@@ -1,4 +1,5 @@
 from plugin_collection import BackendPlugin
+import weight_storage
 import json
 import os
 
@@ -6,12 +7,15 @@ class Json(BackendPlugin):
     """Json backend plugin returns the intermediate json format as string"""
 
     def __init__(self):
-        super().__init__('json', 'JSON Backend Plugin', ['float2int'])
+        super().__init__('json', 'JSON Backend Plugin', [])
 
-    def translate_to_native_code(self, input, outputfile, exec_file):
-        """Returns the given json input as string representation"""
-        out_name, out_ext = os.path.splitext(outputfile)
-        out_dir = '_out/' + out_name
+    def translate_to_native_code(self, input, outputfile, exec_file, options=None):
+        """Returns the given json input as string representation.
+           With the option 'weights=sidecar' the weights are written to a raw sidecar file next to the json file and referenced from it"""
+        if (options is None):
+            options = dict()
+        out_ext = os.path.splitext(outputfile)[1]
+        out_dir = self.get_output_directory(outputfile)
 
         #? Creating directory if not existing
         if not os.path.exists(out_dir):
@@ -21,6 +25,9 @@ class Json(BackendPlugin):
         if (out_ext!='.json'):
             out = out + '.json'
 
-        #? Writing input as json to outputfile
+        if (options.get('weights', 'inline') == 'sidecar'):
+            input = weight_storage.save_weights(input, os.path.splitext(out)[0] + '.weights')
+
+        #? Writing input as json to outputfile, numpy arrays are written as lists
         with open(out, 'w') as file:
-            file.write(json.dumps(input))
\ No newline at end of file
+            json.dump(input, file, default=weight_storage.json_default)
\ No newline at end of file
@@ -0,0 +1,120 @@
+import argparse
+import json
+import os
+import shutil
+import sys
+import numpy as np
+
+#? ############### INFO ###############
+#? This script compares the fast activation functions of the GCC backend with the exact ones in accuracy and speed
+#? Directory: Neural-Network-Translator (repository root directory)
+#? Command: python -m benchmark.activation_report --output activation_report.json [--opt-level 2] [--compiler gcc]
+
+from backend.gcc.gcc import GCC
+from benchmark import model_benchmark
+import reference_executor
+
+#? Activation functions of the report with the range of the input values, the values cover the saturated parts of the functions
+FUNCTION_INPUT_RANGES = {'sigmoid': 20.0, 'tanh': 10.0, 'softmax': 20.0}
+#? Activation functions of the hidden layers of the dense models of the report, the output layers use the softmax function
+MODEL_ACTIVATIONS = ['sigmoid', 'tanh']
+
+def get_activation_model(activation, size):
+    """Returns a model in intermediate format with a single activation layer for size input values"""
+    return model_benchmark.get_model([{'class_name': 'Activation', 'config': {'name': 'activation', 'dtype': 'float32',
+                                                                              'batch_input_shape': [None, size], 'activation': activation}}])
+
+def get_dense_model(width, depth, activation, random):
+    """Returns a model of depth dense layers with width units and the given activation function, followed by a dense output layer with 10 units"""
+    model = model_benchmark.get_dense_model(width, depth, random)
+    for layer in model['config']['layers'][:-1]:
+        layer['config']['activation'] = activation
+    return model
+
+def get_exact_values(activation, inputs):
+    """Returns the given activation function of the given inputs calculated with float64 values, each row of the inputs is one sample"""
+    values = inputs.astype(np.float64)
+    if (activation == 'sigmoid'):
+        return 1 / (1 + np.exp(-values))
+    if (activation == 'tanh'):
+        return np.tanh(values)
+    exponentials = np.exp(values - np.max(values, axis=1, keepdims=True))
+    return exponentials / np.sum(exponentials, axis=1, keepdims=True)
+
+def measure_model(name, model, inputs, activations, opt_level, compiler, rounds):
+    """Translates, compiles and runs the given model with the given activation mode and returns the measurements and the outputs of predict"""
+    output_name = 'activation_report_' + name + '_' + activations
+    backend = GCC()
+    out_dir = backend.get_output_directory(output_name)
+    backend.translate_to_native_code(model, output_name, None, {'activations': activations})
+    try:
+        executable, _, _ = model_benchmark.compile_model(out_dir, opt_level, compiler)
+        output_size = reference_executor.ReferenceExecutor(model).get_output_size()
+        return model_benchmark.run_model(executable, out_dir, inputs, output_size, rounds)
+    finally:
+        shutil.rmtree(out_dir, ignore_errors=True)
+
+def get_function_results(size, samples, opt_level, compiler, rounds, random):
+    """Returns the maximum errors against float64 values and the time per value of each activation function for both activation modes"""
+    results = []
+    for activation, input_range in FUNCTION_INPUT_RANGES.items():
+        if (activation == 'softmax'):
+            inputs = random.uniform(-input_range, input_range, (samples, size)).astype(np.float32)
+        else:
+            inputs = np.tile(np.linspace(-input_range, input_range, size, dtype=np.float32), (samples, 1))
+        exact_values = get_exact_values(activation, inputs)
+
+        for activations in GCC.activation_modes:
+            measurement, outputs = measure_model(activation, get_activation_model(activation, size), inputs, activations, opt_level, compiler, rounds)
+            errors = np.abs(outputs - exact_values)
+            results.append({'function': activation, 'activations': activations, 'input_range': input_range,
+                            'max_abs_error': float(np.max(errors)), 'max_rel_error': float(np.max(errors / np.maximum(np.abs(exact_values), np.finfo(np.float32).tiny))),
+                            'ns_per_value': measurement['latency_ns'] / size})
+            print('{:<8} {:<6} max abs error {:.1e}   max rel error {:.1e}   {:6.2f} ns/value'.format(
+                activation, activations, results[-1]['max_abs_error'], results[-1]['max_rel_error'], results[-1]['ns_per_value']))
+    return results
+
+def get_model_results(samples, opt_level, compiler, rounds, random):
+    """Returns the maximum errors against the reference executor and the latency of dense models for both activation modes"""
+    results = []
+    for activation in MODEL_ACTIVATIONS:
+        for width in [64, 256]:
+            name = 'dense_w' + str(width) + '_d2_' + activation
+            model = get_dense_model(width, 2, activation, random)
+            inputs = random.standard_normal((samples, width)).astype(np.float32)
+            expected = reference_executor.predict(model, inputs)
+
+            for activations in GCC.activation_modes:
+                measurement, outputs = measure_model(name, model, inputs, activations, opt_level, compiler, rounds)
+                results.append({'model': name, 'activations': activations, 'max_abs_error': float(np.max(np.abs(outputs - expected))),
+                                'latency_ns': measurement['latency_ns'], 'batch_ns_per_sample': measurement['batch_ns_per_sample']})
+                print('{:<24} {:<6} max abs error {:.1e}   latency {:10.0f} ns   batch {:10.0f} ns/sample'.format(
+                    name, activations, results[-1]['max_abs_error'], results[-1]['latency_ns'], results[-1]['batch_ns_per_sample']))
+    return results
+
+def main():
+    """Writes the report of the activation modes to a json file"""
+    parser = argparse.ArgumentParser(description='Compares the fast activation functions of the GCC backend with the exact ones')
+    parser.add_argument('-o', '--output', type=str, default='activation_report.json', help='Json file the report is written to')
+    parser.add_argument('-O', '--opt-level', type=str, default='2', help='Optimization level of gcc without -O, e.g. 2 for -O2')
+    parser.add_argument('--size', type=int, default=4096, help='Number of input values of each activation function')
+    parser.add_argument('--samples', type=int, default=16, help='Number of samples of each measurement')
+    parser.add_argument('--rounds', type=int, default=5, help='Number of measurement rounds, the fastest round is reported')
+    parser.add_argument('--compiler', type=str, default='gcc', help='Compiler executable')
+    args = parser.parse_args()
+
+    #? The GCC backend reads its templates relative to the repository root directory
+    os.chdir(model_benchmark.get_repository_directory())
+    random = np.random.default_rng(0)
+    opt_level = '-O' + args.opt_level
+
+    report = {'metadata': model_benchmark.get_metadata(args.compiler), 'opt_level': opt_level,
+              'functions': get_function_results(args.size, args.samples, opt_level, args.compiler, args.rounds, random),
+              'models': get_model_results(args.samples, opt_level, args.compiler, args.rounds, random)}
+
+    with open(args.output, 'w') as file:
+        json.dump(report, file, indent=4)
+    print('Report written to "' + args.output + '"')
+
+if __name__ == '__main__':
+    sys.exit(main())
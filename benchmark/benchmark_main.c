@@ -0,0 +1,146 @@
+/*
+Benchmark program for the generated nn_model.c, used by benchmark/model_benchmark.py.
+Usage: benchmark <input file> <output file> <number of samples> <input length> <output length> <rounds>
+The input file holds the float32 input values of all samples, one sample after the other.
+The outputs of predict for all samples are written to the output file, the measurements are printed as a json object.
+*/
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <stdint.h>
+#include <time.h>
+#include <sys/resource.h>
+#include "nn_model.h"
+
+/*
+Purpose: Returns the current time of the monotonic clock
+Returns: The time in nanoseconds
+*/
+static double benchmark_time_ns(void)
+{
+  struct timespec time;
+  clock_gettime(CLOCK_MONOTONIC, &time);
+  return (double)time.tv_sec * 1e9 + (double)time.tv_nsec;
+}
+
+/*
+Purpose: Returns the peak resident set size of the process. On Linux the high water mark of the memory of the process is read from
+/proc/self/status, since ru_maxrss also covers the memory of the parent process before this program was executed.
+Returns: The peak resident set size in kilobytes
+*/
+static long benchmark_peak_rss_kb(void)
+{
+  char line[256];
+  long peak_rss_kb = -1;
+  struct rusage usage;
+  FILE * file = fopen("/proc/self/status", "r");
+
+  if (file != NULL)
+  {
+    while (fgets(line, sizeof(line), file) != NULL)
+    {
+      if (strncmp(line, "VmHWM:", 6) == 0)
+      {
+        peak_rss_kb = strtol(line + 6, NULL, 10);
+      }
+    }
+    fclose(file);
+  }
+  if (peak_rss_kb < 0)
+  {
+    getrusage(RUSAGE_SELF, &usage);
+    peak_rss_kb = usage.ru_maxrss;
+  }
+  return peak_rss_kb;
+}
+
+int main(int argc, char ** argv)
+{
+  uint32_t number_of_samples;
+  uint32_t input_length;
+  uint32_t output_length;
+  uint32_t rounds;
+  uint32_t round_index;
+  uint32_t sample_index;
+  float * inputs;
+  float * outputs;
+  float * batch_outputs;
+  float * output;
+  FILE * file;
+  double start_time;
+  double round_time;
+  double best_latency_ns = -1;
+  double best_batch_ns = -1;
+  float checksum = 0;
+  int batch_matches_predict;
+
+  if (argc != 7)
+  {
+    fprintf(stderr, "Usage: %s <input file> <output file> <number of samples> <input length> <output length> <rounds>\n", argv[0]);
+    return 1;
+  }
+  number_of_samples = (uint32_t)strtoul(argv[3], NULL, 10);
+  input_length = (uint32_t)strtoul(argv[4], NULL, 10);
+  output_length = (uint32_t)strtoul(argv[5], NULL, 10);
+  rounds = (uint32_t)strtoul(argv[6], NULL, 10);
+
+  inputs = malloc((size_t)number_of_samples * input_length * sizeof(float));
+  outputs = malloc((size_t)number_of_samples * output_length * sizeof(float));
+  batch_outputs = malloc((size_t)number_of_samples * output_length * sizeof(float));
+  file = fopen(argv[1], "rb");
+  if (inputs == NULL || outputs == NULL || batch_outputs == NULL || file == NULL
+      || fread(inputs, sizeof(float), (size_t)number_of_samples * input_length, file) != (size_t)number_of_samples * input_length)
+  {
+    fprintf(stderr, "Could not read the inputs from %s\n", argv[1]);
+    return 1;
+  }
+  fclose(file);
+
+  /* The first predictions warm up the caches and are used to check the results */
+  for (sample_index = 0; sample_index < number_of_samples; sample_index++)
+  {
+    output = predict(inputs + (size_t)sample_index * input_length);
+    memcpy(outputs + (size_t)sample_index * output_length, output, output_length * sizeof(float));
+  }
+
+  /* The fastest round is reported, slower rounds are disturbed by other processes */
+  for (round_index = 0; round_index < rounds; round_index++)
+  {
+    start_time = benchmark_time_ns();
+    for (sample_index = 0; sample_index < number_of_samples; sample_index++)
+    {
+      output = predict(inputs + (size_t)sample_index * input_length);
+      checksum = checksum + output[0];
+    }
+    round_time = (benchmark_time_ns() - start_time) / number_of_samples;
+    if (best_latency_ns < 0 || round_time < best_latency_ns)
+    {
+      best_latency_ns = round_time;
+    }
+
+    start_time = benchmark_time_ns();
+    predict_batch(inputs, batch_outputs, number_of_samples);
+    round_time = (benchmark_time_ns() - start_time) / number_of_samples;
+    if (best_batch_ns < 0 || round_time < best_batch_ns)
+    {
+      best_batch_ns = round_time;
+    }
+  }
+  batch_matches_predict = memcmp(outputs, batch_outputs, (size_t)number_of_samples * output_length * sizeof(float)) == 0;
+
+  file = fopen(argv[2], "wb");
+  if (file == NULL || fwrite(outputs, sizeof(float), (size_t)number_of_samples * output_length, file) != (size_t)number_of_samples * output_length)
+  {
+    fprintf(stderr, "Could not write the outputs to %s\n", argv[2]);
+    return 1;
+  }
+  fclose(file);
+
+  printf("{\"latency_ns\": %.1f, \"batch_ns_per_sample\": %.1f, \"batch_matches_predict\": %s, \"peak_rss_kb\": %ld, \"checksum\": %g}\n",
+         best_latency_ns, best_batch_ns, batch_matches_predict ? "true" : "false", benchmark_peak_rss_kb(), checksum);
+
+  free(inputs);
+  free(outputs);
+  free(batch_outputs);
+  return 0;
+}
@@ -0,0 +1,227 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import time
+import numpy as np
+
+#? ############### INFO ###############
+#? This script synthesizes models, translates them with the GCC backend, compiles them with the local gcc and measures them
+#? Directory: Neural-Network-Translator (repository root directory)
+#? Command: python -m benchmark.model_benchmark --output benchmark_results.json [--compare previous_results.json] [--grid quick] [--opt-levels 2 3]
+
+from backend.gcc.gcc import GCC
+import reference_executor
+
+#? Metrics which are compared with previous results, larger values are regressions
+COMPARED_METRICS = ['latency_ns', 'batch_ns_per_sample', 'peak_rss_kb', 'text_size', 'data_size', 'bss_size']
+
+#? Model grids of the benchmark, the quick grid is meant for frequent runs e.g. in continuous integration
+DENSE_GRIDS = {'full': {'widths': [16, 64, 256, 1024], 'depths': [1, 2, 4]},
+               'quick': {'widths': [64, 256], 'depths': [2]}}
+POOLING_GRIDS = {'full': [('max', 28, 1, 2, 2, 'valid'), ('max', 28, 1, 3, 1, 'same'), ('avg', 32, 8, 2, 2, 'valid'), ('avg', 32, 8, 3, 2, 'same')],
+                 'quick': [('max', 28, 1, 3, 1, 'same'), ('avg', 32, 8, 2, 2, 'valid')]}
+#? Compiler flags of the SIMD variants of the generated code, the scalar code is the reference. F16C widens float16 weights on AVX2 hosts
+SIMD_FLAGS = {'scalar': [], 'sse': ['-DNNT_SIMD_SSE'], 'avx2': ['-DNNT_SIMD_AVX2', '-mavx2', '-mfma', '-mf16c'], 'neon': ['-DNNT_SIMD_NEON']}
+
+def get_thread_flags(threads):
+    """Returns the compiler flags of the generated code with the given number of threads, a single thread requires no thread pool"""
+    return ['-DNNT_THREADS=' + str(threads), '-pthread'] if threads > 1 else []
+
+def get_repository_directory():
+    """Returns the path of the repository root directory"""
+    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def get_dense_layer(units, previous_units, activation, random, input_layer=False):
+    """Returns a dense layer in intermediate format with random weights"""
+    layer = {'class_name': 'Dense', 'config': {'name': 'dense', 'dtype': 'float32', 'units': units, 'activation': activation, 'use_bias': True},
+             'kernel_values': (random.standard_normal((previous_units, units)) / np.sqrt(previous_units)).astype(np.float32),
+             'bias_values': (random.standard_normal(units) * 0.1).astype(np.float32)}
+    if (input_layer):
+        layer['config']['batch_input_shape'] = [None, previous_units]
+    return layer
+
+def get_model(layers):
+    """Returns a sequential model in intermediate format with the given layers"""
+    return {'class_name': 'Sequential', 'config': {'name': 'sequential', 'layers': layers}}
+
+def get_dense_model(width, depth, random):
+    """Returns a model of depth dense layers with width units each, followed by a dense output layer with 10 units"""
+    layers = [get_dense_layer(width, width, 'relu', random, input_layer=True)]
+    for _ in range(depth - 1):
+        layers.append(get_dense_layer(width, width, 'relu', random))
+    layers.append(get_dense_layer(10, width, 'softmax', random))
+    return get_model(layers)
+
+def get_pooling_model(pooling_type, size, channels, pool_size, stride, padding, random):
+    """Returns a model of a pooling layer for a size x size x channels input, followed by a flatten layer and a dense output layer with 10 units"""
+    class_name = 'MaxPooling2D' if pooling_type == 'max' else 'AveragePooling2D'
+    pooling_layer = {'class_name': class_name, 'config': {'name': 'pooling', 'dtype': 'float32', 'batch_input_shape': [None, size, size, channels],
+                                                          'pool_size': [pool_size, pool_size], 'strides': [stride, stride], 'padding': padding}}
+    pooled_size = (size + stride - 1) // stride if padding == 'same' else (size - pool_size) // stride + 1
+    flatten_layer = {'class_name': 'Flatten', 'config': {'name': 'flatten', 'dtype': 'float32'}}
+    return get_model([pooling_layer, flatten_layer, get_dense_layer(10, pooled_size * pooled_size * channels, 'softmax', random)])
+
+def get_models(grid, random):
+    """Returns a list of the names, parameters and models in intermediate format of the given grid"""
+    models = []
+    for width in DENSE_GRIDS[grid]['widths']:
+        for depth in DENSE_GRIDS[grid]['depths']:
+            models.append(('dense_w' + str(width) + '_d' + str(depth), {'type': 'dense', 'width': width, 'depth': depth}, get_dense_model(width, depth, random)))
+    for pooling_type, size, channels, pool_size, stride, padding in POOLING_GRIDS[grid]:
+        name = pooling_type + 'pool_' + str(size) + 'x' + str(size) + 'x' + str(channels) + '_p' + str(pool_size) + '_s' + str(stride) + '_' + padding
+        parameters = {'type': pooling_type + '_pooling', 'size': size, 'channels': channels, 'pool_size': pool_size, 'stride': stride, 'padding': padding}
+        models.append((name, parameters, get_pooling_model(pooling_type, size, channels, pool_size, stride, padding, random)))
+    return models
+
+def get_object_sizes(object_file):
+    """Returns a dict with the text, data and bss size in bytes of the given object file, or None values if the size tool is not available"""
+    try:
+        output = subprocess.run(['size', object_file], capture_output=True, text=True, check=True).stdout
+        text_size, data_size, bss_size = [int(value) for value in output.splitlines()[1].split()[:3]]
+    except (OSError, subprocess.CalledProcessError, IndexError, ValueError):
+        return {'text_size': None, 'data_size': None, 'bss_size': None}
+    return {'text_size': text_size, 'data_size': data_size, 'bss_size': bss_size}
+
+def compile_model(out_dir, opt_level, compiler, flags=()):
+    """Compiles the generated model in the given directory with the benchmark program and the given additional compiler flags
+       and returns the path of the executable, the object sizes of the model and the compile time in seconds"""
+    start_time = time.perf_counter()
+    object_file = os.path.join(out_dir, 'nn_model.o')
+    executable = os.path.join(out_dir, 'benchmark')
+    subprocess.run([compiler, opt_level, *flags, '-c', os.path.join(out_dir, 'nn_model.c'), '-o', object_file], check=True, capture_output=True, text=True)
+    #? The header declares the static helper functions of the model, the resulting warnings in the benchmark program are suppressed
+    subprocess.run([compiler, opt_level, *flags, '-w', '-I', out_dir, os.path.join(get_repository_directory(), 'benchmark', 'benchmark_main.c'), object_file,
+                    '-o', executable, '-lm'], check=True, capture_output=True, text=True)
+    return executable, get_object_sizes(object_file), time.perf_counter() - start_time
+
+def run_model(executable, out_dir, inputs, output_size, rounds):
+    """Runs the benchmark program for the given inputs and returns its measurements and the outputs of predict"""
+    input_file = os.path.join(out_dir, 'inputs.bin')
+    output_file = os.path.join(out_dir, 'outputs.bin')
+    inputs.astype(np.float32).tofile(input_file)
+    result = subprocess.run([executable, input_file, output_file, str(inputs.shape[0]), str(inputs.shape[1]), str(output_size), str(rounds)],
+                            check=True, capture_output=True, text=True)
+    measurement = json.loads(result.stdout)
+    del measurement['checksum']
+    return measurement, np.fromfile(output_file, dtype=np.float32).reshape(inputs.shape[0], output_size)
+
+def get_reference_batch_ns_per_sample(executor, inputs, rounds):
+    """Returns the time in nanoseconds per sample of the NumPy reference executor for the given batch, the baseline the generated code must beat"""
+    best_time = None
+    for _ in range(rounds):
+        start_time = time.perf_counter_ns()
+        executor.predict(inputs)
+        round_time = (time.perf_counter_ns() - start_time) / inputs.shape[0]
+        best_time = round_time if best_time is None else min(best_time, round_time)
+    return best_time
+
+def benchmark_model(name, parameters, model, codegen_modes, opt_levels, simd_variants, thread_counts, samples, rounds, compiler, random):
+    """Translates, compiles and measures the given model for each code generation mode, optimization level, SIMD variant and number of threads
+       and returns the list of results"""
+    executor = reference_executor.ReferenceExecutor(model)
+    inputs = random.standard_normal((samples, executor.get_input_size())).astype(np.float32)
+    expected = executor.predict(inputs)
+    reference_ns = get_reference_batch_ns_per_sample(executor, inputs, rounds)
+
+    results = []
+    for codegen in codegen_modes:
+        output_name = 'benchmark_' + name + '_' + codegen
+        backend = GCC()
+        out_dir = backend.get_output_directory(output_name)
+        start_time = time.perf_counter()
+        backend.translate_to_native_code(model, output_name, None, {'codegen': codegen})
+        translation_time = time.perf_counter() - start_time
+        try:
+            for opt_level in opt_levels:
+                for simd, threads in [(simd, threads) for simd in simd_variants for threads in thread_counts]:
+                    executable, sizes, compile_time = compile_model(out_dir, opt_level, compiler, SIMD_FLAGS[simd] + get_thread_flags(threads))
+                    measurement, outputs = run_model(executable, out_dir, inputs, executor.get_output_size(), rounds)
+                    result = {'model': name, 'parameters': parameters, 'codegen': codegen, 'opt_level': opt_level, 'simd': simd, 'threads': threads,
+                              'translation_seconds': translation_time, 'compile_seconds': compile_time,
+                              'reference_batch_ns_per_sample': reference_ns, 'max_abs_error': float(np.max(np.abs(outputs - expected)))}
+                    result.update(measurement)
+                    result.update(sizes)
+                    results.append(result)
+                    print('{:<36} {:<11} {:<3} {:<6} {:>2}t latency {:10.0f} ns   batch {:10.0f} ns/sample   numpy {:10.0f} ns/sample   rss {:7d} kB   text {:8}   error {:.1e}'.format(
+                        name, codegen, opt_level, simd, threads, result['latency_ns'], result['batch_ns_per_sample'], reference_ns, result['peak_rss_kb'],
+                        str(result['text_size']), result['max_abs_error']))
+        finally:
+            shutil.rmtree(out_dir, ignore_errors=True)
+    return results
+
+def get_metadata(compiler):
+    """Returns a dict describing the machine, the compiler and the version of the translator the results were measured with"""
+    def get_output(command):
+        try:
+            return subprocess.run(command, capture_output=True, text=True, check=True, cwd=get_repository_directory()).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+    compiler_version = get_output([compiler, '--version'])
+    return {'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(), 'machine': platform.machine(), 'processor': platform.processor(),
+            'system': platform.platform(), 'python': platform.python_version(), 'numpy': np.__version__,
+            'compiler': compiler_version.splitlines()[0] if compiler_version else None, 'commit': get_output(['git', 'rev-parse', 'HEAD'])}
+
+def compare_results(results, previous_results, threshold):
+    """Returns a list of messages for each metric of the given results which is more than threshold (relative) larger than in the previous results"""
+    #? Results without SIMD variant and number of threads were measured with the scalar code and a single thread
+    def get_key(result):
+        return (result['model'], result['codegen'], result['opt_level'], result.get('simd', 'scalar'), str(result.get('threads', 1)) + 't')
+    previous = {get_key(result): result for result in previous_results}
+    regressions = []
+    for result in results:
+        key = get_key(result)
+        if (key not in previous):
+            continue
+        for metric in COMPARED_METRICS:
+            old_value = previous[key].get(metric)
+            new_value = result.get(metric)
+            if (old_value is not None and new_value is not None and new_value > old_value * (1 + threshold)):
+                regressions.append(' '.join(key) + ': ' + metric + ' increased from ' + str(old_value) + ' to ' + str(new_value))
+        if (not result.get('batch_matches_predict', True)):
+            regressions.append(' '.join(key) + ': predict_batch does not match predict')
+    return regressions
+
+def main():
+    """Runs the benchmark and writes the results to a json file"""
+    parser = argparse.ArgumentParser(description='Benchmarks the C code generated by the GCC backend for synthesized models')
+    parser.add_argument('-o', '--output', type=str, default='benchmark_results.json', help='Json file the results are written to')
+    parser.add_argument('-g', '--grid', type=str, default='full', choices=sorted(DENSE_GRIDS), help='Grid of synthesized models')
+    parser.add_argument('-O', '--opt-levels', nargs='+', default=['0', '2', '3', 's'], help='Optimization levels of gcc without -O, e.g. 2 for -O2')
+    parser.add_argument('--codegen', nargs='+', default=GCC.codegen_modes, choices=GCC.codegen_modes, help='Code generation modes of the GCC backend')
+    parser.add_argument('--simd', nargs='+', default=['scalar'], choices=sorted(SIMD_FLAGS), help='SIMD variants of the generated code, see NNT_SIMD_AVX2 in the c-file')
+    parser.add_argument('--threads', nargs='+', type=int, default=[1], help='Numbers of threads of the generated code, see NNT_THREADS in the header file')
+    parser.add_argument('--samples', type=int, default=64, help='Number of samples of each measurement')
+    parser.add_argument('--rounds', type=int, default=5, help='Number of measurement rounds, the fastest round is reported')
+    parser.add_argument('--compiler', type=str, default='gcc', help='Compiler executable')
+    parser.add_argument('--compare', type=str, help='Json file with previous results, the script fails if a metric increased by more than the threshold')
+    parser.add_argument('--threshold', type=float, default=0.1, help='Relative increase of a metric which is reported as regression')
+    args = parser.parse_args()
+
+    #? The GCC backend reads its templates relative to the repository root directory
+    os.chdir(get_repository_directory())
+    random = np.random.default_rng(0)
+
+    results = []
+    for name, parameters, model in get_models(args.grid, random):
+        results.extend(benchmark_model(name, parameters, model, args.codegen, ['-O' + level for level in args.opt_levels], args.simd, args.threads, args.samples, args.rounds, args.compiler, random))
+
+    with open(args.output, 'w') as file:
+        json.dump({'metadata': get_metadata(args.compiler), 'results': results}, file, indent=4)
+    print('Results written to "' + args.output + '"')
+
+    if (args.compare is not None):
+        with open(args.compare, 'r') as file:
+            regressions = compare_results(results, json.load(file)['results'], args.threshold)
+        for regression in regressions:
+            print('Regression: ' + regression)
+        print(str(len(regressions)) + ' regressions compared to "' + args.compare + '"')
+        return not regressions
+    return True
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
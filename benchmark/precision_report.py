@@ -0,0 +1,94 @@
+import argparse
+import copy
+import json
+import os
+import shutil
+import sys
+import numpy as np
+
+#? ############### INFO ###############
+#? This script compares models with float16 and bfloat16 weights with the float32 model in accuracy, size and speed
+#? Directory: Neural-Network-Translator (repository root directory)
+#? Command: python -m benchmark.precision_report --output precision_report.json [--opt-level 2] [--simd avx2] [--compiler gcc]
+
+from backend.gcc.gcc import GCC
+from benchmark import model_benchmark
+from conversion.float2half import Float2Half
+import reference_executor
+
+#? Weight dtypes of the report, float32 models are not converted
+WEIGHT_DTYPES = ['float32'] + Float2Half.dtypes
+#? Widths of the dense models of the report, each model has two hidden layers
+DENSE_WIDTHS = [64, 256, 1024]
+
+def get_models(random):
+    """Returns a dict of the models of the report in intermediate format by name"""
+    models = {'dense_w' + str(width) + '_d2': model_benchmark.get_dense_model(width, 2, random) for width in DENSE_WIDTHS}
+    models['conv_test'] = json.load(open(os.path.join('test', 'test_conv_input.json')))
+    return models
+
+def convert_model(model, dtype):
+    """Returns a copy of the given model with its weights stored as values of the given dtype"""
+    if (dtype == 'float32'):
+        return copy.deepcopy(model)
+    return Float2Half().process(copy.deepcopy(model), {'half_precision_dtype': dtype})
+
+def measure_model(name, model, inputs, dtype, opt_level, compiler, flags, rounds):
+    """Translates, compiles and runs the given model and returns the measurements, the object sizes and the outputs of predict"""
+    output_name = 'precision_report_' + name + '_' + dtype
+    backend = GCC()
+    out_dir = backend.get_output_directory(output_name)
+    backend.translate_to_native_code(model, output_name, None)
+    try:
+        executable, object_sizes, _ = model_benchmark.compile_model(out_dir, opt_level, compiler, flags)
+        output_size = reference_executor.ReferenceExecutor(model).get_output_size()
+        measurement, outputs = model_benchmark.run_model(executable, out_dir, inputs, output_size, rounds)
+        return measurement, object_sizes, outputs
+    finally:
+        shutil.rmtree(out_dir, ignore_errors=True)
+
+def get_model_results(samples, opt_level, compiler, flags, rounds, random):
+    """Returns the errors of the compiled models against the reference executor of the float32 model and their sizes and latencies for each weight dtype"""
+    results = []
+    for name, model in get_models(random).items():
+        executor = reference_executor.ReferenceExecutor(model)
+        inputs = random.standard_normal((samples, executor.get_input_size())).astype(np.float32)
+        expected = executor.predict(inputs)
+
+        for dtype in WEIGHT_DTYPES:
+            measurement, object_sizes, outputs = measure_model(name, convert_model(model, dtype), inputs, dtype, opt_level, compiler, flags, rounds)
+            errors = np.abs(outputs - expected)
+            results.append({'model': name, 'weight_dtype': dtype, 'max_abs_error': float(np.max(errors)),
+                            'max_rel_error': float(np.max(errors / np.maximum(np.abs(expected), np.finfo(np.float32).tiny))),
+                            'argmax_agreement': float(np.mean(np.argmax(outputs, axis=1) == np.argmax(expected, axis=1))),
+                            'text_size': object_sizes['text_size'], 'latency_ns': measurement['latency_ns'],
+                            'batch_ns_per_sample': measurement['batch_ns_per_sample']})
+            print('{:<16} {:<8} max abs error {:.1e}   argmax agreement {:6.1%}   text {:>9} B   latency {:10.0f} ns'.format(
+                name, dtype, results[-1]['max_abs_error'], results[-1]['argmax_agreement'], str(results[-1]['text_size']), results[-1]['latency_ns']))
+    return results
+
+def main():
+    """Writes the report of the weight dtypes to a json file"""
+    parser = argparse.ArgumentParser(description='Compares models with float16 and bfloat16 weights with the float32 model')
+    parser.add_argument('-o', '--output', type=str, default='precision_report.json', help='Json file the report is written to')
+    parser.add_argument('-O', '--opt-level', type=str, default='2', help='Optimization level of gcc without -O, e.g. 2 for -O2')
+    parser.add_argument('--simd', type=str, default='scalar', choices=model_benchmark.SIMD_FLAGS.keys(), help='SIMD variant of the generated code')
+    parser.add_argument('--samples', type=int, default=256, help='Number of samples of each measurement')
+    parser.add_argument('--rounds', type=int, default=5, help='Number of measurement rounds, the fastest round is reported')
+    parser.add_argument('--compiler', type=str, default='gcc', help='Compiler executable')
+    args = parser.parse_args()
+
+    #? The GCC backend reads its templates relative to the repository root directory
+    os.chdir(model_benchmark.get_repository_directory())
+    random = np.random.default_rng(0)
+    opt_level = '-O' + args.opt_level
+
+    report = {'metadata': model_benchmark.get_metadata(args.compiler), 'opt_level': opt_level, 'simd': args.simd,
+              'models': get_model_results(args.samples, opt_level, args.compiler, model_benchmark.SIMD_FLAGS[args.simd], args.rounds, random)}
+
+    with open(args.output, 'w') as file:
+        json.dump(report, file, indent=4)
+    print('Report written to "' + args.output + '"')
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,49 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+#? ############### INFO ###############
+#? This script measures the startup time of the command line interface
+#? Directory: Neural-Network-Translator (repository root directory)
+#? Command: python -m benchmark.startup_benchmark --runs 10
+
+def get_repository_directory():
+    """Returns the path of the repository root directory"""
+    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def time_command(command, runs):
+    """Runs the given command the given number of times in the repository root directory and returns the wall clock times in seconds"""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=get_repository_directory(), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+        times.append(time.perf_counter() - start)
+    return times
+
+def get_imported_modules(code):
+    """Returns the set of top level modules which are imported after executing the given python code in a fresh interpreter"""
+    probe = code + '\nimport sys\nprint(" ".join(sorted(set(name.split(".")[0] for name in sys.modules))))'
+    result = subprocess.run([sys.executable, '-c', probe], cwd=get_repository_directory(), capture_output=True, text=True, check=True)
+    return set(result.stdout.split())
+
+def print_times(name, times):
+    """Prints the median, minimum and maximum of the given times in milliseconds"""
+    print('{:<32} median {:8.1f} ms   min {:8.1f} ms   max {:8.1f} ms'.format(name, statistics.median(times) * 1000, min(times) * 1000, max(times) * 1000))
+
+parser = argparse.ArgumentParser(description='Measures the startup time of the Neural-Network-Translator command line interface')
+parser.add_argument('-r', '--runs', type=int, default=10, help='Number of runs of each measurement')
+args = parser.parse_args()
+
+print_times('python (empty interpreter)', time_command([sys.executable, '-c', 'pass'], args.runs))
+print_times('plugin discovery', time_command([sys.executable, '-c', 'from plugin_collection import PluginCollection\n'
+                                                                   'for package in ["frontend", "conversion", "backend"]: PluginCollection(package)'], args.runs))
+print_times('nn_translator.py --help', time_command([sys.executable, 'nn_translator.py', '--help'], args.runs))
+
+#? Heavy frameworks must only be imported when the plugin that requires them is selected
+modules = get_imported_modules('from plugin_collection import PluginCollection\n'
+                               'for package in ["frontend", "conversion", "backend"]: PluginCollection(package)')
+for framework in ['torch', 'tensorflow', 'keras']:
+    print('{:<32} {}'.format(framework + ' imported at startup', framework in modules))
@@ -0,0 +1,50 @@
+from plugin_collection import ConversionPlugin
+import numpy as np
+import weight_storage
+
+class Float2Half(ConversionPlugin):
+    """Conversion plugin rounds the kernel and bias values of weighted layers to half precision values, the activations remain float values"""
+
+    #? Available half precision dtypes, IEEE half precision values are more precise while bfloat16 values have the range of float values
+    dtypes = ['float16', 'bfloat16']
+
+    #? Largest finite IEEE half precision value
+    float16_max = 65504.0
+
+    def __init__(self):
+        super().__init__('float2half', 'Conversion from Float to Half Precision values')
+
+    def process(self, input, options=None):
+        """Rounds the kernel and bias values of each dense and convolution layer to the nearest value of the half precision dtype
+           and records the dtype in the half_precision object of the layer. The values remain float values in the intermediate format,
+           so that the reference executor calculates the converted model. The option 'half_precision_dtype' (float16, bfloat16) selects the dtype"""
+        if (options is None):
+            options = dict()
+
+        dtype = options.get('half_precision_dtype', 'float16')
+        if (dtype not in self.dtypes):
+            raise ValueError('Unknown half precision dtype "' + dtype + '", available dtypes: ' + ', '.join(self.dtypes))
+
+        for layer in input['config']['layers']:
+            #? Quantized layers are stored as int8 values, see the float2int conversion
+            if (layer['class_name'] not in ['Dense', 'Conv1D', 'Conv2D'] or 'quantization' in layer):
+                continue
+
+            layer['kernel_values'] = self.round(weight_storage.get_array(layer['kernel_values']), dtype)
+            if ('bias_values' in layer):
+                layer['bias_values'] = self.round(weight_storage.get_array(layer['bias_values']), dtype)
+            layer['half_precision'] = {'dtype': dtype}
+
+        return input
+
+    def round(self, values, dtype):
+        """Returns the given values rounded to the nearest value of the given dtype as float32 numpy array, ties are rounded to the value with an even last bit.
+           Values outside of the range of IEEE half precision values are clipped to the largest finite value"""
+        values = np.ascontiguousarray(values, dtype=np.float32)
+        if (dtype == 'float16'):
+            return np.clip(values, -self.float16_max, self.float16_max).astype(np.float16).astype(np.float32)
+
+        #? The bfloat16 value is the upper half of the bits of the float value, the lower half is rounded
+        bits = values.view(np.uint32).astype(np.uint64)
+        bits = ((bits + 0x7fff + ((bits >> 16) & 1)) >> 16) << 16
+        return bits.astype(np.uint32).view(np.float32)
@@ -1,10 +1,72 @@
 from plugin_collection import ConversionPlugin
+import numpy as np
+import weight_storage
 
 class Float2Integer(ConversionPlugin):
+    """Conversion plugin for int8 weight storage: the kernel values of dense layers are quantized to int8 values, the bias values and activations remain float values"""
+
+    #? Available quantization schemes and granularities
+    schemes = ['symmetric', 'affine']
+    granularities = ['per_layer', 'per_channel']
+
+    #? Range of the int8 values, the symmetric scheme does not use -128 to keep the range symmetric
+    int8_min = -128
+    int8_max = 127
 
     def __init__(self):
-        super().__init__('float2int', 'Conversion from Float to Integer values')
+        super().__init__('float2int', 'Conversion from Float to int8 weight storage')
+
+    def process(self, input, options=None):
+        """Quantizes the kernel values of each dense layer to int8 values and records the scales and zero points in the quantization object of the layer.
+           The bias values are kept as float values, they are added to the scaled int32 accumulators of the units, so that int8 biases would only add error.
+           The options 'quantization_scheme' (symmetric, affine) and 'quantization_granularity' (per_layer, per_channel) select the quantization"""
+        if (options is None):
+            options = dict()
+
+        scheme = options.get('quantization_scheme', 'symmetric')
+        granularity = options.get('quantization_granularity', 'per_layer')
+        if (scheme not in self.schemes):
+            raise ValueError('Unknown quantization scheme "' + scheme + '", available schemes: ' + ', '.join(self.schemes))
+        if (granularity not in self.granularities):
+            raise ValueError('Unknown quantization granularity "' + granularity + '", available granularities: ' + ', '.join(self.granularities))
+
+        for layer in input['config']['layers']:
+            #? Layers which are already quantized are left untouched
+            if (layer['class_name'] != 'Dense' or 'quantization' in layer):
+                continue
+
+            kernel = weight_storage.get_array(layer['kernel_values']).astype(np.float64)
+            #? The kernel has the shape (previous units, units), a channel is the column of one unit
+            axis = 0 if granularity == 'per_channel' else None
+            kernel_values, kernel_scales, kernel_zero_points = self.quantize(kernel, scheme, axis)
+
+            quantization = {'dtype': 'int8', 'scheme': scheme, 'granularity': granularity,
+                            'kernel_scale': kernel_scales, 'kernel_zero_point': kernel_zero_points}
+            layer['kernel_values'] = kernel_values
+            layer['quantization'] = quantization
+
+        return input
+
+    def quantize(self, values, scheme, axis):
+        """Returns the int8 values of the given array as numpy array, and lists of the scales and zero points.
+           The scales and zero points are calculated over the given axis, or over the whole array if axis is None"""
+        if (scheme == 'symmetric'):
+            max_abs = np.max(np.abs(values), axis=axis, keepdims=True) if values.size > 0 else np.zeros((1,) * values.ndim)
+            scale = max_abs / self.int8_max
+            zero_point = np.zeros_like(scale)
+            q_min = -self.int8_max
+        else:
+            #? The range always contains zero, so that zero values are represented exactly
+            min_value = np.minimum(np.min(values, axis=axis, keepdims=True), 0) if values.size > 0 else np.zeros((1,) * values.ndim)
+            max_value = np.maximum(np.max(values, axis=axis, keepdims=True), 0) if values.size > 0 else np.zeros((1,) * values.ndim)
+            scale = (max_value - min_value) / (self.int8_max - self.int8_min)
+            zero_point = None
+            q_min = self.int8_min
+
+        #? Constant zero values would result in a scale of zero
+        scale = np.where(scale == 0, 1.0, scale)
+        if (zero_point is None):
+            zero_point = np.clip(np.round(self.int8_min - min_value / scale), self.int8_min, self.int8_max)
 
-    def process(self, input):
-        #! TODO convert values from float to integer
-        return input
\ No newline at end of file
+        quantized = np.clip(np.round(values / scale) + zero_point, q_min, self.int8_max).astype(np.int8)
+        return quantized, scale.reshape(-1).tolist(), zero_point.reshape(-1).astype(int).tolist()
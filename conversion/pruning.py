@@ -0,0 +1,62 @@
+from plugin_collection import ConversionPlugin
+import numpy as np
+import weight_storage
+
+class Pruning(ConversionPlugin):
+    """Conversion plugin prunes the kernel values of dense layers by magnitude and marks sparse layers for sparse weight storage"""
+
+    #? Available sparse weight formats, the non-zero weights of each unit are stored in one compressed row
+    formats = ['csr']
+
+    def __init__(self):
+        super().__init__('pruning', 'Pruning of small weights and detection of sparse layers')
+
+    def process(self, input, options=None):
+        """Sets the smallest kernel values of each dense layer to zero and records the fraction of zero values in the sparsity object
+           of each layer with at least the given fraction of zero values. The option 'pruning_sparsity' (0 to 1) sets the fraction of
+           kernel values pruned by magnitude, without it the existing zero values are only detected. The option 'sparsity_threshold'
+           (0 to 1, default 0.5) sets the fraction of zero values from which a layer is stored as sparse matrix by the backends"""
+        if (options is None):
+            options = dict()
+
+        sparsity = self.get_fraction(options, 'pruning_sparsity', None)
+        threshold = self.get_fraction(options, 'sparsity_threshold', 0.5)
+
+        for layer in input['config']['layers']:
+            #? Quantized kernels are stored as dense int8 matrix, see the float2int conversion
+            if (layer['class_name'] != 'Dense' or 'quantization' in layer):
+                continue
+
+            kernel = weight_storage.get_array(layer['kernel_values'])
+            if (sparsity is not None):
+                kernel = self.prune(kernel, sparsity)
+                layer['kernel_values'] = kernel
+
+            zero_fraction = float(np.count_nonzero(kernel == 0) / kernel.size) if kernel.size > 0 else 0.0
+            if (kernel.size > 0 and zero_fraction >= threshold):
+                layer['sparsity'] = {'format': self.formats[0], 'zero_fraction': zero_fraction}
+            else:
+                layer.pop('sparsity', None)
+
+        return input
+
+    def get_fraction(self, options, name, default):
+        """Returns the value of the option with the given name as float value between 0 and 1, or default if the option is not set"""
+        if (options.get(name) is None):
+            return default
+        try:
+            value = float(options[name])
+        except ValueError:
+            value = -1
+        if (not 0 <= value <= 1):
+            raise ValueError('Invalid ' + name + ' "' + str(options[name]) + '", must be a number between 0 and 1')
+        return value
+
+    def prune(self, kernel, sparsity):
+        """Returns a copy of the given kernel with the given fraction of its values set to zero, the values with the smallest absolute values are pruned"""
+        pruned = np.array(kernel, copy=True)
+        number_of_pruned_values = int(round(sparsity * pruned.size))
+        #? A stable sort prunes values of equal magnitude in a deterministic order
+        order = np.argsort(np.abs(pruned), axis=None, kind='stable')
+        pruned.flat[order[:number_of_pruned_values]] = 0
+        return pruned
@@ -23,11 +23,22 @@ class Keras(FrontendPlugin):
         count=0
         #? Adding batch_input_shape, units, weight- and bias-values for each layer to the generated json object
         for layer in model_json['config']['layers']:
-            if (layer['class_name']=='Dense'):
-                weights = model.layers[count].get_weights()[0]
-                biases = model.layers[count].get_weights()[1]
-                layer['kernel_values'] = weights.tolist()
-                layer['bias_values'] = biases.tolist()
+            if (layer['class_name'] in ['Dense', 'Conv1D', 'Conv2D']):
+                #? The weights are kept as numpy arrays, converting them to lists would multiply the memory usage
+                #? Convolution kernels have the shape (kernel height, (kernel width,) channels, filters)
+                weights = model.layers[count].get_weights()
+                layer['kernel_values'] = weights[0]
+                if (layer['config'].get('use_bias', True)):
+                    layer['bias_values'] = weights[1]
+            #? Batch normalization layers store gamma and beta only if scale and center are enabled, followed by the moving mean and variance
+            if (layer['class_name'] == 'BatchNormalization'):
+                weights = list(model.layers[count].get_weights())
+                if (layer['config'].get('scale', True)):
+                    layer['gamma_values'] = weights.pop(0)
+                if (layer['config'].get('center', True)):
+                    layer['beta_values'] = weights.pop(0)
+                layer['moving_mean_values'] = weights[0]
+                layer['moving_variance_values'] = weights[1]
 
             count+=1
 
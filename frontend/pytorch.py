@@ -2,7 +2,6 @@ from plugin_collection import FrontendPlugin
 import torch
 import torch.nn as nn
 import numpy as np
-import json
 
 class Pytorch(FrontendPlugin):
     """Pytorch frontend plugin transforms given Pytorch pt-file to the intermediate format"""
@@ -15,6 +14,7 @@ class Pytorch(FrontendPlugin):
                     'MaxPool1d':'MaxPooling1D',
                     'AvgPool2d':'AveragePooling2D',
                     'AvgPool1d':'AveragePooling1D',
+                    'Flatten':'Flatten',
                     'ReLU':'ReLU',
                     'Sigmoid':'Sigmoid',
                     'Tanh':'Tanh',
@@ -24,6 +24,29 @@ class Pytorch(FrontendPlugin):
     def __init__(self):
         super().__init__('pytorch', 'Pytorch Frontend Plugin')
 
+    def get_batch_input_shape(self, model):
+        """Returns the batch_input_shape of the given model with channels_last dimensions. PyTorch modules do not store
+           the spatial size of their input, so that it has to be given as input_shape attribute (channels, height, (width)) of the model"""
+        if (not hasattr(model, 'input_shape')):
+            raise ValueError('The input_shape attribute (channels, height, (width)) of the model is required if the first layer is a convolution or pooling layer')
+        input_shape = list(model.input_shape)
+        return [None] + input_shape[1:] + input_shape[:1]
+
+    def get_convolution_padding(self, layer):
+        """Returns the padding of the intermediate format which corresponds to the padding of the given convolution layer"""
+        if (layer.padding_mode != 'zeros'):
+            raise ValueError('Padding mode "' + layer.padding_mode + '" of convolution layers is not supported')
+        if (isinstance(layer.padding, str)):
+            return layer.padding
+        if (all(padding == 0 for padding in layer.padding)):
+            return 'valid'
+
+        #? Symmetric padding of half the kernel extent keeps the size of the input like padding 'same'
+        extents = [(kernel_size - 1) * dilation for kernel_size, dilation in zip(layer.kernel_size, layer.dilation)]
+        if (all(stride == 1 for stride in layer.stride) and all(2 * padding == extent for padding, extent in zip(layer.padding, extents))):
+            return 'same'
+        raise ValueError('Padding ' + str(layer.padding) + ' of convolution layers is only supported if it corresponds to padding "valid" or "same"')
+
     def transform_to_intermediate_format(self, input):
         """Returns the intermediate format represenation of the given pt-file"""
         output = { "class_name":"Sequential", "config":{"name":"sequential_1", "layers":[]}}
@@ -48,18 +71,45 @@ class Pytorch(FrontendPlugin):
                 if (counter==0):
                     out_layer["config"]["batch_input_shape"] = [None, layer.in_features]
                 out_layer["config"]["units"]= layer.out_features
-                out_layer["kernel_values"] = layer.weight.detach().numpy().tolist()
+                #? The weights are kept as numpy arrays, Linear stores them as (out_features, in_features)
+                #? while the intermediate format expects (in_features, out_features)
+                out_layer["kernel_values"] = layer.weight.detach().numpy().T
+                if (layer.bias is not None):
+                    out_layer["bias_values"] = layer.bias.detach().numpy()
+                    out_layer["config"]["use_bias"] = True
+                else:
+                    out_layer["config"]["use_bias"] = False
+                out_layer["config"]["activation"]="linear"
+            #? Processing convolution layer specific information
+            elif (type(layer)==torch.nn.modules.conv.Conv2d or type(layer)==torch.nn.modules.conv.Conv1d):
+                if (layer.groups != 1):
+                    raise ValueError('Grouped convolutions are not supported')
+                if (counter==0):
+                    out_layer["config"]["batch_input_shape"] = self.get_batch_input_shape(model)
+                out_layer["config"]["filters"] = layer.out_channels
+                out_layer["config"]["kernel_size"] = list(layer.kernel_size)
+                out_layer["config"]["strides"] = list(layer.stride)
+                out_layer["config"]["padding"] = self.get_convolution_padding(layer)
+                out_layer["config"]["data_format"] = "channels_last"
+                out_layer["config"]["dilation_rate"] = list(layer.dilation)
+                #? The weights are stored as (out_channels, in_channels, kernel height, (kernel width)), while the
+                #? intermediate format expects (kernel height, (kernel width,) in_channels, out_channels) like Keras
+                weights = layer.weight.detach().numpy()
+                out_layer["kernel_values"] = weights.transpose(2, 3, 1, 0) if weights.ndim == 4 else weights.transpose(2, 1, 0)
                 if (layer.bias is not None):
-                    out_layer["bias_values"] = layer.bias.detach().numpy().tolist()
+                    out_layer["bias_values"] = layer.bias.detach().numpy()
                     out_layer["config"]["use_bias"] = True
                 else:
                     out_layer["config"]["use_bias"] = False
                 out_layer["config"]["activation"]="linear"
+            #? Flatten layers of PyTorch keep the channels first order, which is the layout of the values in the generated code
+            elif (type(layer)==torch.nn.modules.flatten.Flatten):
+                out_layer["config"]["data_format"] = "channels_first"
             #? Processing pooling layer specific information
             elif (type(layer)==torch.nn.modules.pooling.MaxPool2d or type(layer)==torch.nn.modules.pooling.MaxPool1d
                 or type(layer)==torch.nn.modules.pooling.AvgPool2d or type(layer)==torch.nn.modules.pooling.AvgPool1d):
                 if (counter==0):
-                    out_layer["config"]["batch_input_shape"] = [None, layer.in_channels]
+                    out_layer["config"]["batch_input_shape"] = self.get_batch_input_shape(model)
                 out_layer["config"]["pool_size"] = list(tuple(layer.kernel_size))
                 out_layer["config"]["strides"] = list(tuple(layer.stride))
                 out_layer["config"]["padding"] = "valid" if layer.padding==0 else "same"
@@ -70,5 +120,5 @@ class Pytorch(FrontendPlugin):
                 output["config"]["layers"].append(out_layer)
             counter=counter+1
 
-        #? Returning a json representation of the built model
-        return json.loads(json.dumps(output))
\ No newline at end of file
+        #? Returning the built model, the weights are numpy arrays
+        return output
\ No newline at end of file
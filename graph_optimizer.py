@@ -0,0 +1,166 @@
+import numpy as np
+import layer_utils
+import weight_storage
+
+BATCH_NORMALIZATION_LAYER = 'BatchNormalization'
+#? Layer classes which only act during training, at inference time their output is their unchanged input
+INFERENCE_IDENTITY_LAYERS = [layer_utils.DROPOUT_LAYER, 'SpatialDropout1D', 'SpatialDropout2D', 'AlphaDropout', 'GaussianDropout', 'GaussianNoise']
+#? Keys of the report which count the rewrites of each pass, in the order the passes are performed
+PASS_NAMES = ['removed_identity_layers', 'folded_batch_normalizations', 'fused_activations']
+
+def get_layer_flops(input):
+    """Returns a list with the number of floating point operations of each layer for a single sample. A multiply-add counts as two operations,
+       an activation function or a comparison as one operation for each value and a batch normalization as two operations for each value"""
+    heights, widths, depths = layer_utils.get_output_dimensions(input)
+    pool_heights, pool_widths = layer_utils.get_pool_sizes(input)
+    flops = []
+    for index, layer in enumerate(input['config']['layers']):
+        class_name = layer['class_name']
+        #? The output dimensions contain the input of the model, so that the output of layer index is located at index + 1
+        output_size = heights[index + 1] * widths[index + 1] * depths[index + 1]
+        if (class_name in layer_utils.WEIGHTED_LAYERS):
+            kernel_shape = weight_storage.get_array(layer['kernel_values']).shape
+            layer_flops = 2 * int(np.prod(kernel_shape[:-1])) * output_size
+            if (layer['config'].get('use_bias', True)):
+                layer_flops = layer_flops + output_size
+            if (layer['config'].get('activation', 'linear').lower() != 'linear'):
+                layer_flops = layer_flops + output_size
+        elif (class_name == layer_utils.ACTIVATION_LAYER):
+            layer_flops = output_size if layer['config']['activation'].lower() != 'linear' else 0
+        elif (class_name == BATCH_NORMALIZATION_LAYER):
+            layer_flops = 2 * output_size
+        elif ('Pooling' in class_name):
+            layer_flops = pool_heights[index] * pool_widths[index] * output_size
+        else:
+            layer_flops = 0
+        flops.append(layer_flops)
+    return flops
+
+def remove_layer(layers, index):
+    """Removes the layer with the given index from the given list of layers, the batch_input_shape of the first layer is moved to the next layer"""
+    layer = layers.pop(index)
+    if (index == 0 and 'batch_input_shape' in layer['config'] and layers):
+        layers[0]['config'] = dict(layers[0]['config'], batch_input_shape=layer['config']['batch_input_shape'])
+
+def remove_identity_layers(layers):
+    """Removes the layers which do not transform their input at inference time from the given list of layers and returns the number of removed layers.
+       Flatten layers are only removed if their input is already flat, otherwise they define the order of the inputs of the following dense layer"""
+    removed = 0
+    index = 0
+    while (index < len(layers) and len(layers) > 1):
+        layer = layers[index]
+        if (layer['class_name'] in INFERENCE_IDENTITY_LAYERS or (layer['class_name'] == layer_utils.FLATTEN_LAYER and is_flat_input(layers, index))):
+            remove_layer(layers, index)
+            removed = removed + 1
+        else:
+            index = index + 1
+    return removed
+
+def is_flat_input(layers, index):
+    """Returns whether the input of the layer with the given index has a single dimension, e.g. the output of a dense layer"""
+    _, widths, depths = layer_utils.get_output_dimensions({'config': {'layers': layers[:index + 1]}})
+    return widths[index] == 1 and depths[index] == 1
+
+def get_batch_normalization_axis(layer):
+    """Returns the normalized axis of the given batch normalization layer, axes are given as integer or as list with a single integer"""
+    axis = layer['config'].get('axis', -1)
+    if (isinstance(axis, (list, tuple))):
+        if (len(axis) != 1):
+            raise ValueError('Batch normalization over several axes ' + str(axis) + ' is not supported')
+        axis = axis[0]
+    return int(axis)
+
+def fold_batch_normalization(layers):
+    """Folds each batch normalization layer of the given list of layers into the kernel and the biases of the directly preceding dense or convolution layer
+       and returns the number of folded layers. The scale gamma / sqrt(moving_variance + epsilon) multiplies the kernel of each unit and the bias becomes
+       (bias - moving_mean) * scale + beta. Raises a ValueError for batch normalization layers which can not be folded"""
+    folded = 0
+    index = 0
+    while (index < len(layers)):
+        layer = layers[index]
+        if (layer['class_name'] != BATCH_NORMALIZATION_LAYER):
+            index = index + 1
+            continue
+
+        previous = layers[index - 1] if index > 0 else None
+        if (previous is None or previous['class_name'] not in layer_utils.WEIGHTED_LAYERS or 'quantization' in previous
+            or previous['config'].get('activation', 'linear').lower() != 'linear'
+            or previous['config'].get('data_format', 'channels_last') != 'channels_last'):
+            raise ValueError('Batch normalization layer ' + str(index) + ' can only be folded into a directly preceding dense or convolution layer without activation function')
+
+        kernel = weight_storage.get_array(previous['kernel_values']).astype(np.float64)
+        #? The units are the last dimension of the output of the preceding layer, one-dimensional outputs of convolutions have the shape (steps, filters)
+        output_rank = 2 if previous['class_name'] == layer_utils.DENSE_LAYER else kernel.ndim
+        if (get_batch_normalization_axis(layer) not in [-1, output_rank - 1]):
+            raise ValueError('Batch normalization layer ' + str(index) + ' does not normalize the units of the preceding layer')
+
+        units = kernel.shape[-1]
+        gamma = get_parameter(layer, 'gamma_values', 'scale', units, 1.0)
+        beta = get_parameter(layer, 'beta_values', 'center', units, 0.0)
+        mean = weight_storage.get_array(layer['moving_mean_values']).astype(np.float64)
+        variance = weight_storage.get_array(layer['moving_variance_values']).astype(np.float64)
+        scale = gamma / np.sqrt(variance + float(layer['config'].get('epsilon', 0.001)))
+
+        use_bias = previous['config'].get('use_bias', True)
+        bias = weight_storage.get_array(previous['bias_values']).astype(np.float64) if use_bias else np.zeros(units)
+        previous['kernel_values'] = (kernel * scale).astype(np.float32)
+        previous['bias_values'] = ((bias - mean) * scale + beta).astype(np.float32)
+        previous['config'] = dict(previous['config'], use_bias=True)
+
+        layers.pop(index)
+        folded = folded + 1
+    return folded
+
+def get_parameter(layer, key, flag, units, default):
+    """Returns the values of the given parameter of a batch normalization layer, parameters disabled by the given config flag have the default value"""
+    if (not layer['config'].get(flag, True) or key not in layer):
+        return np.full(units, default)
+    return weight_storage.get_array(layer[key]).astype(np.float64)
+
+def fuse_activations(layers):
+    """Moves each activation layer of the given list of layers into the directly preceding dense or convolution layer without activation function
+       and removes linear activation layers. Returns the number of removed activation layers. Softmax functions of convolution layers are calculated
+       over all values of the output instead of each channel, therefore they are not fused into convolution layers"""
+    fused = 0
+    index = 1
+    while (index < len(layers)):
+        layer = layers[index]
+        previous = layers[index - 1]
+        if (layer['class_name'] != layer_utils.ACTIVATION_LAYER):
+            index = index + 1
+            continue
+
+        activation = layer['config']['activation'].lower()
+        if (activation == 'linear'):
+            remove_layer(layers, index)
+            fused = fused + 1
+        elif (previous['class_name'] in layer_utils.WEIGHTED_LAYERS and previous['config'].get('activation', 'linear').lower() == 'linear'
+              and (previous['class_name'] == layer_utils.DENSE_LAYER or activation != 'softmax')):
+            previous['config'] = dict(previous['config'], activation=activation)
+            remove_layer(layers, index)
+            fused = fused + 1
+        else:
+            index = index + 1
+    return fused
+
+def optimize(input):
+    """Returns a copy of the given intermediate format optimized for inference together with a report dict. The passes remove layers without effect
+       at inference time, fold batch normalization layers into the preceding weighted layer and fuse activation layers into the preceding weighted layer.
+       The report contains the number of layers and floating point operations per sample before and after the optimization and the rewrites of each pass"""
+    output = weight_storage.copy_layers(input)
+    layers = output['config']['layers']
+    report = {'layers_before': len(layers), 'flops_before': sum(get_layer_flops(input))}
+
+    report['removed_identity_layers'] = remove_identity_layers(layers)
+    report['folded_batch_normalizations'] = fold_batch_normalization(layers)
+    report['fused_activations'] = fuse_activations(layers)
+
+    report['layers_after'] = len(layers)
+    report['flops_after'] = sum(get_layer_flops(output))
+    return output, report
+
+def get_report_string(report):
+    """Returns a single line summary of the given optimization report"""
+    return ('Graph optimization removed ' + str(report['layers_before'] - report['layers_after']) + ' of ' + str(report['layers_before']) + ' layers and '
+            + str(report['flops_before'] - report['flops_after']) + ' of ' + str(report['flops_before']) + ' FLOPs per sample ('
+            + ', '.join(name.replace('_', ' ') + ': ' + str(report[name]) for name in PASS_NAMES) + ')')
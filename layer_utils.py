@@ -0,0 +1,307 @@
+import numpy as np
+import weight_storage
+
+#? Layer names and shape helpers of the intermediate format, shared by the passes of the translator, the reference executor and the backends
+
+#? Definition of the layer names/class names
+DENSE_LAYER = 'Dense'
+CONV_2D_LAYER = 'Conv2D'
+CONV_1D_LAYER = 'Conv1D'
+CONV_3D_LAYER = 'Conv3D'
+MAX_POOL_2D_LAYER = 'MaxPooling2D'
+MAX_POOL_1D_LAYER = 'MaxPooling1D'
+AVG_POOL_2D_LAYER = 'AveragePooling2D'
+AVG_POOL_1D_LAYER = 'AveragePooling1D'
+FLATTEN_LAYER = 'Flatten'
+ACTIVATION_LAYER = 'Activation'
+DROPOUT_LAYER = 'Dropout'
+
+#? Groups of layers which are processed in the same way
+CONV_LAYERS = [CONV_1D_LAYER, CONV_2D_LAYER]
+ONE_DIMENSIONAL_LAYERS = [CONV_1D_LAYER, MAX_POOL_1D_LAYER, AVG_POOL_1D_LAYER]
+#? Layers with kernel and bias values, the weights of each unit (neuron or filter) are stored in one row
+WEIGHTED_LAYERS = [DENSE_LAYER, CONV_1D_LAYER, CONV_2D_LAYER]
+
+def get_output_dimensions(input):
+    """Returns an array with height values, an array with width values and an array with depth values of the given input"""
+    height_array = []
+    last_output_height=0
+    width_array = []
+    last_output_width=0
+    depth_array = []
+    last_output_depth =0
+
+    for layer in input['config']['layers']:
+        if (layer['class_name'] == CONV_3D_LAYER):
+            raise ValueError('Convolution layers with three spatial dimensions are not supported')
+        input_height = last_output_height
+        input_width = last_output_width
+        input_depth = last_output_depth
+
+        if 'batch_input_shape' in layer['config']:
+            #? Extraction of 1st dimension (height)
+            height_array.append(layer['config']['batch_input_shape'][1])
+            input_height = layer['config']['batch_input_shape'][1]
+
+            last_output_height = input_height
+
+            #? The input of one-dimensional layers has the shape (steps, channels), the channels are stored as depth
+            if (len(layer['config']['batch_input_shape'])==3 and layer['class_name'] in ONE_DIMENSIONAL_LAYERS):
+                width_array.append(1)
+                input_width = 1
+                last_output_width = input_width
+                depth_array.append(layer['config']['batch_input_shape'][2])
+                input_depth = layer['config']['batch_input_shape'][2]
+                last_output_depth = input_depth
+
+            #? Extraction of 2nd dimension (width)
+            elif (len(layer['config']['batch_input_shape'])>2):
+                width_array.append(layer['config']['batch_input_shape'][2])
+                input_width = layer['config']['batch_input_shape'][2]
+
+                last_output_width = input_width
+
+                #? Extraction of 3rd dimension (depth)
+                if (len(layer['config']['batch_input_shape'])>3):
+                    depth_array.append(layer['config']['batch_input_shape'][3])
+                    input_depth = layer['config']['batch_input_shape'][3]
+
+                    last_output_depth = input_depth
+                else:
+                    depth_array.append(1)
+                    input_depth = 1
+                    last_output_depth = input_depth
+            else:
+                width_array.append(1)
+                input_width = 1
+                last_output_width = input_width
+                depth_array.append(1)
+                input_depth = 1
+                last_output_depth = input_depth
+
+        #? Layers without transformation, e.g. activation and dropout layers, keep the dimensions of their input
+        act_height = input_height
+        act_width = input_width
+        act_depth = input_depth
+
+        #? Differentiation between layer types and specific processing
+        if (layer['class_name']==DENSE_LAYER):
+            act_height = weight_storage.get_array(layer['kernel_values']).shape[1]
+            act_width = 1
+            act_depth = 1
+        if (layer['class_name'] in CONV_LAYERS):
+            kernel_size, strides, dilations, padding = get_convolution_parameters(layer)
+            act_height, _ = get_convolution_output_size(input_height, kernel_size[0], strides[0], dilations[0], padding)
+            act_width, _ = get_convolution_output_size(input_width, kernel_size[1], strides[1], dilations[1], padding)
+            act_depth = layer['config']['filters']
+        if (layer['class_name']==FLATTEN_LAYER):
+            act_height = last_output_height * last_output_width * last_output_depth
+            act_width = 1
+            act_depth = 1
+        #? Pooling layers are sized like convolutions without dilation: with padding 'same' the output size is the input size divided by the stride (rounded up),
+        #? with padding 'valid' windows which do not fit completely are dropped
+        if (layer['class_name']==AVG_POOL_1D_LAYER or layer['class_name']==MAX_POOL_1D_LAYER):
+            act_height, _ = get_convolution_output_size(input_height, layer['config']['pool_size'][0], layer['config']['strides'][0], 1, layer['config']['padding'].lower())
+            act_width=1
+            act_depth = last_output_depth
+
+        if (layer['class_name']==AVG_POOL_2D_LAYER or layer['class_name']==MAX_POOL_2D_LAYER):
+            act_height, _ = get_convolution_output_size(input_height, layer['config']['pool_size'][0], layer['config']['strides'][0], 1, layer['config']['padding'].lower())
+            act_width, _ = get_convolution_output_size(input_width, layer['config']['pool_size'][1], layer['config']['strides'][1], 1, layer['config']['padding'].lower())
+            act_depth = last_output_depth
+
+        height_array.append(int(act_height))
+        width_array.append(int(act_width))
+        depth_array.append(int(act_depth))
+
+        last_output_height = act_height
+        last_output_width = act_width
+        last_output_depth = act_depth
+
+    return height_array, width_array, depth_array
+
+def get_convolution_parameters(layer):
+    """Returns the kernel size, the strides and the dilation rates as (height, width) tuples and the padding of the given convolution layer.
+       One-dimensional convolutions slide along the height, their width is 1"""
+    config = layer['config']
+    if (config.get('data_format', 'channels_last') != 'channels_last'):
+        raise ValueError('Convolution layer "' + config.get('name', layer['class_name']) + '" uses the unsupported data format "' + config['data_format'] + '"')
+    if (config.get('activation', 'linear').lower() == 'softmax'):
+        raise ValueError('Convolution layer "' + config.get('name', layer['class_name']) + '" uses the softmax activation function, use a separate activation layer instead')
+    padding = config.get('padding', 'valid').lower()
+    if (padding not in ['valid', 'same']):
+        raise ValueError('Convolution layer "' + config.get('name', layer['class_name']) + '" uses the unsupported padding "' + padding + '"')
+
+    strides = config.get('strides', [1, 1])
+    dilations = config.get('dilation_rate', [1, 1])
+    if (layer['class_name'] == CONV_1D_LAYER):
+        return (config['kernel_size'][0], 1), (strides[0], 1), (dilations[0], 1), padding
+    return tuple(config['kernel_size']), tuple(strides), tuple(dilations), padding
+
+def get_convolution_output_size(input_size, kernel_size, stride, dilation, padding):
+    """Returns the output size and the number of zeros padded before the input of a convolution along one dimension.
+       With padding 'same' the output size is the input size divided by the stride (rounded up) and the padding is split like in Keras,
+       with the larger half after the input"""
+    extent = (kernel_size - 1) * dilation + 1
+    if (padding == 'same'):
+        output_size = (input_size + stride - 1) // stride
+        padding_size = max((output_size - 1) * stride + extent - input_size, 0)
+        return output_size, padding_size // 2
+    return (input_size - extent) // stride + 1, 0
+
+def get_dilations(input):
+    """Returns an array with vertical and an array with horizontal dilation rates of the convolution layers of the given input, 0 for other layers"""
+    height_array = []
+    width_array = []
+    for layer in input['config']['layers']:
+        if (layer['class_name'] in CONV_LAYERS):
+            _, _, dilations, _ = get_convolution_parameters(layer)
+            height_array.append(dilations[0])
+            width_array.append(dilations[1])
+        else:
+            height_array.append(0)
+            width_array.append(0)
+    return height_array, width_array
+
+def get_convolution_paddings(input, layerOutputHeight, layerOutputWidth):
+    """Returns an array with the number of zero rows padded above and an array with the number of zero columns padded left of the input
+       of each convolution layer, 0 for other layers"""
+    top_array = []
+    left_array = []
+    for index, layer in enumerate(input['config']['layers']):
+        if (layer['class_name'] in CONV_LAYERS):
+            kernel_size, strides, dilations, padding = get_convolution_parameters(layer)
+            top_array.append(get_convolution_output_size(layerOutputHeight[index], kernel_size[0], strides[0], dilations[0], padding)[1])
+            left_array.append(get_convolution_output_size(layerOutputWidth[index], kernel_size[1], strides[1], dilations[1], padding)[1])
+        else:
+            top_array.append(0)
+            left_array.append(0)
+    return top_array, left_array
+
+def get_pool_sizes(input):
+    """Returns an array with pool (or kernel) height values and an array with pool (or kernel) width values of the given input"""
+    width_array=[]
+    height_array=[]
+
+    for layer in input['config']['layers']:
+        if (layer['class_name'] in CONV_LAYERS):
+            kernel_size, _, _, _ = get_convolution_parameters(layer)
+            height_array.append(kernel_size[0])
+            width_array.append(kernel_size[1])
+        elif (layer['class_name']==MAX_POOL_2D_LAYER or layer['class_name']==AVG_POOL_2D_LAYER):
+            height_array.append(layer['config']['pool_size'][0])
+            width_array.append(layer['config']['pool_size'][1])
+        elif (layer['class_name']==MAX_POOL_1D_LAYER or layer['class_name']==AVG_POOL_1D_LAYER):
+            height_array.append(layer['config']['pool_size'][0])
+            width_array.append(1)
+        else:
+            height_array.append(0)
+            width_array.append(0)
+
+    return height_array, width_array
+
+def get_strides(input):
+    """Returns an array with stride height values and an array with stride width values of the given input"""
+    width_array=[]
+    height_array=[]
+    for layer in input['config']['layers']:
+        if (layer['class_name'] in CONV_LAYERS):
+            _, strides, _, _ = get_convolution_parameters(layer)
+            height_array.append(strides[0])
+            width_array.append(strides[1])
+        elif (layer['class_name']==MAX_POOL_2D_LAYER or layer['class_name']==AVG_POOL_2D_LAYER):
+            height_array.append(layer['config']['strides'][0])
+            width_array.append(layer['config']['strides'][1])
+        elif (layer['class_name']==MAX_POOL_1D_LAYER or layer['class_name']==AVG_POOL_1D_LAYER):
+            height_array.append(layer['config']['strides'][0])
+            width_array.append(1)
+        else:
+            height_array.append(0)
+            width_array.append(0)
+
+    return height_array, width_array
+
+def get_paddings(input, padding_types):
+    """Returns an array of indices representing the padding type for each layer"""
+    array=[]
+    for layer in input['config']['layers']:
+        if (layer['class_name']==MAX_POOL_2D_LAYER or layer['class_name']==AVG_POOL_2D_LAYER):
+            array.append(padding_types[layer['config']['padding']])
+        else:
+            array.append(0)
+
+    return array
+
+def get_number_of_units(layer):
+    """Returns the number of units (neurons of dense layers, filters of convolution layers) of the given weighted layer"""
+    return int(layer['config']['units'] if layer['class_name']==DENSE_LAYER else layer['config']['filters'])
+
+def get_bias_start_indices(input):
+    """Returns an array of indices indicating the start position of biases for each layer"""
+    last_layer_values = 0
+    bias_indices_array=[]
+    for layer in input['config']['layers']:
+        if (layer['class_name'] in WEIGHTED_LAYERS):
+            bias_indices_array.append(int(last_layer_values))
+            last_layer_values = last_layer_values + get_number_of_units(layer)
+        else:
+            bias_indices_array.append(0)
+    return bias_indices_array
+
+def get_flatten_index(input, index):
+    """Returns the index of the flatten layer the layer with the given index directly reads from (dropout layers in between are skipped), or None"""
+    layers = input['config']['layers']
+    for previous_index in range(index - 1, -1, -1):
+        if (layers[previous_index]['class_name'] == FLATTEN_LAYER):
+            return previous_index
+        if (layers[previous_index]['class_name'] != DROPOUT_LAYER):
+            return None
+    return None
+
+def get_kernel_row_permutation(input, index, layerOutputHeight, layerOutputWidth, layerOutputDepth):
+    """Returns the permutation of the kernel rows of the dense layer with the given index to the planar layout of the flattened values, or None if the rows are in order.
+       A flatten layer with channels_last data format orders its output by row, column and channel, while the generated code and the reference executor store the values by channel, row and column"""
+    flatten_index = get_flatten_index(input, index)
+    if (flatten_index is None or layerOutputDepth[flatten_index] == 1
+        or input['config']['layers'][flatten_index]['config'].get('data_format', 'channels_last') != 'channels_last'):
+        return None
+    shape = (layerOutputHeight[flatten_index], layerOutputWidth[flatten_index], layerOutputDepth[flatten_index])
+    return np.arange(shape[0] * shape[1] * shape[2]).reshape(shape).transpose(2, 0, 1).reshape(-1)
+
+def get_kernel_matrix(input, index, layerOutputHeight, layerOutputWidth, layerOutputDepth):
+    """Returns the kernel of the weighted layer with the given index as matrix with one row for each input value in the planar layout and one column
+       for each unit. The rows of convolution kernels are ordered by input channel, kernel row and kernel column like the planar input of the layer"""
+    layer = input['config']['layers'][index]
+    kernel = weight_storage.get_array(layer['kernel_values'])
+    if (layer['class_name'] in CONV_LAYERS):
+        #? Kernels of one-dimensional convolutions have the shape (kernel size, channels, filters)
+        if (kernel.ndim == 3):
+            kernel = kernel[:, np.newaxis]
+        return kernel.transpose(2, 0, 1, 3).reshape(-1, kernel.shape[-1])
+
+    permutation = get_kernel_row_permutation(input, index, layerOutputHeight, layerOutputWidth, layerOutputDepth)
+    return kernel if permutation is None else kernel[permutation]
+
+def is_quantized(input):
+    """Returns whether the dense layers of the given input are quantized to int8 values by the float2int conversion"""
+    quantized = [('quantization' in layer) for layer in input['config']['layers'] if layer['class_name']==DENSE_LAYER]
+    if (any(quantized) and not all(quantized)):
+        raise ValueError('Either all or none of the dense layers must be quantized')
+    if (any(quantized) and any(layer['class_name'] in CONV_LAYERS for layer in input['config']['layers'])):
+        raise ValueError('Convolution layers are not supported in models with quantized weights')
+    return any(quantized)
+
+def get_quantization_information(input):
+    """Returns a flattened array with the kernel scale and an array with the kernel zero point of each unit of the quantized dense layers"""
+    kernel_scale_array = []
+    kernel_zero_point_array = []
+    for layer in input['config']['layers']:
+        if (layer['class_name']==DENSE_LAYER and 'quantization' in layer):
+            quantization = layer['quantization']
+            units = int(layer['config']['units'])
+
+            #? Per layer scales are repeated for each unit, so that the scales are always indexed by unit
+            repetitions = units if len(quantization['kernel_scale']) == 1 else 1
+            kernel_scale_array.extend(quantization['kernel_scale'] * repetitions)
+            kernel_zero_point_array.extend(quantization['kernel_zero_point'] * repetitions)
+    return kernel_scale_array, kernel_zero_point_array
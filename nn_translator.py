@@ -1,8 +1,17 @@
 import traceback
 import argparse
+import concurrent.futures
+import glob
 import json
+import os
+import sys
+import time
 from plugin_collection import PluginCollection
-from jsonschema import validate,ValidationError
+import weight_storage
+import schema_validation
+import translation_cache
+import graph_optimizer
+from jsonschema import ValidationError
 
 def get_available_plugins(plugins):
     """ Returns a string containing a list of available plugins in the given PluginCollection"""
@@ -11,66 +20,328 @@ def get_available_plugins(plugins):
         av_plugins += plugin.identifier + ', '
     return av_plugins[:-2]
 
+def get_plugin_options(options):
+    """ Returns a dictionary of the given list of key=value strings"""
+    plugin_options = dict()
+    if (options is not None):
+        for option in options:
+            if ('=' not in option):
+                raise ValueError('Option "' + option + '" is not of the form key=value')
+            key, value = option.split('=', 1)
+            plugin_options[key.strip()] = value.strip()
+    return plugin_options
+
+#? Files besides the plugins which influence the result of a translation, they are part of the cache keys
+CORE_SOURCE_FILES = [os.path.join(os.path.dirname(os.path.abspath(__file__)), name)
+                     for name in ['nn_translator.py', 'weight_storage.py', 'schema_validation.py', 'graph_optimizer.py', 'layer_utils.py', 'intermediate.schema.json']]
+
 #? Collecting the available plugins in the corresponding folders
 frontend_plugins = PluginCollection('frontend')
 conversion_plugins = PluginCollection('conversion')
 backend_plugins = PluginCollection('backend')
 
-#? Parsing command line arguments
-parser = argparse.ArgumentParser(description='Translates high-level neural network model to native code for specified backend')
-parser.add_argument('-f', '--frontend', type=str, required=True, help='Frontend type of the input file, available at the moment: '+ get_available_plugins(frontend_plugins.plugins))
-parser.add_argument('-b', '--backend', type=str, required=True, help='Backend type to translate into, available at the moment: '+ get_available_plugins(backend_plugins.plugins))
-parser.add_argument('-c', '--conversions', nargs='+', help='Conversions to be performed on data, available at the moment: '+ get_available_plugins(conversion_plugins.plugins))
-parser.add_argument('-i', '--input', type=str, required=True, help='Input file containing the neural network model')
-parser.add_argument('-o', '--output', type=str, required=True, help='Output file to write to')
-parser.add_argument('-e', '--executable', type=str, help='Path to an executable file which contains the prediction call, when set the given file will be copied into the output directory')
-args = parser.parse_args()
-
-try:
-    #? Searching for the correct plugins to process the given input
-    frontend = frontend_plugins.get_plugin(args.frontend.lower())
-    backend = backend_plugins.get_plugin(args.backend.lower())
-
-    print('Converting inputfile "' + args.input + '" to intermediate format with plugin "' + frontend.identifier + '"')
-    #? Transforming the input file to the intermediate format
-    intermediate = frontend.transform_to_intermediate_format(args.input)
-
-    #? Validating the produced intermediate format with the json schema in order to check the correctness of the result
-    with open('intermediate.schema.json') as json_file:
-        schema = json.load(json_file)
-        validate(intermediate, schema)
+def get_cache_keys(frontend_identifier, backend_identifier, input_file, output_file, conversions, executable_file, options, validation, optimize=True):
+    """Returns the cache keys of the intermediate format and of the generated outputs of the given translation.
+       The keys cover the content of the input file, the source of the used plugins including the templates, the conversions and the options"""
+    backend_info = backend_plugins.get_plugin_info(backend_identifier)
+    conversion_identifiers = list(conversions or []) + list(backend_info.prerequisites or [])
+    intermediate_key = translation_cache.get_key('intermediate', translation_cache.get_file_hash(input_file), frontend_identifier, validation,
+                                                 translation_cache.get_source_hash(frontend_plugins.get_plugin_source_paths(frontend_identifier) + CORE_SOURCE_FILES))
+    conversion_source_paths = [path for identifier in conversion_identifiers for path in conversion_plugins.get_plugin_source_paths(identifier)]
+    outputs_key = translation_cache.get_key('outputs', intermediate_key, optimize, conversion_identifiers, translation_cache.get_source_hash(conversion_source_paths),
+                                            backend_identifier, translation_cache.get_source_hash(backend_plugins.get_plugin_source_paths(backend_identifier)),
+                                            options, output_file, translation_cache.get_file_hash(executable_file) if executable_file is not None else None)
+    return intermediate_key, outputs_key
+
+def translate(frontend_identifier, backend_identifier, input_file, output_file, conversions=None, executable_file=None, weights_file=None,
+              options=None, validation='structural', verbose=True, cache=None, optimize=True):
+    """Translates the given input file with the given frontend, conversion and backend plugins and returns a dict with the time in seconds of each stage
+       and the result of the lookup in the given TranslationCache, together with the summary of the generated code if the backend returns one. Without cache or with a weights file, every translation is performed in full.
+       If optimize is set, the intermediate format is optimized for inference before the conversions and the report of the graph optimizer is returned too.
+       Raises a ValidationError if the output of the frontend does not match the schema and a NotImplementedError if a plugin is not available"""
+    if (options is None):
+        options = dict()
+    timings = dict()
+    start_time = time.perf_counter()
+    frontend_identifier = frontend_identifier.lower()
+    backend_identifier = backend_identifier.lower()
+
+    #? Searching for the correct plugins to process the given input, the frontend is only imported if the intermediate format is not cached
+    frontend_plugins.get_plugin_info(frontend_identifier)
+    backend = backend_plugins.get_plugin(backend_identifier)
+    out_dir = backend.get_output_directory(output_file)
+
+    #? The weights file is an output of the translation outside of the output directory, therefore those translations are not cached
+    intermediate = None
+    use_cache = cache is not None and weights_file is None
+    if (use_cache):
+        intermediate_key, outputs_key = get_cache_keys(frontend_identifier, backend_identifier, input_file, output_file, conversions, executable_file, options, validation, optimize)
+        if (cache.get_outputs(outputs_key, out_dir)):
+            if (verbose):
+                print('Using cached translation of inputfile "' + input_file + '"')
+            timings['cache'] = 'outputs'
+            summary = cache.get_summary(outputs_key)
+            if (summary):
+                timings['summary'] = summary
+                if (verbose):
+                    print_summary(summary)
+            timings['total'] = time.perf_counter() - start_time
+            return timings
+        intermediate = cache.get_intermediate(intermediate_key)
+        timings['cache'] = 'miss' if intermediate is None else 'intermediate'
+
+    if (intermediate is None):
+        frontend = frontend_plugins.get_plugin(frontend_identifier)
+        if (verbose):
+            print('Converting inputfile "' + input_file + '" to intermediate format with plugin "' + frontend.identifier + '"')
+        #? Transforming the input file to the intermediate format
+        stage_time = time.perf_counter()
+        intermediate = frontend.transform_to_intermediate_format(input_file)
+
+        #? Weights referencing sidecar files are memory-mapped, the file names are relative to the input file
+        intermediate = weight_storage.load_weights(intermediate, os.path.dirname(os.path.abspath(input_file)))
+        timings['frontend'] = time.perf_counter() - stage_time
+
+        #? Validating the produced intermediate format with the json schema in order to check the correctness of the result
+        stage_time = time.perf_counter()
+        schema_validation.validate_intermediate(intermediate, validation)
+        timings['validation'] = time.perf_counter() - stage_time
+
+        if (use_cache):
+            cache.put_intermediate(intermediate_key, intermediate)
+    elif (verbose):
+        print('Using cached intermediate format of inputfile "' + input_file + '"')
 
+    #? Moving the weights to the sidecar file, so that they are not held in memory during the translation
+    if (weights_file is not None):
+        intermediate = weight_storage.save_weights(intermediate, weights_file)
+        intermediate = weight_storage.load_weights(intermediate, os.path.dirname(os.path.abspath(weights_file)))
+
+    #? Removing layers without effect at inference time and folding layers into the preceding weighted layers, before the conversions change the weights
+    if (optimize):
+        stage_time = time.perf_counter()
+        intermediate, report = graph_optimizer.optimize(intermediate)
+        timings['optimization'] = time.perf_counter() - stage_time
+        timings['optimization_report'] = report
+        if (verbose):
+            print(graph_optimizer.get_report_string(report))
+
+    stage_time = time.perf_counter()
     #? If conversion plugins were defined within the command line arguments those are executed
-    if (args.conversions is not None):
-        for conversion in args.conversions:
+    if (conversions is not None):
+        for conversion in conversions:
             conv_plugin = conversion_plugins.get_plugin(conversion)
-            print('Performing conversion: "' + conv_plugin.description + '"')
-            intermediate = conv_plugin.process(intermediate)
+            if (verbose):
+                print('Performing conversion: "' + conv_plugin.description + '"')
+            intermediate = conv_plugin.process(intermediate, options)
 
     #? If the selected backend plugin has any prerequisites those conversions are executed too
     if (backend.prerequisites is not None):
         for prerequisite in backend.prerequisites:
             conv_plugin = conversion_plugins.get_plugin(prerequisite)
-            print('Performing required conversion by backend plugin "' + backend.identifier + '": "' + conv_plugin.description + '"')
-            intermediate = conv_plugin.process(intermediate)
+            if (verbose):
+                print('Performing required conversion by backend plugin "' + backend.identifier + '": "' + conv_plugin.description + '"')
+            intermediate = conv_plugin.process(intermediate, options)
+    timings['conversions'] = time.perf_counter() - stage_time
 
-    print('Translating intermediate format to native code with plugin "' + backend.identifier + '"')
-    exec_file = None
-    if (args.executable is not None):
-        exec_file = args.executable
+    if (verbose):
+        print('Translating intermediate format to native code with plugin "' + backend.identifier + '"')
     #? Translating the produced intermediate format to native code of the backend plugin
-    backend.translate_to_native_code(intermediate, args.output, exec_file)
-
-    print('Translation of input-file "' + args.input + '" to output-file "' + args.output + '" successfully completed')
-
-#? Error Handling
-except ValidationError:
-    print('Output of frontend plugin "' + frontend.identifier + '" does not match JSON schema.')
-except NotImplementedError:
-    print('Selected frontend/backend is not available')
-except IOError as ioerr:
-    print('Error occurred while opening the file: ')
-    print(traceback.format_exception_only(type(ioerr), ioerr))
-except Exception as err:
-    print('An error occurred: ')
-    print(traceback.format_exception_only(type(err), err))
\ No newline at end of file
+    stage_time = time.perf_counter()
+    out_dir_state = translation_cache.get_directory_state(out_dir)
+    summary = backend.translate_to_native_code(intermediate, output_file, executable_file, options)
+    timings['backend'] = time.perf_counter() - stage_time
+
+    #? Backends may summarize the generated code, e.g. its memory requirements
+    if (summary):
+        timings['summary'] = summary
+        if (verbose):
+            print_summary(summary)
+
+    if (use_cache):
+        cache.put_outputs(outputs_key, out_dir, out_dir_state, summary)
+
+    timings['total'] = time.perf_counter() - start_time
+    return timings
+
+def print_summary(summary):
+    """Prints the given summary of the generated code returned by a backend plugin"""
+    for label, value in summary.items():
+        print(label + ': ' + str(value))
+
+def get_error_message(error, frontend_identifier):
+    """Returns the message which is shown to the user for the given error raised by translate"""
+    if (isinstance(error, ValidationError)):
+        return 'Output of frontend plugin "' + frontend_identifier + '" does not match JSON schema: ' + error.message
+    if (isinstance(error, NotImplementedError)):
+        return 'Selected frontend/backend is not available'
+    return ''.join(traceback.format_exception_only(type(error), error)).strip()
+
+def get_manifest_entries(filename, defaults):
+    """Returns the list of translation entries of the given manifest file. The manifest is a json list of objects with the keys
+       input, output, frontend, backend, conversions, executable, weights and options, keys which are not set are taken from the given defaults.
+       Relative paths are relative to the directory of the manifest"""
+    with open(filename, 'r') as file:
+        manifest = json.load(file)
+    directory = os.path.dirname(os.path.abspath(filename))
+
+    entries = []
+    for item in manifest:
+        entry = dict(defaults)
+        entry.update(item)
+        if ('input' not in item):
+            raise ValueError('Manifest entry ' + str(len(entries)) + ' has no input')
+        entry['options'] = dict(defaults.get('options') or dict(), **(item.get('options') or dict()))
+        for key in ['input', 'executable', 'weights']:
+            if (entry.get(key) is not None):
+                entry[key] = os.path.join(directory, entry[key])
+        if (entry.get('output') is None):
+            entry['output'] = os.path.splitext(os.path.basename(entry['input']))[0]
+        entries.append(entry)
+    return entries
+
+def get_glob_entries(pattern, defaults):
+    """Returns a translation entry with the given defaults for each file matching the given glob pattern.
+       The output name of each entry is the name of the input file without extension"""
+    entries = []
+    for filename in sorted(glob.glob(pattern)):
+        entry = dict(defaults)
+        entry['input'] = filename
+        entry['output'] = os.path.splitext(os.path.basename(filename))[0]
+        entries.append(entry)
+    return entries
+
+def init_batch_worker(entries):
+    """Prepares a batch worker process by importing the plugins of the given entries and compiling the schema validator once,
+       so that the plugins are kept warm for all translations of the worker"""
+    for entry in entries:
+        for plugins, identifiers in [(frontend_plugins, [entry['frontend']]), (backend_plugins, [entry['backend']]), (conversion_plugins, entry.get('conversions') or [])]:
+            for identifier in identifiers:
+                try:
+                    plugins.get_plugin(identifier.lower())
+                except Exception:
+                    #? Errors are reported for the entries that use the plugin
+                    pass
+    schema_validation.get_validator()
+
+def translate_entry(entry):
+    """Translates the given entry and returns its report, errors are reported instead of raised"""
+    report = {'input': entry['input'], 'output': entry['output'], 'frontend': entry['frontend'], 'backend': entry['backend'],
+              'conversions': entry.get('conversions'), 'pid': os.getpid()}
+    start_time = time.perf_counter()
+    try:
+        report['timings'] = translate(entry['frontend'], entry['backend'], entry['input'], entry['output'], entry.get('conversions'),
+                                      entry.get('executable'), entry.get('weights'), entry.get('options'), entry.get('validate', 'structural'), False, entry.get('cache'),
+                                      entry.get('optimize', True))
+        report['status'] = 'success'
+    except Exception as err:
+        report['status'] = 'failed'
+        report['error'] = get_error_message(err, entry['frontend'])
+    report['seconds'] = time.perf_counter() - start_time
+    return report
+
+def translate_batch(entries, jobs=None):
+    """Translates the given entries with a pool of the given number of worker processes and returns the list of reports in the order of the entries.
+       A failing entry does not abort the other translations. With a single job, the entries are translated in the current process"""
+    if (jobs == 1):
+        init_batch_worker(entries)
+        return [translate_entry(entry) for entry in entries]
+
+    reports = []
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs, initializer=init_batch_worker, initargs=(entries,)) as executor:
+        futures = [executor.submit(translate_entry, entry) for entry in entries]
+        for entry, future in zip(entries, futures):
+            try:
+                reports.append(future.result())
+            except Exception as err:
+                #? The worker process of the entry terminated unexpectedly
+                reports.append({'input': entry['input'], 'output': entry['output'], 'frontend': entry['frontend'], 'backend': entry['backend'],
+                                'conversions': entry.get('conversions'), 'status': 'failed', 'error': get_error_message(err, entry['frontend'])})
+    return reports
+
+def print_batch_summary(reports, seconds):
+    """Prints the status and time of each report and the number of successful translations"""
+    for report in reports:
+        line = '{:<8} {:8.3f} s  {}'.format(report['status'], report.get('seconds', 0.0), report['input'])
+        if (report['status'] != 'success'):
+            line = line + ': ' + report['error']
+        print(line)
+    succeeded = len([report for report in reports if report['status'] == 'success'])
+    print(str(succeeded) + ' of ' + str(len(reports)) + ' models translated successfully in ' + '{:.3f}'.format(seconds) + ' s')
+
+def main():
+    """Parses the command line arguments and translates a single model or a batch of models"""
+    parser = argparse.ArgumentParser(description='Translates high-level neural network model to native code for specified backend')
+    parser.add_argument('-f', '--frontend', type=str, help='Frontend type of the input file, available at the moment: '+ get_available_plugins(frontend_plugins.plugins))
+    parser.add_argument('-b', '--backend', type=str, help='Backend type to translate into, available at the moment: '+ get_available_plugins(backend_plugins.plugins))
+    parser.add_argument('-c', '--conversions', nargs='+', help='Conversions to be performed on data, available at the moment: '+ get_available_plugins(conversion_plugins.plugins))
+    parser.add_argument('-i', '--input', type=str, help='Input file containing the neural network model')
+    parser.add_argument('-o', '--output', type=str, help='Output file to write to')
+    parser.add_argument('-e', '--executable', type=str, help='Path to an executable file which contains the prediction call, when set the given file will be copied into the output directory')
+    parser.add_argument('-w', '--weights', type=str, help='Path to a raw sidecar file, when set the weights are moved to this file and memory-mapped from it')
+    parser.add_argument('--validate', type=str, default='structural', choices=schema_validation.VALIDATION_MODES, help='Validation of the intermediate format: full validates every weight value, structural (default) validates the weights only by their shape and dtype, off skips the validation')
+    parser.add_argument('-O', '--options', nargs='+', help='Plugin specific options as key=value pairs, e.g. codegen=specialized for the gcc backend or quantization_scheme=affine for the int8 weight storage of the float2int conversion')
+    parser.add_argument('--no-optimize', action='store_true', help='Translates the layers as given by the frontend, without removing dropout layers and folding batch normalization and activation layers into the preceding weighted layers')
+    parser.add_argument('--no-cache', action='store_true', help='Translates every model in full instead of using the translation cache')
+    parser.add_argument('--cache-dir', type=str, default=translation_cache.DEFAULT_CACHE_DIRECTORY, help='Directory of the translation cache, defaults to ' + translation_cache.DEFAULT_CACHE_DIRECTORY)
+    parser.add_argument('--cache-size', type=int, default=translation_cache.DEFAULT_CACHE_SIZE // (1024 * 1024), help='Size limit of the translation cache in megabytes, the least recently used translations are evicted when it is exceeded')
+    parser.add_argument('-m', '--manifest', type=str, help='Batch mode: json file with a list of models to translate, each an object with the keys input, output, frontend, backend, conversions, executable, weights and options. Keys which are not set are taken from the command line arguments')
+    parser.add_argument('-g', '--glob', type=str, help='Batch mode: glob pattern of the input files to translate with the frontend, backend and conversions of the command line arguments, the output names are the input file names without extension')
+    parser.add_argument('-j', '--jobs', type=int, help='Number of worker processes in batch mode, defaults to the number of CPUs')
+    parser.add_argument('-r', '--report', type=str, default='batch_report.json', help='File the per-model status and timing report of the batch mode is written to')
+    args = parser.parse_args()
+
+    if (args.manifest is None and args.glob is None):
+        for name in ['frontend', 'backend', 'input', 'output']:
+            if (getattr(args, name) is None):
+                parser.error('the argument --' + name + ' is required')
+    elif (args.glob is not None and (args.frontend is None or args.backend is None)):
+        parser.error('the arguments --frontend and --backend are required with --glob')
+    elif (args.glob is not None and args.weights is not None):
+        parser.error('the argument --weights can not be used with --glob, set the weights of each model in a manifest instead')
+
+    try:
+        options = get_plugin_options(args.options)
+    except ValueError as err:
+        parser.error(str(err))
+
+    cache = None
+    if (not args.no_cache):
+        cache = translation_cache.TranslationCache(args.cache_dir, args.cache_size * 1024 * 1024)
+
+    #? Batch mode translating many models with a pool of worker processes
+    if (args.manifest is not None or args.glob is not None):
+        defaults = {'frontend': args.frontend, 'backend': args.backend, 'conversions': args.conversions, 'executable': args.executable,
+                    'weights': args.weights, 'options': options, 'validate': args.validate, 'optimize': not args.no_optimize, 'cache': cache}
+        if (args.manifest is not None):
+            entries = get_manifest_entries(args.manifest, defaults)
+        else:
+            entries = get_glob_entries(args.glob, defaults)
+
+        start_time = time.perf_counter()
+        reports = translate_batch(entries, args.jobs)
+        seconds = time.perf_counter() - start_time
+        print_batch_summary(reports, seconds)
+        with open(args.report, 'w') as file:
+            json.dump({'seconds': seconds, 'models': reports}, file, indent=4)
+        print('Report written to "' + args.report + '"')
+        return all(report['status'] == 'success' for report in reports)
+
+    try:
+        translate(args.frontend, args.backend, args.input, args.output, args.conversions, args.executable, args.weights, options, args.validate, cache=cache, optimize=not args.no_optimize)
+        print('Translation of input-file "' + args.input + '" to output-file "' + args.output + '" successfully completed')
+        return True
+
+    #? Error Handling
+    except IOError as ioerr:
+        print('Error occurred while opening the file: ')
+        print(traceback.format_exception_only(type(ioerr), ioerr))
+    except (ValidationError, NotImplementedError) as err:
+        print(get_error_message(err, args.frontend))
+    except Exception as err:
+        print('An error occurred: ')
+        print(traceback.format_exception_only(type(err), err))
+    return False
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
@@ -1,3 +1,5 @@
+import ast
+import importlib
 import inspect
 import os
 import pkgutil
@@ -26,68 +28,159 @@ class BackendPlugin(Plugin):
         super().__init__(identifier, description)
         self.prerequisites = prerequisites
 
-    def translate_to_native_code(self, input):
-        """Translates given input in intermediate format to native code"""
+    def translate_to_native_code(self, input, outputfile, executable_file, options=None):
+        """Translates given input in intermediate format to native code, options contains plugin specific settings.
+           May return a dict summarizing the generated code by label, which is printed by the translator"""
         raise NotImplementedError
 
+    def get_output_directory(self, outputfile):
+        """Returns the directory the files generated for the given outputfile are written to"""
+        return '_out/' + os.path.splitext(outputfile)[0]
+
 class ConversionPlugin(Plugin):
     """Base class that each conversion plugin must inherit from"""
     def __init__(self, identifier, description):
         super().__init__(identifier, description)
 
-    def process(self, input):
-        """Processes the given input and performs a specific conversion, returns processed output"""
+    def process(self, input, options=None):
+        """Processes the given input and performs a specific conversion, returns processed output. Options contains plugin specific settings"""
         raise NotImplementedError
 
+class PluginInfo(object):
+    """Lightweight metadata of a plugin, the module of the plugin is only imported when the plugin is requested"""
+
+    #? Names of the base classes plugins inherit from and the arguments of their constructors
+    base_classes = {'FrontendPlugin': ['identifier', 'description'],
+                    'BackendPlugin': ['identifier', 'description', 'prerequisites'],
+                    'ConversionPlugin': ['identifier', 'description']}
+
+    def __init__(self, identifier, description, prerequisites, module_name, class_name, module_path=None):
+        self.identifier = identifier
+        self.description = description
+        self.prerequisites = prerequisites
+        self.module_name = module_name
+        self.class_name = class_name
+        self.module_path = module_path
+
+    @classmethod
+    def read_from_source(cls, source, module_name, module_path=None):
+        """Returns a list of PluginInfo objects for the plugin classes defined in the given module source.
+           The metadata is read from the literal arguments of the super().__init__ call in the constructor of each plugin class.
+           Returns None if the metadata of a plugin class can not be read without executing the module"""
+        infos = []
+        for node in ast.parse(source).body:
+            if (not isinstance(node, ast.ClassDef)):
+                continue
+            base_names = [base.id if isinstance(base, ast.Name) else getattr(base, 'attr', None) for base in node.bases]
+            plugin_bases = [name for name in base_names if name in cls.base_classes]
+            if (not plugin_bases):
+                continue
+
+            arguments = cls.read_super_init_arguments(node)
+            if (arguments is None):
+                return None
+            values = dict(zip(cls.base_classes[plugin_bases[0]], arguments))
+            if ('identifier' not in values or 'description' not in values):
+                return None
+            infos.append(cls(values['identifier'], values['description'], values.get('prerequisites'), module_name, node.name, module_path))
+        return infos
+
+    @staticmethod
+    def read_super_init_arguments(class_node):
+        """Returns the literal argument values of the super().__init__ call in the constructor of the given class node,
+           or None if there is no such call or an argument is not a literal"""
+        for function in class_node.body:
+            if (not isinstance(function, ast.FunctionDef) or function.name != '__init__'):
+                continue
+            for node in ast.walk(function):
+                if (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and node.func.attr == '__init__'
+                        and isinstance(node.func.value, ast.Call) and isinstance(node.func.value.func, ast.Name) and node.func.value.func.id == 'super'):
+                    try:
+                        return [ast.literal_eval(argument) for argument in node.args]
+                    except ValueError:
+                        return None
+        return None
+
 class PluginCollection(object):
-    """Manages a list of plugins available in a given directory"""
+    """Manages a list of plugins available in a given directory.
+       The plugins are discovered from the source of their modules, a plugin module is only imported when the plugin is requested"""
 
     def __init__(self, plugin_package):
         self.plugin_package = plugin_package
         self.reload_plugins()
 
     def reload_plugins(self):
-        """Loads all available plugins"""
+        """Discovers all available plugins"""
         self.plugins = []
         self.seen_paths = []
+        self.instances = dict()
         self.search_for_plugins(self.plugin_package)
 
-
-    def get_plugin(self, plugin_identifier):
-        """Searches for a plugin with a given identifier in the managed plugin list"""
+    def get_plugin_info(self, plugin_identifier):
+        """Searches for a plugin with a given identifier in the managed plugin list and returns its metadata without importing it"""
         for plugin in self.plugins:
             if (plugin.identifier == plugin_identifier):
                 return plugin
         raise NotImplementedError
 
+    def get_plugin(self, plugin_identifier):
+        """Searches for a plugin with a given identifier in the managed plugin list, imports its module and returns an instance of the plugin"""
+        plugin = self.get_plugin_info(plugin_identifier)
+        if (plugin_identifier not in self.instances):
+            plugin_module = importlib.import_module(plugin.module_name)
+            self.instances[plugin_identifier] = getattr(plugin_module, plugin.class_name)()
+        return self.instances[plugin_identifier]
+
+    def get_plugin_source_paths(self, plugin_identifier):
+        """Returns the paths of the source of the plugin with the given identifier. Plugins located in a sub package
+           (e.g. backend.gcc) consist of the whole directory of the sub package including its templates, other plugins of their module file"""
+        plugin = self.get_plugin_info(plugin_identifier)
+        if (plugin.module_path is None):
+            return []
+        if (plugin.module_name.count('.') > self.plugin_package.count('.') + 1):
+            return [os.path.dirname(plugin.module_path)]
+        return [plugin.module_path]
+
     def search_for_plugins(self, package):
         """Searches the given directory and all sub directories for available plugins"""
-
-        imported_package = __import__(package, fromlist=[''])
-
-        #? Recursivly searching for classes inheriting from the specified
-        for _, pluginname, ispkg in pkgutil.iter_modules(imported_package.__path__, imported_package.__name__ + '.'):
-            if not ispkg:
-                plugin_module = __import__(pluginname, fromlist=[''])
-                clsmembers = inspect.getmembers(plugin_module, inspect.isclass)
-                for (_, c) in clsmembers:
-                    #? Only add classes that are a sub class of Frontend-, Backend- or ConversionPlugin, but not the class itself
-                    if issubclass(c, Plugin) & (c is not Plugin and c is not FrontendPlugin and c is not BackendPlugin and c is not ConversionPlugin):
-                        self.plugins.append(c())
-
-        all_current_paths = []
-        if isinstance(imported_package.__path__, str):
-            all_current_paths.append(imported_package.__path__)
-        else:
-            all_current_paths.extend([x for x in imported_package.__path__])
-
-        for pkg_path in all_current_paths:
+        package_paths = [os.path.join(*package.split('.'))]
+        spec = importlib.util.find_spec(package)
+        if (spec is not None and spec.submodule_search_locations is not None):
+            package_paths = list(spec.submodule_search_locations)
+
+        #? Reading the plugin metadata from the source of each module instead of importing it
+        for module_info in pkgutil.iter_modules(package_paths, package + '.'):
+            if not module_info.ispkg:
+                module_path = os.path.join(module_info.module_finder.path, module_info.name.split('.')[-1] + '.py')
+                self.add_plugins_of_module(module_info.name, module_path)
+
+        for pkg_path in package_paths:
             if pkg_path not in self.seen_paths:
                 self.seen_paths.append(pkg_path)
 
                 #? Get all subdirectory of the current package path directory
-                child_pkgs = [p for p in os.listdir(pkg_path) if os.path.isdir(os.path.join(pkg_path, p))]
+                child_pkgs = [p for p in os.listdir(pkg_path) if os.path.isdir(os.path.join(pkg_path, p)) and not p.startswith('__')]
 
-                #? For each subdirectory, apply the searcg_for_plugins method recursively
+                #? For each subdirectory, apply the search_for_plugins method recursively
                 for child_pkg in child_pkgs:
-                    self.search_for_plugins(package + '.' + child_pkg)
\ No newline at end of file
+                    self.search_for_plugins(package + '.' + child_pkg)
+
+    def add_plugins_of_module(self, module_name, module_path):
+        """Adds the plugins of the given module to the plugin list. If the metadata of the plugins can not be read
+           from the source of the module, the module is imported and its plugins are instantiated"""
+        infos = None
+        if (os.path.isfile(module_path)):
+            with open(module_path, 'r') as file:
+                infos = PluginInfo.read_from_source(file.read(), module_name, module_path)
+
+        if (infos is None):
+            plugin_module = importlib.import_module(module_name)
+            infos = []
+            for (class_name, c) in inspect.getmembers(plugin_module, inspect.isclass):
+                #? Only add classes that are a sub class of Frontend-, Backend- or ConversionPlugin, but not the class itself
+                if issubclass(c, Plugin) & (c is not Plugin and c is not FrontendPlugin and c is not BackendPlugin and c is not ConversionPlugin):
+                    instance = c()
+                    self.instances[instance.identifier] = instance
+                    infos.append(PluginInfo(instance.identifier, instance.description, getattr(instance, 'prerequisites', None), module_name, class_name, module_path))
+
+        self.plugins.extend(infos)
@@ -0,0 +1,204 @@
+import numpy as np
+import layer_utils
+import weight_storage
+
+#? Layer classes which do not transform their input, the values are already stored as flattened arrays
+IDENTITY_LAYERS = [layer_utils.FLATTEN_LAYER, 'Dropout']
+POOLING_LAYERS = [layer_utils.MAX_POOL_1D_LAYER, layer_utils.MAX_POOL_2D_LAYER, layer_utils.AVG_POOL_1D_LAYER, layer_utils.AVG_POOL_2D_LAYER]
+#? Maximum value of the symmetrically quantized input of int8 dense layers
+INT8_MAX = 127
+
+def round_half_away_from_zero(values):
+    """Returns the given values rounded like roundf in C, numpy rounds halves to the nearest even value"""
+    return np.sign(values) * np.floor(np.abs(values) + np.float32(0.5))
+
+def activation_apply(values, activation):
+    """Returns the given float32 values with the given activation function applied. The values have the shape
+       (samples, groups, elements), the softmax function is calculated over the elements of each group"""
+    if (activation == 'sigmoid'):
+        #? exp overflows to infinity for large negative values, which results in 0 like in the C code
+        with np.errstate(over='ignore'):
+            return np.float32(1) / (np.float32(1) + np.exp(-values))
+    if (activation == 'relu'):
+        return np.maximum(values, np.float32(0))
+    if (activation == 'tanh'):
+        return np.tanh(values)
+    if (activation == 'softmax'):
+        #? Subtracting the maximum does not change the result but avoids overflows of exp
+        exponentials = np.exp(values - np.max(values, axis=-1, keepdims=True))
+        return exponentials / np.sum(exponentials, axis=-1, keepdims=True)
+    if (activation == 'linear'):
+        return values
+    raise ValueError('Unknown activation function "' + activation + '"')
+
+def get_windows(matrices, window_height, window_width, vertical_stride, horizontal_stride, vertical_dilation=1, horizontal_dilation=1):
+    """Returns a read-only view of the windows of the given matrices with the shape (samples, depth, rows, columns), the view has the shape
+       (samples, depth, window rows, window columns, window height, window width). The windows are built with as_strided,
+       sliding_window_view requires numpy 1.20 while tensorflow 2.6 pins numpy 1.19"""
+    samples, depth, rows, columns = matrices.shape
+    window_rows = (rows - (window_height - 1) * vertical_dilation - 1) // vertical_stride + 1
+    window_columns = (columns - (window_width - 1) * horizontal_dilation - 1) // horizontal_stride + 1
+    sample_stride, depth_stride, row_stride, column_stride = matrices.strides
+    return np.lib.stride_tricks.as_strided(matrices, shape=(samples, depth, window_rows, window_columns, window_height, window_width),
+                                           strides=(sample_stride, depth_stride, row_stride * vertical_stride, column_stride * horizontal_stride,
+                                                    row_stride * vertical_dilation, column_stride * horizontal_dilation), writeable=False)
+
+class ReferenceExecutor(object):
+    """Executes a model in intermediate format for a batch of samples with NumPy, in the same way as the C code of the GCC backend.
+       The samples are flattened in the layout of the C code, element (row, column, depth) is located at depth * rows * columns + row * columns + column"""
+
+    def __init__(self, input):
+        self.layers = input['config']['layers']
+        self.heights, self.widths, self.depths = layer_utils.get_output_dimensions(input)
+        self.pool_heights, self.pool_widths = layer_utils.get_pool_sizes(input)
+        self.vertical_strides, self.horizontal_strides = layer_utils.get_strides(input)
+        self.paddings = layer_utils.get_paddings(input, {'valid': 0, 'same': 1})
+        self.vertical_dilations, self.horizontal_dilations = layer_utils.get_dilations(input)
+        self.padding_tops, self.padding_lefts = layer_utils.get_convolution_paddings(input, self.heights, self.widths)
+        self.quantized = layer_utils.is_quantized(input)
+        self.kernel_scales, self.kernel_zero_points = layer_utils.get_quantization_information(input)
+        self.bias_start_indices = layer_utils.get_bias_start_indices(input)
+
+        #? The weights are converted once to matrices in the layout of the C code, int8 weights keep their values and are accumulated as integers, biases are float values
+        self.kernels = []
+        self.biases = []
+        for index, layer in enumerate(self.layers):
+            kernel = None
+            biases = None
+            if (layer['class_name'] in layer_utils.WEIGHTED_LAYERS):
+                kernel = layer_utils.get_kernel_matrix(input, index, self.heights, self.widths, self.depths)
+                kernel = kernel.astype(np.int64) if self.quantized else kernel.astype(np.float32)
+                if (layer['config']['use_bias']):
+                    biases = weight_storage.get_array(layer['bias_values'])
+                    biases = biases.astype(np.float32)
+            self.kernels.append(kernel)
+            self.biases.append(biases)
+
+    def get_input_size(self):
+        """Returns the number of input values of a sample"""
+        return self.heights[0] * self.widths[0] * self.depths[0]
+
+    def get_output_size(self):
+        """Returns the number of output values of a sample"""
+        return self.heights[-1] * self.widths[-1] * self.depths[-1]
+
+    def predict(self, inputs):
+        """Returns the float32 outputs of the given inputs with the shape (samples, output size). The inputs have the shape
+           (samples, input size), a single sample may also be given with the shape (input size,)"""
+        values = np.asarray(inputs, dtype=np.float32)
+        if (values.ndim == 1):
+            values = values.reshape(1, -1)
+        if (values.ndim != 2 or values.shape[1] != self.get_input_size()):
+            raise ValueError('Expected inputs with ' + str(self.get_input_size()) + ' values per sample, got inputs with shape ' + str(np.shape(inputs)))
+
+        for index, layer in enumerate(self.layers):
+            values = self.layer_apply(index, layer, values)
+        return values
+
+    def layer_apply(self, index, layer, values):
+        """Returns the outputs of the layer with the given index for the given flattened inputs of all samples"""
+        class_name = layer['class_name']
+        if (class_name == layer_utils.DENSE_LAYER):
+            if (self.quantized):
+                return self.dense_int8_apply(index, layer, values)
+            return self.dense_apply(index, layer, values)
+        if (class_name in layer_utils.CONV_LAYERS):
+            return self.convolution_apply(index, layer, values)
+        if (class_name in POOLING_LAYERS):
+            return self.pooling_apply(index, layer, values)
+        if (class_name == layer_utils.ACTIVATION_LAYER):
+            groups = values.reshape(values.shape[0], self.depths[index], -1)
+            return activation_apply(groups, layer['config']['activation'].lower()).reshape(values.shape[0], -1)
+        if (class_name in IDENTITY_LAYERS):
+            return values
+        raise ValueError('Layer type "' + class_name + '" is not supported by the reference executor')
+
+    def dense_apply(self, index, layer, values):
+        """Returns the outputs of a dense layer with float weights"""
+        result = values @ self.kernels[index]
+        if (self.biases[index] is not None):
+            result = result + self.biases[index]
+        return activation_apply(result[:, np.newaxis, :], layer['config']['activation'].lower())[:, 0, :]
+
+    def dense_int8_apply(self, index, layer, values):
+        """Returns the outputs of a dense layer with int8 weights like dense_int8_apply: the float input of each sample is quantized dynamically and symmetrically,
+           only the dot products use integer values and the accumulators are scaled back to float values"""
+        first_unit = self.bias_start_indices[index]
+        units = slice(first_unit, first_unit + self.kernels[index].shape[1])
+
+        input_scales = np.max(np.abs(values), axis=1, keepdims=True) / np.float32(INT8_MAX)
+        input_scales = np.where(input_scales > 0, input_scales, np.float32(1)).astype(np.float32)
+        quantized_inputs = round_half_away_from_zero(values / input_scales).astype(np.int64)
+
+        accumulators = quantized_inputs @ self.kernels[index]
+        accumulators = accumulators - np.asarray(self.kernel_zero_points[units], dtype=np.int64) * np.sum(quantized_inputs, axis=1, keepdims=True)
+        result = accumulators.astype(np.float32) * input_scales * np.asarray(self.kernel_scales[units], dtype=np.float32)
+        if (self.biases[index] is not None):
+            result = result + self.biases[index]
+        return activation_apply(result[:, np.newaxis, :], layer['config']['activation'].lower())[:, 0, :]
+
+    def convolution_apply(self, index, layer, values):
+        """Returns the outputs of a convolution layer, the input is padded with zeros like the taps outside of the input in convolution_direct_apply"""
+        samples = values.shape[0]
+        matrices = values.reshape(samples, self.depths[index], self.heights[index], self.widths[index])
+        kernel_height = self.pool_heights[index]
+        kernel_width = self.pool_widths[index]
+        vertical_dilation = self.vertical_dilations[index]
+        horizontal_dilation = self.horizontal_dilations[index]
+        output_rows = self.heights[index + 1]
+        output_columns = self.widths[index + 1]
+
+        #? The padding after the input covers all taps of the last output position, surplus rows and columns are not read
+        extent_height = (kernel_height - 1) * vertical_dilation + 1
+        extent_width = (kernel_width - 1) * horizontal_dilation + 1
+        padding_bottom = max((output_rows - 1) * self.vertical_strides[index] + extent_height - self.heights[index] - self.padding_tops[index], 0)
+        padding_right = max((output_columns - 1) * self.horizontal_strides[index] + extent_width - self.widths[index] - self.padding_lefts[index], 0)
+        matrices = np.pad(matrices, ((0, 0), (0, 0), (self.padding_tops[index], padding_bottom), (self.padding_lefts[index], padding_right)))
+
+        windows = get_windows(matrices, kernel_height, kernel_width, self.vertical_strides[index], self.horizontal_strides[index], vertical_dilation, horizontal_dilation)
+        windows = windows[:, :, :output_rows, :output_columns]
+
+        #? The rows of the kernel matrix are ordered by channel, kernel row and kernel column
+        kernel = self.kernels[index].reshape(self.depths[index], kernel_height, kernel_width, -1)
+        result = np.einsum('sdrcij,dijf->sfrc', windows, kernel, dtype=np.float32)
+        if (self.biases[index] is not None):
+            result = result + self.biases[index][np.newaxis, :, np.newaxis, np.newaxis]
+        result = activation_apply(result.reshape(samples, 1, -1), layer['config']['activation'].lower())
+        return result.reshape(samples, -1)
+
+    def pooling_apply(self, index, layer, values):
+        """Returns the outputs of a pooling layer, windows of inputs with padding_same are clamped to the input like in pooling_window_clamp.
+           Max pooling only considers the values inside the input and average pooling divides by their number"""
+        samples = values.shape[0]
+        matrices = values.reshape(samples, self.depths[index], self.heights[index], self.widths[index])
+        pool_height = self.pool_heights[index]
+        pool_width = self.pool_widths[index]
+        is_max = 'Max' in layer['class_name']
+        counts = np.ones((1, 1, self.heights[index], self.widths[index]), dtype=np.float32)
+
+        if (self.paddings[index] == 1):
+            #? Padding thickness as in padding_calculate_size, split like in Keras with the larger half after the input.
+            #? Padded values are never selected by max pooling and are not counted by average pooling
+            _, padding_top = layer_utils.get_convolution_output_size(self.heights[index], pool_height, self.vertical_strides[index], 1, 'same')
+            _, padding_left = layer_utils.get_convolution_output_size(self.widths[index], pool_width, self.horizontal_strides[index], 1, 'same')
+            padding_bottom = max((self.heights[index + 1] - 1) * self.vertical_strides[index] + pool_height - self.heights[index] - padding_top, 0)
+            padding_right = max((self.widths[index + 1] - 1) * self.horizontal_strides[index] + pool_width - self.widths[index] - padding_left, 0)
+            padding = ((0, 0), (0, 0), (padding_top, padding_bottom), (padding_left, padding_right))
+            matrices = np.pad(matrices, padding, constant_values=-np.inf if is_max else 0)
+            counts = np.pad(counts, padding)
+
+        windows = get_windows(matrices, pool_height, pool_width, self.vertical_strides[index], self.horizontal_strides[index])
+        if (is_max):
+            result = np.max(windows, axis=(4, 5))
+        else:
+            count_windows = get_windows(counts, pool_height, pool_width, self.vertical_strides[index], self.horizontal_strides[index])
+            result = np.sum(windows, axis=(4, 5), dtype=np.float32) / np.sum(count_windows, axis=(4, 5), dtype=np.float32)
+
+        output_size = self.heights[index + 1] * self.widths[index + 1] * self.depths[index + 1]
+        if (result[0].size != output_size):
+            raise ValueError('Pooling layer ' + str(index) + ' computes ' + str(result[0].size) + ' values per sample, but its output size is ' + str(output_size))
+        return result.reshape(samples, -1)
+
+def predict(input, inputs):
+    """Returns the outputs of the given model in intermediate format for the given inputs, see ReferenceExecutor.predict"""
+    return ReferenceExecutor(input).predict(inputs)
@@ -39,10 +39,12 @@ void loop()
       tmp = strtok(NULL, ",");
     }
 
-    /* Call the predict function with the input array. */
+    /* Call the predict function with the input array.
+    The result is located in the statically allocated memory of the model and must not be freed. */
     uint32_t startTime = micros();
     float * result = predict(input);
     uint32_t endTime = micros();
+    free(input);
 
     for(int i = 0; i < LAYER_OUTPUT_HEIGHT[NUMBER_OF_LAYERS-1]; i++)
     {
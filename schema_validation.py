@@ -0,0 +1,98 @@
+import json
+import os
+import numpy as np
+from jsonschema import ValidationError
+from jsonschema.validators import validator_for
+import weight_storage
+
+#? The schema of the intermediate format is located next to this module, independent of the working directory
+SCHEMA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'intermediate.schema.json')
+
+#? Available validation modes: full validates every weight value with the schema, structural validates the weights
+#? only by their shape and dtype and off skips the validation
+VALIDATION_MODES = ['full', 'structural', 'off']
+
+#? Compiled validators by schema file name, together with the modification time of the file when it was compiled
+validator_cache = dict()
+
+def get_validator(filename=SCHEMA_FILE):
+    """Returns the compiled validator of the given schema file, the schema is loaded and checked again only if the file was modified"""
+    modification_time = os.path.getmtime(filename)
+    cached = validator_cache.get(filename)
+    if (cached is None or cached[0] != modification_time):
+        with open(filename, 'r') as file:
+            schema = json.load(file)
+        validator_class = validator_for(schema)
+        validator_class.check_schema(schema)
+        cached = (modification_time, validator_class(schema))
+        validator_cache[filename] = cached
+    return cached[1]
+
+def get_weight_dtypes(validator):
+    """Returns the list of dtypes the schema of the given validator allows for weight values"""
+    return validator.schema['definitions']['weight_reference']['properties']['dtype']['enum']
+
+def get_weight_arrays(layer, layer_index):
+    """Returns a dict with the weight values of the given layer as numpy arrays. References to sidecar files are left out,
+       they are validated by the schema. Raises a ValidationError if the values can not be converted to a numeric array"""
+    arrays = dict()
+    for key in weight_storage.WEIGHT_KEYS:
+        if (key not in layer or weight_storage.is_reference(layer[key])):
+            continue
+        try:
+            arrays[key] = np.asarray(layer[key])
+        except ValueError:
+            raise ValidationError('The ' + key + ' of layer ' + str(layer_index) + ' are not a rectangular array')
+    return arrays
+
+def check_weights(input, weight_dtypes):
+    """Checks the shape and the dtype of the weight values of each layer, without iterating over the single values.
+       Raises a ValidationError if a dtype is not in the given list of dtypes or the biases do not match the kernel"""
+    for layer_index, layer in enumerate(input['config']['layers']):
+        arrays = get_weight_arrays(layer, layer_index)
+        for key, array in arrays.items():
+            if (array.dtype.name not in weight_dtypes):
+                raise ValidationError('The ' + key + ' of layer ' + str(layer_index) + ' have the unsupported dtype ' + array.dtype.name)
+            if (array.ndim == 0):
+                raise ValidationError('The ' + key + ' of layer ' + str(layer_index) + ' are not an array')
+
+        #? There is one bias value for each unit, units are the last dimension of the kernel
+        if ('kernel_values' in arrays and 'bias_values' in arrays):
+            kernel_shape = arrays['kernel_values'].shape
+            bias_shape = arrays['bias_values'].shape
+            if (len(bias_shape) != 1 or bias_shape[0] != kernel_shape[-1]):
+                raise ValidationError('The bias_values of layer ' + str(layer_index) + ' with shape ' + str(bias_shape)
+                                      + ' do not match the kernel_values with shape ' + str(kernel_shape))
+
+def get_structural_view(input):
+    """Returns a copy of the given input in which all weight values are replaced by a description of their shape and dtype"""
+    output = weight_storage.copy_layers(input)
+    for layer_index, layer in enumerate(output['config']['layers']):
+        for key, array in get_weight_arrays(layer, layer_index).items():
+            layer[key] = {'shape': list(array.shape), 'dtype': array.dtype.name}
+    return output
+
+def get_full_view(input):
+    """Returns a copy of the given input in which weight values held as numpy arrays are converted to lists,
+       so that every single value is validated with the schema"""
+    output = weight_storage.copy_layers(input)
+    for layer in output['config']['layers']:
+        for key in weight_storage.WEIGHT_KEYS:
+            if (key in layer and isinstance(layer[key], np.ndarray)):
+                layer[key] = layer[key].tolist()
+    return output
+
+def validate_intermediate(input, mode='structural', filename=SCHEMA_FILE):
+    """Validates the given input in intermediate format with the given schema file in the given validation mode.
+       Raises a ValidationError if the input does not match the schema and a ValueError for unknown validation modes"""
+    if (mode not in VALIDATION_MODES):
+        raise ValueError('Unknown validation mode "' + str(mode) + '", available modes: ' + ', '.join(VALIDATION_MODES))
+    if (mode == 'off'):
+        return
+
+    validator = get_validator(filename)
+    check_weights(input, get_weight_dtypes(validator))
+    if (mode == 'full'):
+        validator.validate(get_full_view(input))
+    else:
+        validator.validate(get_structural_view(input))
@@ -1,6 +1,9 @@
 import unittest
 import sys
+import os
 import json
+import tempfile
+import numpy as np
 import backend.gcc.backend_utils as backend_utils
 from backend.gcc.gcc import GCC
 
@@ -13,6 +16,7 @@ class TestBackendUtils(unittest.TestCase):
     dense_3layer_input = None
     mnist_flatten_input = None
     mnist_pool_input = None
+    conv_input = None
 
     def __init__(self, testname):
         super(TestBackendUtils, self).__init__(testname)
@@ -23,42 +27,13 @@ class TestBackendUtils(unittest.TestCase):
         self.dense_3layer_input = json.load(open('test/test_dense_3layer_input.json'))
         self.mnist_flatten_input = json.load(open('test/test_mnist_flatten_input.json'))
         self.mnist_pool_input = json.load(open('test/test_mnist_pool_input.json'))
+        self.conv_input = json.load(open('test/test_conv_input.json'))
         return super().setUp()
 
     def tearDown(self):
         """Clean up after test cases"""
         return super().tearDown()
 
-    def test_replaceMarkers_stringWithSingleMarker_correctReplacedMarker(self):
-        """Test case for replace_markers function"""
-        string = 'abc ###marker### def'
-        markers = {'###marker###':'hij'}
-        self.assertTrue(backend_utils.replace_markers(string, markers) == 'abc hij def')
-
-    def test_replaceMarkers_stringWithMultipleSameMarkers_correctReplacedMarkers(self):
-        """Test case for replace_markers function with multiple replacments"""
-        string = 'abc ###marker### def ###marker###'
-        markers = {'###marker###':'hij'}
-        self.assertTrue(backend_utils.replace_markers(string, markers) == 'abc hij def hij')
-
-    def test_replaceMarkers_stringWithMultipleDifferentMarkers_correctReplacedMarkers(self):
-        """Test case for replace_markers function with 2 markers"""
-        string = 'abc ###marker### def ###marker2###'
-        markers = {'###marker###':'hij', '###marker2###':'klm'}
-        self.assertTrue(backend_utils.replace_markers(string, markers) == 'abc hij def klm')
-
-    def test_replaceMarkers_stringWithMultipleSameMarkersInRow_correctReplacedMarkers(self):
-        """Test case for replace_markers function with neighbouring markers"""
-        string = 'abc def ###marker######marker2###'
-        markers = {'###marker###':'hij', '###marker2###':'klm'}
-        self.assertTrue(backend_utils.replace_markers(string, markers) == 'abc def hijklm')
-
-    def test_replaceMarkers_stringWithNotExistentMarker_noReplacementDone(self):
-        """Test case for replace_markers function not existent marker"""
-        string = 'abc ###marker### def'
-        markers = {'###nowhere###':'hij'}
-        self.assertTrue(backend_utils.replace_markers(string, markers) == 'abc ###marker### def')
-
     def test_convertArrayToString_onlyIntegerValues_correctStringRepresenationOfIntegerValues(self):
         """Test case for convert_array_to_string function"""
         self.assertTrue(backend_utils.convert_array_to_string([1,2,3,4]) == '{1,2,3,4}')
@@ -93,36 +68,24 @@ class TestBackendUtils(unittest.TestCase):
         self.dense_2layer_input['config']['layers'][1]['class_name'] = 'AveragePooling3D'
         self.assertTrue(backend_utils.get_layer_types_string(self.dense_2layer_input, GCC.layer_types) == '{2,4}')
 
-    def test_getOutputDimensions_2DenseLayerInput_correctHeightWidthDepthDimensions(self):
-        """Test case for get_output_dimensions function in 2 layer dense network"""
-        heights, widths, depths = backend_utils.get_output_dimensions(self.dense_2layer_input)
-        self.assertTrue(backend_utils.convert_array_to_string(heights) == '{8,8,1}'
-                    and backend_utils.convert_array_to_string(widths) == '{1,1,1}'
-                    and backend_utils.convert_array_to_string(depths) == '{1,1,1}')
-
-    def test_getOutputDimensions_3DenseLayerInput_correctHeightWidthDepthDimensions(self):
-        """Test case for get_output_dimensions function in 3 layer dense network"""
-        heights, widths, depths = backend_utils.get_output_dimensions(self.dense_3layer_input)
-        self.assertTrue(backend_utils.convert_array_to_string(heights) == '{8,16,8,1}'
-                    and backend_utils.convert_array_to_string(widths) == '{1,1,1,1}'
-                    and backend_utils.convert_array_to_string(depths) == '{1,1,1,1}')
-
-    def test_getOutputDimensions_FlattenDenseDropOutLayerInput_correctHeightWidthDepthDimensions(self):
-        """Test case for get_output_dimensions function with flatten, dense and dropout layers"""
-        heights, widths, depths = backend_utils.get_output_dimensions(self.mnist_flatten_input)
-        self.assertTrue(backend_utils.convert_array_to_string(heights) == '{28,784,128,128,10}'
-                    and backend_utils.convert_array_to_string(widths) =='{28,1,1,1,1}'
-                    and backend_utils.convert_array_to_string(depths) == '{1,1,1,1,1}')
-
-    def test_getOutputDimensions_poolingLayerInput_correctHeightWidthDepthDimensions(self):
-        heights, widths, depths = backend_utils.get_output_dimensions(self.mnist_pool_input)
-        self.assertTrue(backend_utils.convert_array_to_string(heights) == '{28,14,196,128,10}'
-                    and backend_utils.convert_array_to_string(widths) =='{28,14,1,1,1}'
-                    and backend_utils.convert_array_to_string(depths) == '{1,1,1,1,1}')
-
-    def test_getOutputDimensions_activationLayerInput_correctHeightWidthDepthDimensions(self):
-        # TODO implement for neural network with activation layer
-        self.assertTrue(True)
+    def test_getWeightChunks_convolutionInput_sameValuesInBothLayouts(self):
+        """Test case for get_weight_chunks function with convolution layers, the unit major layout is the transposed input major layout"""
+        heights, widths, depths = backend_utils.get_output_dimensions(self.conv_input)
+        input_major = np.concatenate(list(backend_utils.get_weight_chunks(self.conv_input, 'input_major', 1, 7)))
+        unit_major = np.concatenate(list(backend_utils.get_weight_chunks(self.conv_input, 'unit_major', 1, 7)))
+        start_indices = backend_utils.get_weight_start_indices(self.conv_input, heights, 1)
+        for index in [0, 2, 4]:
+            matrix = backend_utils.get_kernel_matrix(self.conv_input, index, heights, widths, depths)
+            self.assertTrue(np.array_equal(input_major[start_indices[index]:start_indices[index] + matrix.size], matrix.reshape(-1))
+                        and np.array_equal(unit_major[start_indices[index]:start_indices[index] + matrix.size], matrix.T.reshape(-1)))
+        self.assertTrue(input_major.size == backend_utils.get_number_of_weights(self.conv_input, heights) == 27*4 + 16*5 + 30*6)
+
+    def test_getBiasChunks_convolutionWithoutBias_zeros(self):
+        """Test case for get_bias_chunks function with a convolution layer without bias values"""
+        chunks = list(backend_utils.get_bias_chunks(self.conv_input))
+        self.assertTrue([chunk.size for chunk in chunks] == [4, 5, 6] and not chunks[1].any()
+                    and backend_utils.get_bias_start_indices(self.conv_input) == [0, 0, 4, 0, 9]
+                    and backend_utils.get_number_of_biases(self.conv_input) == 15)
 
     def test_getActivationFunctionString_differentActionfunctionReluSigmoidInput_correctActivationFunctionString(self):
         """Test case for get_activation_function_string function with relu and sigmoid function"""
@@ -135,6 +98,11 @@ class TestBackendUtils(unittest.TestCase):
         self.dense_3layer_input['config']['layers'][2]['config']['activation'] = 'softmax'
         self.assertTrue(backend_utils.get_activation_function_string(self.dense_3layer_input, GCC.activation_functions) == '{0,3,4}')
 
+    def test_getActivationFunctionString_activationLayerInput_correctActivationFunctionString(self):
+        """Test case for get_activation_function_string function with a separate activation layer"""
+        self.dense_3layer_input['config']['layers'][1] = {'class_name': 'Activation', 'config': {'name': 'activation', 'activation': 'softmax'}}
+        self.assertTrue(backend_utils.get_activation_function_string(self.dense_3layer_input, GCC.activation_functions) == '{2,4,1}')
+
     def test_getBiasInformation_3DenseLayerAllUsingBiasTrueInput_correctBiasValueStringBiasIndicesString(self):
         """Test case for get_bias_information function in 3 layer dense network"""
         use_bias_string, bias_indices_string, bias_array = backend_utils.get_bias_information(self.dense_3layer_input)
@@ -179,6 +147,84 @@ class TestBackendUtils(unittest.TestCase):
         self.assertTrue(weights_indices_string == '{0,0,0,25088}'
                     and len(weights_array) == 26368)
 
+    def test_getWeightInformation_unitMajorLayout_transposedWeights(self):
+        """Test case for get_weight_information function with the weights of each unit stored contiguously"""
+        heights, widths, depths = backend_utils.get_output_dimensions(self.dense_2layer_input)
+        kernel_values = self.dense_2layer_input['config']['layers'][0]['kernel_values']
+        weights_indices_string, weights_array = backend_utils.get_weight_information(self.dense_2layer_input, heights, 'unit_major')
+        self.assertTrue(weights_indices_string == '{0,64}'
+                    and len(weights_array) == 72
+                    and weights_array[1] == kernel_values[1][0]
+                    and weights_array[8] == kernel_values[0][1])
+
+    def test_getWeightInformation_unitMajorLayoutWithAlignment_paddedRows(self):
+        """Test case for get_weight_information function with rows of weights padded to a multiple of 16"""
+        heights, widths, depths = backend_utils.get_output_dimensions(self.dense_2layer_input)
+        weights_indices_string, weights_array = backend_utils.get_weight_information(self.dense_2layer_input, heights, 'unit_major', 16)
+        self.assertTrue(weights_indices_string == '{0,128}'
+                    and len(weights_array) == 144
+                    and list(weights_array[8:16]) == [0] * 8)
+
+    def test_getWeightAlignment_rowsMultipleOfSimdWidth_simdWidth(self):
+        """Test case for get_weight_alignment function without padding overhead"""
+        heights, widths, depths = backend_utils.get_output_dimensions(self.mnist_pool_input)
+        self.assertTrue(backend_utils.get_weight_alignment(self.mnist_pool_input, heights) == 4)
+
+    def test_getWeightAlignment_largePaddingOverhead_noAlignment(self):
+        """Test case for get_weight_alignment function where padding would add more than 12.5% of weights"""
+        self.assertTrue(backend_utils.get_weight_alignment(self.dense_2layer_input, [3, 8, 1]) == 1)
+
+    def test_getWeightChunks_smallChunkSize_sameValuesAsWeightInformation(self):
+        """Test case for get_weight_chunks function with chunks smaller than a layer"""
+        heights, widths, depths = backend_utils.get_output_dimensions(self.dense_3layer_input)
+        weights_indices_string, weights_array = backend_utils.get_weight_information(self.dense_3layer_input, heights, 'unit_major', 4)
+        chunks = list(backend_utils.get_weight_chunks(self.dense_3layer_input, 'unit_major', 4, 20))
+        self.assertTrue(max(chunk.size for chunk in chunks) <= 20
+                    and np.array_equal(np.concatenate(chunks), weights_array))
+
+    def test_getHalfPrecisionChunks_bothDtypes_bitsOfRoundedValues(self):
+        """Test case for get_half_precision_chunks function with float16 and bfloat16 values"""
+        chunk = np.array([1.0, -2.0, 1.0 + 2**-9, 65504.0], dtype=np.float32)
+        float16_bits = list(backend_utils.get_half_precision_chunks([chunk], 'float16'))[0]
+        bfloat16_bits = list(backend_utils.get_half_precision_chunks([chunk], 'bfloat16'))[0]
+        #? 1 + 2**-9 is rounded to 1.0 as bfloat16 value, 65504 is the largest finite IEEE half precision value and rounded up as bfloat16 value
+        self.assertTrue(float16_bits.dtype == np.uint16 and list(float16_bits) == [0x3c00, 0xc000, 0x3c02, 0x7bff]
+                        and list(bfloat16_bits) == [0x3f80, 0xc000, 0x3f80, 0x4780]
+                        and list(backend_utils.get_half_precision_chunks([chunk], None))[0] is chunk)
+
+    def test_getHalfPrecisionDtype_mixedDtypes_raisesValueError(self):
+        """Test case for get_half_precision_dtype function with layers converted to different dtypes"""
+        self.conv_input['config']['layers'][0]['half_precision'] = {'dtype': 'float16'}
+        with self.assertRaises(ValueError):
+            backend_utils.get_half_precision_dtype(self.conv_input)
+
+    def test_getSparseWeightChunks_sparseDenseAfterFlatten_compressedRowsOfKernelMatrix(self):
+        """Test case for get_sparse_weight_chunks function with a sparse dense layer which reads the output of a flatten layer"""
+        heights, widths, depths = backend_utils.get_output_dimensions(self.conv_input)
+        kernel = np.asarray(self.conv_input['config']['layers'][4]['kernel_values'])
+        kernel[np.abs(kernel) < np.median(np.abs(kernel))] = 0
+        self.conv_input['config']['layers'][4]['kernel_values'] = kernel
+        self.conv_input['config']['layers'][4]['sparsity'] = {'format': 'csr', 'zero_fraction': 0.5}
+        matrix = backend_utils.get_kernel_matrix(self.conv_input, 4, heights, widths, depths)
+
+        values, columns, row_starts = list(backend_utils.get_sparse_weight_chunks(self.conv_input))[0]
+        rows = np.zeros(matrix.T.shape)
+        for unit_index in range(matrix.shape[1]):
+            rows[unit_index, columns[row_starts[unit_index]:row_starts[unit_index + 1]]] = values[row_starts[unit_index]:row_starts[unit_index + 1]]
+        #? The weights of the sparse layer are not contained in the dense weights
+        self.assertTrue(np.array_equal(rows, matrix.T) and row_starts[-1] == values.size == backend_utils.get_number_of_sparse_weights(self.conv_input)
+                    and backend_utils.get_number_of_weights(self.conv_input, heights) == 27*4 + 16*5
+                    and backend_utils.get_sparse_rows_start_indices(self.conv_input) == [0, 0, 0, 0, 0]
+                    and backend_utils.get_number_of_sparse_rows(self.conv_input) == 7)
+
+    def test_writeArrayFile_floatAndIntegerChunks_commaSeparatedValues(self):
+        """Test case for write_array_file function"""
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'values.h')
+            backend_utils.write_array_file(filename, [np.array([0.5, -1.25], dtype=np.float32), np.zeros(0), np.array([3, -4], dtype=np.int8)])
+            with open(filename) as file:
+                self.assertTrue(file.read() == '0.5,-1.25,\n3,-4,\n')
+
 #? ############### INFO ###############
 #? This script has to be run with -m switch from parent directory in order to get the imports right
 #? Directory: Neural-Network-Translator (repository root directory)
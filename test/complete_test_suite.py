@@ -1,8 +1,21 @@
 import unittest
 import sys
 import argparse
+from test.layer_utils_test import TestLayerUtils
 from test.backend_utils_test import TestBackendUtils
 from test.gcc_backend_test import TestGCCBackend
+from test.float2int_conversion_test import TestFloat2IntConversion
+from test.pruning_conversion_test import TestPruningConversion
+from test.float2half_conversion_test import TestFloat2HalfConversion
+from test.weight_storage_test import TestWeightStorage
+from test.template_engine_test import TestTemplateEngine
+from test.plugin_collection_test import TestPluginCollection
+from test.schema_validation_test import TestSchemaValidation
+from test.nn_translator_test import TestNNTranslator
+from test.translation_cache_test import TestTranslationCache
+from test.reference_executor_test import TestReferenceExecutor
+from test.memory_planner_test import TestMemoryPlanner
+from test.graph_optimizer_test import TestGraphOptimizer
 
 #? ############### INFO ###############
 #? This script has to be run with -m switch from parent directory in order to get the imports right
@@ -11,6 +24,18 @@ from test.gcc_backend_test import TestGCCBackend
 
 test_loader = unittest.TestLoader()
 
+#? Running tests for layer_utils
+print('######################### Running tests for layer_utils #########################')
+
+#? Finding all test cases in TestLayerUtils and executing the test suite
+layer_utils_test_names = test_loader.getTestCaseNames(TestLayerUtils)
+suite = unittest.TestSuite()
+for test_name in layer_utils_test_names:
+    suite.addTest(TestLayerUtils(test_name))
+
+result_layer_utils = unittest.TextTestRunner().run(suite)
+print()
+
 #? Running tests for backend_utils
 print('######################### Running tests for backend_utils #########################')
 
@@ -33,6 +58,154 @@ for test_name in gcc_backend_test_names:
     suite.addTest(TestGCCBackend(test_name))
 
 result_gcc_backend = unittest.TextTestRunner().run(suite)
+print()
+
+#? Running tests for float2int conversion
+print('######################### Running tests for float2int conversion #########################')
+
+#? Finding all test cases in TestFloat2IntConversion and executing the test suite
+float2int_conversion_test_names = test_loader.getTestCaseNames(TestFloat2IntConversion)
+suite = unittest.TestSuite()
+for test_name in float2int_conversion_test_names:
+    suite.addTest(TestFloat2IntConversion(test_name))
+
+result_float2int_conversion = unittest.TextTestRunner().run(suite)
+print()
+
+#? Running tests for pruning conversion
+print('######################### Running tests for pruning conversion #########################')
+
+#? Finding all test cases in TestPruningConversion and executing the test suite
+pruning_conversion_test_names = test_loader.getTestCaseNames(TestPruningConversion)
+suite = unittest.TestSuite()
+for test_name in pruning_conversion_test_names:
+    suite.addTest(TestPruningConversion(test_name))
+
+result_pruning_conversion = unittest.TextTestRunner().run(suite)
+print()
+
+#? Running tests for float2half conversion
+print('######################### Running tests for float2half conversion #########################')
+
+#? Finding all test cases in TestFloat2HalfConversion and executing the test suite
+float2half_conversion_test_names = test_loader.getTestCaseNames(TestFloat2HalfConversion)
+suite = unittest.TestSuite()
+for test_name in float2half_conversion_test_names:
+    suite.addTest(TestFloat2HalfConversion(test_name))
+
+result_float2half_conversion = unittest.TextTestRunner().run(suite)
+print()
+
+#? Running tests for weight storage
+print('######################### Running tests for weight storage #########################')
+
+#? Finding all test cases in TestWeightStorage and executing the test suite
+weight_storage_test_names = test_loader.getTestCaseNames(TestWeightStorage)
+suite = unittest.TestSuite()
+for test_name in weight_storage_test_names:
+    suite.addTest(TestWeightStorage(test_name))
+
+result_weight_storage = unittest.TextTestRunner().run(suite)
+print()
+
+#? Running tests for template engine
+print('######################### Running tests for template engine #########################')
+
+#? Finding all test cases in TestTemplateEngine and executing the test suite
+template_engine_test_names = test_loader.getTestCaseNames(TestTemplateEngine)
+suite = unittest.TestSuite()
+for test_name in template_engine_test_names:
+    suite.addTest(TestTemplateEngine(test_name))
+
+result_template_engine = unittest.TextTestRunner().run(suite)
+print()
+
+#? Running tests for plugin collection
+print('######################### Running tests for plugin collection #########################')
+
+#? Finding all test cases in TestPluginCollection and executing the test suite
+plugin_collection_test_names = test_loader.getTestCaseNames(TestPluginCollection)
+suite = unittest.TestSuite()
+for test_name in plugin_collection_test_names:
+    suite.addTest(TestPluginCollection(test_name))
+
+result_plugin_collection = unittest.TextTestRunner().run(suite)
+print()
+
+#? Running tests for schema validation
+print('######################### Running tests for schema validation #########################')
+
+#? Finding all test cases in TestSchemaValidation and executing the test suite
+schema_validation_test_names = test_loader.getTestCaseNames(TestSchemaValidation)
+suite = unittest.TestSuite()
+for test_name in schema_validation_test_names:
+    suite.addTest(TestSchemaValidation(test_name))
+
+result_schema_validation = unittest.TextTestRunner().run(suite)
+print()
+
+#? Running tests for nn_translator
+print('######################### Running tests for nn_translator #########################')
+
+#? Finding all test cases in TestNNTranslator and executing the test suite
+nn_translator_test_names = test_loader.getTestCaseNames(TestNNTranslator)
+suite = unittest.TestSuite()
+for test_name in nn_translator_test_names:
+    suite.addTest(TestNNTranslator(test_name))
+
+result_nn_translator = unittest.TextTestRunner().run(suite)
+print()
+
+#? Running tests for translation cache
+print('######################### Running tests for translation cache #########################')
+
+#? Finding all test cases in TestTranslationCache and executing the test suite
+translation_cache_test_names = test_loader.getTestCaseNames(TestTranslationCache)
+suite = unittest.TestSuite()
+for test_name in translation_cache_test_names:
+    suite.addTest(TestTranslationCache(test_name))
+
+result_translation_cache = unittest.TextTestRunner().run(suite)
+print()
+
+#? Running tests for reference executor
+print('######################### Running tests for reference executor #########################')
+
+#? Finding all test cases in TestReferenceExecutor and executing the test suite
+reference_executor_test_names = test_loader.getTestCaseNames(TestReferenceExecutor)
+suite = unittest.TestSuite()
+for test_name in reference_executor_test_names:
+    suite.addTest(TestReferenceExecutor(test_name))
+
+result_reference_executor = unittest.TextTestRunner().run(suite)
+print()
+
+#? Running tests for memory planner
+print('######################### Running tests for memory planner #########################')
+
+#? Finding all test cases in TestMemoryPlanner and executing the test suite
+memory_planner_test_names = test_loader.getTestCaseNames(TestMemoryPlanner)
+suite = unittest.TestSuite()
+for test_name in memory_planner_test_names:
+    suite.addTest(TestMemoryPlanner(test_name))
+
+result_memory_planner = unittest.TextTestRunner().run(suite)
+print()
+
+#? Running tests for graph optimizer
+print('######################### Running tests for graph optimizer #########################')
+
+#? Finding all test cases in TestGraphOptimizer and executing the test suite
+graph_optimizer_test_names = test_loader.getTestCaseNames(TestGraphOptimizer)
+suite = unittest.TestSuite()
+for test_name in graph_optimizer_test_names:
+    suite.addTest(TestGraphOptimizer(test_name))
 
+result_graph_optimizer = unittest.TextTestRunner().run(suite)
 
-sys.exit(not (result_backend_utils.wasSuccessful() and result_gcc_backend.wasSuccessful()))
\ No newline at end of file
+sys.exit(not (result_layer_utils.wasSuccessful() and result_backend_utils.wasSuccessful() and result_gcc_backend.wasSuccessful() and result_float2int_conversion.wasSuccessful()
+          and result_pruning_conversion.wasSuccessful() and result_float2half_conversion.wasSuccessful()
+          and result_weight_storage.wasSuccessful() and result_template_engine.wasSuccessful() and result_plugin_collection.wasSuccessful()
+          and result_schema_validation.wasSuccessful() and result_nn_translator.wasSuccessful()
+          and result_translation_cache.wasSuccessful() and result_reference_executor.wasSuccessful() and result_memory_planner.wasSuccessful()
+          and result_graph_optimizer.wasSuccessful()))
\ No newline at end of file
@@ -0,0 +1,79 @@
+import unittest
+import sys
+import json
+import numpy as np
+from conversion.float2half import Float2Half
+from conversion.float2int import Float2Integer
+
+class TestFloat2HalfConversion(unittest.TestCase):
+    """Test class for float2half conversion"""
+
+    #? Naming scheme for test classes: [test_MethodName_StateUnderTest_ExpectedBehavior]
+
+    intermediate = None
+
+    def __init__(self, testname):
+        super(TestFloat2HalfConversion, self).__init__(testname)
+
+    def setUp(self):
+        """Preparation for test cases"""
+        self.intermediate = json.load(open('test/test_dense_2layer_input.json'))
+        return super().setUp()
+
+    def tearDown(self):
+        """Clean up after test cases"""
+        return super().tearDown()
+
+    def test_process_noOptions_float16ValuesRecorded(self):
+        """Test case for process function with the default float16 dtype"""
+        kernel = np.array(self.intermediate['config']['layers'][0]['kernel_values'], dtype=np.float32)
+        output = Float2Half().process(self.intermediate)
+        layer = output['config']['layers'][0]
+        self.assertTrue(layer['half_precision'] == {'dtype': 'float16'} and
+                        np.array_equal(layer['kernel_values'], kernel.astype(np.float16).astype(np.float32)) and
+                        np.array_equal(layer['bias_values'], np.float16(layer['bias_values']).astype(np.float32)))
+
+    def test_process_bfloat16_upperHalfOfBitsOnly(self):
+        """Test case for process function with the bfloat16 dtype"""
+        kernel = np.array(self.intermediate['config']['layers'][1]['kernel_values'], dtype=np.float32)
+        output = Float2Half().process(self.intermediate, {'half_precision_dtype': 'bfloat16'})
+        rounded = output['config']['layers'][1]['kernel_values']
+        #? The relative rounding error of bfloat16 values is at most 2**-8
+        self.assertTrue(np.all((rounded.view(np.uint32) & 0xffff) == 0) and np.all(np.abs(rounded - kernel) <= np.abs(kernel) * 2**-8))
+
+    def test_round_float16OutOfRange_clippedToLargestValue(self):
+        """Test case for round function with values outside of the IEEE half precision range"""
+        rounded = Float2Half().round(np.array([1e6, -1e6, 0.1]), 'float16')
+        self.assertTrue(list(rounded[:2]) == [65504.0, -65504.0] and rounded[2] == np.float32(np.float16(0.1)))
+
+    def test_process_unknownDtype_raisesValueError(self):
+        """Test case for process function with an unknown half precision dtype"""
+        with self.assertRaises(ValueError):
+            Float2Half().process(self.intermediate, {'half_precision_dtype': 'float8'})
+
+    def test_process_quantizedLayers_valuesUnchanged(self):
+        """Test case for process function applied after the float2int conversion"""
+        output = Float2Integer().process(self.intermediate)
+        kernel_values = output['config']['layers'][0]['kernel_values']
+        output = Float2Half().process(output)
+        self.assertTrue(np.array_equal(output['config']['layers'][0]['kernel_values'], kernel_values) and
+                        'half_precision' not in output['config']['layers'][0])
+
+#? ############### INFO ###############
+#? This script has to be run with -m switch from parent directory in order to get the imports right
+#? Directory: Neural-Network-Translator (repository root directory)
+#? Command: python -m test.float2half_conversion_test
+
+if __name__ == '__main__':
+    #? Searching for all test cases in TestFloat2HalfConversion
+    test_loader = unittest.TestLoader()
+    test_names = test_loader.getTestCaseNames(TestFloat2HalfConversion)
+
+    #? Adding all found test cases
+    suite = unittest.TestSuite()
+    for test_name in test_names:
+        suite.addTest(TestFloat2HalfConversion(test_name))
+
+    #? Running the test suite
+    result = unittest.TextTestRunner().run(suite)
+    sys.exit(not result.wasSuccessful())
@@ -0,0 +1,85 @@
+import unittest
+import sys
+import json
+import numpy as np
+from conversion.float2int import Float2Integer
+
+class TestFloat2IntConversion(unittest.TestCase):
+    """Test class for float2int conversion"""
+
+    #? Naming scheme for test classes: [test_MethodName_StateUnderTest_ExpectedBehavior]
+
+    intermediate = None
+
+    def __init__(self, testname):
+        super(TestFloat2IntConversion, self).__init__(testname)
+
+    def setUp(self):
+        """Preparation for test cases"""
+        self.intermediate = json.load(open('test/test_dense_2layer_input.json'))
+        return super().setUp()
+
+    def tearDown(self):
+        """Clean up after test cases"""
+        return super().tearDown()
+
+    def test_process_symmetricPerLayer_int8ValuesWithinScale(self):
+        """Test case for process function with default options"""
+        kernel = np.array(self.intermediate['config']['layers'][0]['kernel_values'])
+        output = Float2Integer().process(self.intermediate)
+        layer = output['config']['layers'][0]
+        quantized = np.array(layer['kernel_values'])
+        scale = layer['quantization']['kernel_scale'][0]
+        self.assertTrue(len(layer['quantization']['kernel_scale']) == 1 and
+                        quantized.min() >= -127 and quantized.max() <= 127 and
+                        np.abs(quantized * scale - kernel).max() <= scale / 2 + 1e-9)
+
+    def test_process_affinePerChannel_scaleAndZeroPointForEachUnit(self):
+        """Test case for process function with affine per channel quantization"""
+        kernel = np.array(self.intermediate['config']['layers'][0]['kernel_values'])
+        output = Float2Integer().process(self.intermediate, {'quantization_scheme': 'affine', 'quantization_granularity': 'per_channel'})
+        quantization = output['config']['layers'][0]['quantization']
+        quantized = np.array(output['config']['layers'][0]['kernel_values'])
+        scales = np.array(quantization['kernel_scale'])
+        zero_points = np.array(quantization['kernel_zero_point'])
+        self.assertTrue(len(scales) == kernel.shape[1] and len(zero_points) == kernel.shape[1] and
+                        np.abs((quantized - zero_points) * scales - kernel).max() <= scales.max() / 2 + 1e-9)
+
+    def test_process_biasValues_floatValuesUnchanged(self):
+        """Test case for process function with the bias values of dense layers"""
+        bias_values = self.intermediate['config']['layers'][0]['bias_values']
+        output = Float2Integer().process(self.intermediate)
+        layer = output['config']['layers'][0]
+        self.assertTrue(np.array_equal(layer['bias_values'], bias_values) and
+                        'bias_scale' not in layer['quantization'] and 'bias_zero_point' not in layer['quantization'])
+
+    def test_process_unknownScheme_raisesValueError(self):
+        """Test case for process function with an unknown quantization scheme"""
+        with self.assertRaises(ValueError):
+            Float2Integer().process(self.intermediate, {'quantization_scheme': 'int4'})
+
+    def test_process_alreadyQuantized_valuesUnchanged(self):
+        """Test case for process function applied twice"""
+        output = Float2Integer().process(self.intermediate)
+        kernel_values = output['config']['layers'][0]['kernel_values']
+        output = Float2Integer().process(output)
+        self.assertTrue(np.array_equal(output['config']['layers'][0]['kernel_values'], kernel_values))
+
+#? ############### INFO ###############
+#? This script has to be run with -m switch from parent directory in order to get the imports right
+#? Directory: Neural-Network-Translator (repository root directory)
+#? Command: python -m test.float2int_conversion_test
+
+if __name__ == '__main__':
+    #? Searching for all test cases in TestFloat2IntConversion
+    test_loader = unittest.TestLoader()
+    test_names = test_loader.getTestCaseNames(TestFloat2IntConversion)
+
+    #? Adding all found test cases
+    suite = unittest.TestSuite()
+    for test_name in test_names:
+        suite.addTest(TestFloat2IntConversion(test_name))
+
+    #? Running the test suite
+    result = unittest.TextTestRunner().run(suite)
+    sys.exit(not result.wasSuccessful())
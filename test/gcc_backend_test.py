@@ -1,7 +1,15 @@
 import unittest
 import sys
+import os
 import json
+import tempfile
+import shutil
 from backend.gcc.gcc import GCC
+import backend.gcc.specialized_codegen as specialized_codegen
+import backend.gcc.memory_planner as memory_planner
+from conversion.float2int import Float2Integer
+from conversion.pruning import Pruning
+from conversion.float2half import Float2Half
 
 class TestGCCBackend(unittest.TestCase):
     """Test class for GCC Backend"""
@@ -36,6 +44,7 @@ class TestGCCBackend(unittest.TestCase):
                         '###weights###' in markers and
                         '###dimWeights###' in markers and
                         '###indicesWeights###' in markers and
+                        '###weightsRowAlignment###' in markers and
                         '###bias###' in markers and
                         '###dimBias###' in markers and
                         '###indicesBias###' in markers and
@@ -44,7 +53,186 @@ class TestGCCBackend(unittest.TestCase):
                         '###poolHeight###' in markers and
                         '###horizontalStride###' in markers and
                         '###verticalStride###' in markers and
-                        '###padding###' in markers)
+                        '###padding###' in markers and
+                        '###arenaSize###' in markers and
+                        '###layerOutputOffsets###' in markers and
+                        '###columnBufferOffsets###' in markers and
+                        '###horizontalDilation###' in markers and
+                        '###verticalDilation###' in markers and
+                        '###paddingLeft###' in markers and
+                        '###paddingTop###' in markers and
+                        '###peakRamBytes###' in markers)
+
+    def test_translateToNativeCode_unknownCodegenMode_raisesValueError(self):
+        """Test case for translate_to_native_code function with an unknown codegen option"""
+        with self.assertRaises(ValueError):
+            GCC().translate_to_native_code(self.intermediate, 'test_output', None, {'codegen': 'unknown'})
+
+    def test_translateToNativeCode_unknownConvolutionMode_raisesValueError(self):
+        """Test case for translate_to_native_code function with an unknown convolution option"""
+        with self.assertRaises(ValueError):
+            GCC().translate_to_native_code(self.intermediate, 'test_output', None, {'convolution': 'winograd'})
+
+    def test_translateToNativeCode_unknownActivationMode_raisesValueError(self):
+        """Test case for translate_to_native_code function with an unknown activations option"""
+        with self.assertRaises(ValueError):
+            GCC().translate_to_native_code(self.intermediate, 'test_output', None, {'activations': 'approximate'})
+
+    def test_translateToNativeCode_fastActivations_fastActivationsDefined(self):
+        """Test case for translate_to_native_code function with the fast activation functions"""
+        GCC().translate_to_native_code(self.intermediate, 'test_fast_activations', None, {'activations': 'fast'})
+        with open('_out/test_fast_activations/nn_model.c') as file:
+            code = file.read()
+        shutil.rmtree('_out/test_fast_activations')
+        self.assertTrue('#define NNT_FAST_ACTIVATIONS 1\n' in code)
+
+    def test_buildMarkers_convolutionInput_convolutionMarkers(self):
+        """Test case for build_markers function with convolution layers, the kernel sizes are stored with the pool sizes"""
+        markers = GCC().build_markers(json.load(open('test/test_conv_input.json')))
+        self.assertTrue(markers['###layerTypes###'] == '{5,3,5,2,1}' and markers['###poolHeight###'] == '{3,2,2,0,0}'
+                        and markers['###verticalDilation###'] == '{1,0,2,0,0}' and markers['###paddingTop###'] == '{1,0,0,0,0}'
+                        and markers['###dimWeights###'] == 28*4 + 16*5 + 32*6)
+
+    def test_getModelCode_convolutionInputIm2col_columnBufferInArena(self):
+        """Test case for get_model_code function with convolution layers and the im2col variant"""
+        intermediate = json.load(open('test/test_conv_input.json'))
+        memory_plan = memory_planner.plan_memory(intermediate, 'im2col')
+        code = specialized_codegen.get_model_code(intermediate, GCC.layer_types, GCC.activation_functions, GCC.padding_types, 1, memory_plan, 'im2col')
+        direct_code = specialized_codegen.get_model_code(intermediate, GCC.layer_types, GCC.activation_functions, GCC.padding_types)
+        self.assertTrue('static void convolution_9x8x3_3x3x4_s1x1_d1x1_p1x1_relu(' in code
+                        and 'static void convolution_4x4x4_2x2x5_s1x1_d2x1_p0x0_tanh_nobias_batch(' in code
+                        and '(input, ARENA + ' + str(memory_plan.output_offsets[0]) + ', WEIGHTS + 0, BIASES + 0, ARENA + ' + str(memory_plan.column_offsets[0]) + ');' in code
+                        and '(input, ARENA + ' + str(memory_plan.output_offsets[0]) + ', WEIGHTS + 0, BIASES + 0, NULL);' not in code
+                        and ', WEIGHTS + 0, BIASES + 0, NULL);' in direct_code)
+
+    def test_getModelCode_samePaddingPoolingInput_inputReadInPlace(self):
+        """Test case for get_model_code function with a pooling layer with padding_same, whose windows are clamped to the input instead of padded"""
+        intermediate = json.load(open('test/test_mnist_pool_input.json'))
+        intermediate['config']['layers'][0]['config']['padding'] = 'same'
+        intermediate['config']['layers'][0]['config']['pool_size'] = [3, 3]
+        code = specialized_codegen.get_model_code(intermediate, GCC.layer_types, GCC.activation_functions, GCC.padding_types, 1, memory_planner.plan_memory(intermediate))
+        self.assertTrue('  pooling_apply(input, output, 28, 28, 1, lt_avg_pooling, 3, 3, 2, 2, padding_same, 14, 14);' in code
+                        and '  avg_pooling_28x28x1_3x3_s2x2_same(input, ARENA + 0);' in code and 'padding_buffer' not in code)
+
+    def test_getModelCode_2DenseLayerInput_straightLineLayerCalls(self):
+        """Test case for get_model_code function of the specialized code generation"""
+        code = specialized_codegen.get_model_code(self.intermediate, GCC.layer_types, GCC.activation_functions, GCC.padding_types)
+        self.assertTrue('static void dense_8x8_sigmoid(' in code and
+                        'static void dense_8x1_sigmoid_batch(' in code and
+                        '  dense_8x8_sigmoid(input, ARENA + 0, WEIGHTS + 0, BIASES + 0);\n'
+                        '  NNT_PROFILE_END(0, 1);\n'
+                        '  NNT_PROFILE_BEGIN();\n'
+                        '  dense_8x1_sigmoid(ARENA + 0, ARENA + 8, WEIGHTS + 64, BIASES + 8);\n'
+                        '  NNT_PROFILE_END(1, 1);\n'
+                        '  return ARENA + 8;' in code)
+
+    def test_getModelCode_flattenDropoutLayerInput_noLayerFunctions(self):
+        """Test case for get_model_code function with layers which do not transform their input"""
+        self.intermediate['config']['layers'][0]['class_name'] = 'Flatten'
+        self.intermediate['config']['layers'][1]['class_name'] = 'Dropout'
+        code = specialized_codegen.get_model_code(self.intermediate, GCC.layer_types, GCC.activation_functions, GCC.padding_types)
+        #? The only static function is the tile loop of predict_batch
+        self.assertTrue('return (float *)input;' in code and code.count('static void') == 1)
+
+    def test_buildMarkers_quantizedIntermediateFormat_int8WeightMarkers(self):
+        """Test case for build_markers function with int8 quantized weights"""
+        markers = GCC().build_markers(Float2Integer().process(self.intermediate))
+        self.assertTrue(markers['###weightsInt8###'] == 1 and markers['###weightType###'] == 'int8_t' and
+                        markers['###kernelScales###'].count(',') + 1 == markers['###dimBias###'])
+
+    def test_buildMarkers_partiallyQuantizedIntermediateFormat_raisesValueError(self):
+        """Test case for build_markers function with only some of the dense layers quantized"""
+        self.intermediate['config']['layers'][0]['quantization'] = {'dtype': 'int8', 'scheme': 'symmetric', 'granularity': 'per_layer',
+                                                                    'kernel_scale': [1.0], 'kernel_zero_point': [0]}
+        with self.assertRaises(ValueError):
+            GCC().build_markers(self.intermediate)
+
+    def test_getModelCode_quantizedIntermediateFormat_int8LayerFunctions(self):
+        """Test case for get_model_code function with int8 quantized weights"""
+        code = specialized_codegen.get_model_code(Float2Integer().process(self.intermediate), GCC.layer_types, GCC.activation_functions, GCC.padding_types)
+        self.assertTrue('dense_int8_apply(input, output, QUANTIZED_INPUT' in code and 'KERNEL_SCALES + 0' in code)
+
+    def test_buildMarkers_prunedIntermediateFormat_sparseWeightMarkers(self):
+        """Test case for build_markers function with the first dense layer stored as sparse matrix"""
+        intermediate = Pruning().process(self.intermediate, {'pruning_sparsity': 0.75})
+        del intermediate['config']['layers'][1]['sparsity']
+        markers = GCC().build_markers(intermediate)
+        #? The weights of the second dense layer are the only weights in WEIGHTS
+        self.assertTrue(markers['###sparseWeightsEnabled###'] == 1 and markers['###sparseLayers###'] == '{1,0}' and markers['###dimSparseWeights###'] == 16
+                        and markers['###dimSparseRows###'] == 9 and markers['###dimWeights###'] == 8 and markers['###indicesWeights###'] == '{0,0}')
+
+    def test_getModelCode_prunedIntermediateFormat_sparseLayerFunctions(self):
+        """Test case for get_model_code function with the first dense layer stored as sparse matrix"""
+        intermediate = Pruning().process(self.intermediate, {'pruning_sparsity': 0.75})
+        del intermediate['config']['layers'][1]['sparsity']
+        code = specialized_codegen.get_model_code(intermediate, GCC.layer_types, GCC.activation_functions, GCC.padding_types)
+        self.assertTrue('dense_sparse_apply(input, output, 8, weights, columns, rows, 0, biases, 0, 1, af_sigmoid);' in code
+                        and 'SPARSE_WEIGHTS, SPARSE_COLUMNS, SPARSE_ROWS + 0, BIASES + 0' in code and 'WEIGHTS + 0, BIASES + 8' in code)
+
+    def test_translateToNativeCode_invalidWeightAlignment_raisesValueError(self):
+        """Test case for translate_to_native_code function with an invalid weight alignment option"""
+        with self.assertRaises(ValueError):
+            GCC().translate_to_native_code(self.intermediate, 'test_weight_alignment', None, {'weight_alignment': '0'})
+
+    def test_getModelCode_batchInput_profiledLayerCalls(self):
+        """Test case for get_model_code function with the profiling hooks of the batch layer calls"""
+        code = specialized_codegen.get_model_code(self.intermediate, GCC.layer_types, GCC.activation_functions, GCC.padding_types)
+        self.assertTrue('    NNT_PROFILE_BEGIN();\n'
+                        '    dense_8x1_sigmoid_batch(input, output, number_of_tile_samples, WEIGHTS + 64, BIASES + 8);\n'
+                        '    NNT_PROFILE_END(1, number_of_tile_samples);\n' in code)
+
+    def test_getModelCode_batchInput_batchArenaArgument(self):
+        """Test case for get_model_code function with the part of the batch arena, which is passed to the tiles of each thread"""
+        intermediate = json.load(open('test/test_conv_input.json'))
+        memory_plan = memory_planner.plan_memory(intermediate, 'im2col')
+        code = specialized_codegen.get_model_code(intermediate, GCC.layer_types, GCC.activation_functions, GCC.padding_types, 1, memory_plan, 'im2col')
+        self.assertTrue('static void predict_batch_tiles(const float * inputs, float * outputs, uint32_t number_of_samples, float * batch_arena)' in code
+                        and ', batch_arena + number_of_tile_samples * ' + str(memory_plan.column_offsets[0]) + ');' in code
+                        and 'BATCH_ARENA +' not in code and 'void predict_batch(' not in code)
+
+    def test_translateToNativeCode_validIntermediateFormat_peakRamInHeaderAndSummary(self):
+        """Test case for translate_to_native_code function with the peak RAM of the memory plan"""
+        summary = GCC().translate_to_native_code(self.intermediate, 'test_peak_ram', None)
+        with open('_out/test_peak_ram/nn_model.h') as file:
+            header = file.read()
+        shutil.rmtree('_out/test_peak_ram')
+        #? The outputs of the dense layers with 8 and 1 units share the arena, the input of the model is not located in the arena
+        self.assertTrue(summary['Peak RAM of predict (bytes)'] == 9 * 4 and '#define NNT_PEAK_RAM_BYTES 36\n' in header)
+
+    def test_writeWeightFiles_validIntermediateFormat_allValuesWritten(self):
+        """Test case for write_weight_files function"""
+        with tempfile.TemporaryDirectory() as directory:
+            GCC().write_weight_files(self.intermediate, directory, 4)
+            with open(os.path.join(directory, GCC.weights_file_name)) as file:
+                weights = file.read()
+            with open(os.path.join(directory, GCC.biases_file_name)) as file:
+                biases = file.read()
+        self.assertTrue(weights.count(',') == 72 and biases.count(',') == 9)
+
+    def test_buildMarkers_halfPrecisionIntermediateFormat_halfWeightMarkers(self):
+        """Test case for build_markers function with weights and biases stored as bfloat16 values"""
+        markers = GCC().build_markers(Float2Half().process(self.intermediate, {'half_precision_dtype': 'bfloat16'}))
+        self.assertTrue(markers['###weightsHalf###'] == 2 and markers['###weightType###'] == 'weight_value' and markers['###weightsInt8###'] == 0)
+
+    def test_writeWeightFiles_halfPrecisionIntermediateFormat_valuesWrittenAsBits(self):
+        """Test case for write_weight_files function with weights and biases stored as float16 values"""
+        self.intermediate['config']['layers'][0]['bias_values'][0] = -2.0
+        with tempfile.TemporaryDirectory() as directory:
+            GCC().write_weight_files(Float2Half().process(self.intermediate), directory, 4)
+            with open(os.path.join(directory, GCC.weights_file_name)) as file:
+                weights = file.read()
+            with open(os.path.join(directory, GCC.biases_file_name)) as file:
+                biases = file.read()
+        #? The bits of -2.0 as IEEE half precision value are 0xc000
+        self.assertTrue(weights.count(',') == 72 and '.' not in weights + biases and biases.strip().startswith('49152'))
+
+    def test_buildMarkers_halfPrecisionAndQuantized_raisesValueError(self):
+        """Test case for build_markers function with half precision weights in a quantized model"""
+        intermediate = Float2Integer().process(self.intermediate)
+        intermediate['config']['layers'][0]['half_precision'] = {'dtype': 'float16'}
+        intermediate['config']['layers'][1]['half_precision'] = {'dtype': 'float16'}
+        with self.assertRaises(ValueError):
+            GCC().build_markers(intermediate)
 
 #? ############### INFO ###############
 #? This script has to be run with -m switch from parent directory in order to get the imports right
@@ -0,0 +1,99 @@
+import unittest
+import sys
+import json
+import numpy as np
+import graph_optimizer
+import reference_executor
+
+class TestGraphOptimizer(unittest.TestCase):
+    """Test class for the graph optimizer"""
+
+    #? Naming scheme for test classes: [test_MethodName_StateUnderTest_ExpectedBehavior]
+
+    intermediate = None
+    conv_input = None
+
+    def __init__(self, testname):
+        super(TestGraphOptimizer, self).__init__(testname)
+
+    def setUp(self):
+        """Preparation for test cases"""
+        self.intermediate = json.load(open('test/test_dense_2layer_input.json'))
+        self.conv_input = json.load(open('test/test_conv_input.json'))
+        return super().setUp()
+
+    def tearDown(self):
+        """Clean up after test cases"""
+        return super().tearDown()
+
+    def get_batch_normalization_layer(self, units):
+        """Returns a batch normalization layer with the given number of units and constant statistics"""
+        return {'class_name': 'BatchNormalization', 'config': {'axis': [1], 'epsilon': 0.001, 'scale': True, 'center': True},
+                'gamma_values': [2.0] * units, 'beta_values': [0.5] * units, 'moving_mean_values': [0.25] * units, 'moving_variance_values': [3.999] * units}
+
+    def test_optimize_dropoutAndLinearActivation_layersRemovedAndBatchInputShapeMoved(self):
+        """Test case for optimize function with a dropout layer as first layer and a linear activation layer"""
+        layers = self.intermediate['config']['layers']
+        layers.insert(0, {'class_name': 'Dropout', 'config': {'rate': 0.2, 'batch_input_shape': layers[0]['config'].pop('batch_input_shape')}})
+        layers.insert(2, {'class_name': 'Activation', 'config': {'activation': 'linear'}})
+        output, report = graph_optimizer.optimize(self.intermediate)
+        self.assertTrue([layer['class_name'] for layer in output['config']['layers']] == ['Dense', 'Dense']
+                        and output['config']['layers'][0]['config']['batch_input_shape'] == [None, 8]
+                        and report['removed_identity_layers'] == 1 and report['fused_activations'] == 1 and len(layers) == 4)
+
+    def test_optimize_batchNormalizationAfterDense_foldedIntoKernelAndBiases(self):
+        """Test case for optimize function with a batch normalization and a relu activation layer after a dense layer without activation function"""
+        layers = self.intermediate['config']['layers']
+        layers[0]['config']['activation'] = 'linear'
+        layers.insert(1, self.get_batch_normalization_layer(8))
+        layers.insert(2, {'class_name': 'Activation', 'config': {'activation': 'relu'}})
+        output, report = graph_optimizer.optimize(self.intermediate)
+
+        #? The scale of each unit is 2 / sqrt(3.999 + 0.001) = 1
+        inputs = np.random.default_rng(0).standard_normal((4, 8)).astype(np.float32)
+        hidden = np.maximum(inputs @ np.array(layers[0]['kernel_values']) + np.array(layers[0]['bias_values']) - 0.25 + 0.5, 0)
+        expected = 1 / (1 + np.exp(-(hidden @ np.array(layers[3]['kernel_values']) + np.array(layers[3]['bias_values']))))
+        self.assertTrue(len(output['config']['layers']) == 2 and output['config']['layers'][0]['config']['activation'] == 'relu'
+                        and report['folded_batch_normalizations'] == 1 and report['flops_before'] - report['flops_after'] == 16
+                        and np.allclose(reference_executor.predict(output, inputs), expected, atol=1e-6))
+
+    def test_optimize_activationAfterActivatedDense_activationLayerKept(self):
+        """Test case for optimize function with an activation layer after a dense layer which has an activation function"""
+        self.intermediate['config']['layers'].append({'class_name': 'Activation', 'config': {'activation': 'tanh'}})
+        output, report = graph_optimizer.optimize(self.intermediate)
+        self.assertTrue(len(output['config']['layers']) == 3 and report['fused_activations'] == 0 and report['flops_before'] == report['flops_after'])
+
+    def test_optimize_flattenAfterConvolution_flattenKept(self):
+        """Test case for optimize function with a flatten layer which orders the output of a convolution layer for the dense layer"""
+        output, report = graph_optimizer.optimize(self.conv_input)
+        self.assertTrue([layer['class_name'] for layer in output['config']['layers']] == [layer['class_name'] for layer in self.conv_input['config']['layers']]
+                        and report['layers_before'] == report['layers_after'] == 5)
+
+    def test_optimize_batchNormalizationAfterPooling_raisesValueError(self):
+        """Test case for optimize function with a batch normalization layer which does not follow a weighted layer"""
+        self.conv_input['config']['layers'].insert(2, self.get_batch_normalization_layer(4))
+        with self.assertRaises(ValueError):
+            graph_optimizer.optimize(self.conv_input)
+
+    def test_getLayerFlops_denseLayers_multiplyAddsBiasesAndActivations(self):
+        """Test case for get_layer_flops function with two dense layers"""
+        self.assertTrue(graph_optimizer.get_layer_flops(self.intermediate) == [2*8*8 + 8 + 8, 2*8*1 + 1 + 1])
+
+#? ############### INFO ###############
+#? This script has to be run with -m switch from parent directory in order to get the imports right
+#? Directory: Neural-Network-Translator (repository root directory)
+#? Command: python -m test.graph_optimizer_test
+
+if __name__ == '__main__':
+    #? Searching for all test cases in TestGraphOptimizer
+    test_loader = unittest.TestLoader()
+    test_names = test_loader.getTestCaseNames(TestGraphOptimizer)
+
+    #? Adding all found test cases
+    suite = unittest.TestSuite()
+    for test_name in test_names:
+        suite.addTest(TestGraphOptimizer(test_name))
+
+    #? Running the test suite
+    result = unittest.TextTestRunner().run(suite)
+    sys.exit(not result.wasSuccessful())
@@ -0,0 +1,151 @@
+import unittest
+import sys
+import json
+import numpy as np
+import layer_utils
+
+class TestLayerUtils(unittest.TestCase):
+    """Test class for the layer names and shape helpers of the intermediate format"""
+
+    #? Naming scheme for test classes: [test_MethodName_StateUnderTest_ExpectedBehavior]
+
+    dense_2layer_input = None
+    dense_3layer_input = None
+    mnist_flatten_input = None
+    mnist_pool_input = None
+    conv_input = None
+
+    def __init__(self, testname):
+        super(TestLayerUtils, self).__init__(testname)
+
+    def setUp(self):
+        """Preparation for test cases"""
+        self.dense_2layer_input = json.load(open('test/test_dense_2layer_input.json'))
+        self.dense_3layer_input = json.load(open('test/test_dense_3layer_input.json'))
+        self.mnist_flatten_input = json.load(open('test/test_mnist_flatten_input.json'))
+        self.mnist_pool_input = json.load(open('test/test_mnist_pool_input.json'))
+        self.conv_input = json.load(open('test/test_conv_input.json'))
+        return super().setUp()
+
+    def tearDown(self):
+        """Clean up after test cases"""
+        return super().tearDown()
+
+    def test_getOutputDimensions_2DenseLayerInput_correctHeightWidthDepthDimensions(self):
+        """Test case for get_output_dimensions function in 2 layer dense network"""
+        heights, widths, depths = layer_utils.get_output_dimensions(self.dense_2layer_input)
+        self.assertTrue(heights == [8, 8, 1]
+                    and widths == [1, 1, 1]
+                    and depths == [1, 1, 1])
+
+    def test_getOutputDimensions_3DenseLayerInput_correctHeightWidthDepthDimensions(self):
+        """Test case for get_output_dimensions function in 3 layer dense network"""
+        heights, widths, depths = layer_utils.get_output_dimensions(self.dense_3layer_input)
+        self.assertTrue(heights == [8, 16, 8, 1]
+                    and widths == [1, 1, 1, 1]
+                    and depths == [1, 1, 1, 1])
+
+    def test_getOutputDimensions_FlattenDenseDropOutLayerInput_correctHeightWidthDepthDimensions(self):
+        """Test case for get_output_dimensions function with flatten, dense and dropout layers"""
+        heights, widths, depths = layer_utils.get_output_dimensions(self.mnist_flatten_input)
+        self.assertTrue(heights == [28, 784, 128, 128, 10]
+                    and widths == [28, 1, 1, 1, 1]
+                    and depths == [1, 1, 1, 1, 1])
+
+    def test_getOutputDimensions_poolingLayerInput_correctHeightWidthDepthDimensions(self):
+        heights, widths, depths = layer_utils.get_output_dimensions(self.mnist_pool_input)
+        self.assertTrue(heights == [28, 14, 196, 128, 10]
+                    and widths == [28, 14, 1, 1, 1]
+                    and depths == [1, 1, 1, 1, 1])
+
+    def test_getOutputDimensions_activationLayerInput_correctHeightWidthDepthDimensions(self):
+        """Test case for get_output_dimensions function with an activation layer as first layer, which keeps the dimensions of its input"""
+        layer = {'class_name': 'Activation', 'config': {'batch_input_shape': [None, 6, 5, 2], 'activation': 'tanh'}}
+        heights, widths, depths = layer_utils.get_output_dimensions({'config': {'layers': [layer]}})
+        self.assertTrue(heights == [6, 6] and widths == [5, 5] and depths == [2, 2])
+
+    def test_getOutputDimensions_samePaddingWithStrideInput_integerFlattenDimension(self):
+        """Test case for get_output_dimensions function with a pooling layer whose windows do not fit completely"""
+        self.mnist_pool_input['config']['layers'][0]['config']['padding'] = 'same'
+        self.mnist_pool_input['config']['layers'][0]['config']['pool_size'] = [3, 3]
+        self.mnist_pool_input['config']['layers'][0]['config']['strides'] = [3, 3]
+        heights, widths, depths = layer_utils.get_output_dimensions(self.mnist_pool_input)
+        self.assertTrue(heights[1] == 10 and widths[1] == 10 and heights[2] == 10*10)
+
+    def test_getOutputDimensions_samePaddingEvenPoolSizeInput_inputSizeDividedByStride(self):
+        """Test case for get_output_dimensions function with a pooling layer with padding same and an even pool size, sized like in Keras"""
+        self.mnist_pool_input['config']['layers'][0]['config']['padding'] = 'same'
+        self.mnist_pool_input['config']['layers'][0]['config']['pool_size'] = [2, 4]
+        self.mnist_pool_input['config']['layers'][0]['config']['strides'] = [1, 3]
+        heights, widths, depths = layer_utils.get_output_dimensions(self.mnist_pool_input)
+        self.assertTrue(heights[1] == 28 and widths[1] == 10 and heights[2] == 28*10)
+
+    def test_getOutputDimensions_convolutionLayerInput_correctHeightWidthDepthDimensions(self):
+        """Test case for get_output_dimensions function with convolution layers with padding same and a dilation rate"""
+        heights, widths, depths = layer_utils.get_output_dimensions(self.conv_input)
+        self.assertTrue(heights == [9, 9, 4, 2, 30, 6] and widths == [8, 8, 4, 3, 1, 1] and depths == [3, 4, 4, 5, 1, 1])
+
+    def test_getOutputDimensions_conv1DFirstLayerInput_channelsAsDepth(self):
+        """Test case for get_output_dimensions function with a one-dimensional convolution as first layer"""
+        layer = {'class_name': 'Conv1D', 'config': {'batch_input_shape': [None, 20, 3], 'filters': 4, 'kernel_size': [4], 'strides': [3],
+                 'padding': 'same', 'dilation_rate': [1], 'activation': 'relu', 'use_bias': False}, 'kernel_values': np.zeros((4, 3, 4))}
+        heights, widths, depths = layer_utils.get_output_dimensions({'config': {'layers': [layer]}})
+        self.assertTrue(heights == [20, 7] and widths == [1, 1] and depths == [3, 4])
+
+    def test_getConvolutionOutputSize_samePaddingWithStride_kerasPadding(self):
+        """Test case for get_convolution_output_size function, the larger half of the padding is located after the input like in Keras"""
+        self.assertTrue(layer_utils.get_convolution_output_size(8, 4, 2, 1, 'same') == (4, 1)
+                    and layer_utils.get_convolution_output_size(7, 3, 2, 1, 'same') == (4, 1)
+                    and layer_utils.get_convolution_output_size(7, 3, 1, 2, 'valid') == (3, 0))
+
+    def test_getConvolutionParameters_channelsFirstInput_raisesValueError(self):
+        """Test case for get_convolution_parameters function with the unsupported channels_first data format"""
+        self.conv_input['config']['layers'][0]['config']['data_format'] = 'channels_first'
+        with self.assertRaises(ValueError):
+            layer_utils.get_output_dimensions(self.conv_input)
+
+    def test_getStrides_pooling1DLayer_strideOfLayer(self):
+        """Test case for get_strides function with a one-dimensional pooling layer whose stride differs from its pool size"""
+        layer = {'class_name': 'MaxPooling1D', 'config': {'pool_size': [3], 'strides': [1], 'padding': 'valid'}}
+        self.assertTrue(layer_utils.get_strides({'config': {'layers': [layer]}}) == ([1], [1]))
+
+    def test_getKernelMatrix_convolutionLayer_rowsOrderedByChannelRowColumn(self):
+        """Test case for get_kernel_matrix function with a convolution layer"""
+        heights, widths, depths = layer_utils.get_output_dimensions(self.conv_input)
+        kernel = np.asarray(self.conv_input['config']['layers'][0]['kernel_values'])
+        matrix = layer_utils.get_kernel_matrix(self.conv_input, 0, heights, widths, depths)
+        #? Row of channel 2, kernel row 1 and kernel column 0
+        self.assertTrue(matrix.shape == (27, 4) and np.array_equal(matrix[2*9 + 1*3 + 0], kernel[1, 0, 2]))
+
+    def test_getKernelMatrix_denseAfterChannelsLastFlatten_permutedRows(self):
+        """Test case for get_kernel_matrix function with a dense layer which reads the output of a convolution layer through a flatten layer"""
+        heights, widths, depths = layer_utils.get_output_dimensions(self.conv_input)
+        kernel = np.asarray(self.conv_input['config']['layers'][4]['kernel_values'])
+        matrix = layer_utils.get_kernel_matrix(self.conv_input, 4, heights, widths, depths)
+        #? Element (row 1, column 2, channel 3) is located at 1*3*5 + 2*5 + 3 in Keras and at 3*2*3 + 1*3 + 2 in the c-file
+        self.assertTrue(np.array_equal(matrix[3*2*3 + 1*3 + 2], kernel[1*3*5 + 2*5 + 3]))
+
+    def test_isQuantized_quantizedConvolutionInput_raisesValueError(self):
+        """Test case for is_quantized function with quantized dense layers in a model with convolution layers"""
+        self.conv_input['config']['layers'][4]['quantization'] = {'kernel_scale': [1.0], 'kernel_zero_point': [0]}
+        with self.assertRaises(ValueError):
+            layer_utils.is_quantized(self.conv_input)
+
+#? ############### INFO ###############
+#? This script has to be run with -m switch from parent directory in order to get the imports right
+#? Directory: Neural-Network-Translator (repository root directory)
+#? Command: python -m test.layer_utils_test
+
+if __name__ == '__main__':
+    #? Searching for all test cases in TestLayerUtils
+    test_loader = unittest.TestLoader()
+    test_names = test_loader.getTestCaseNames(TestLayerUtils)
+
+    #? Adding all found test cases
+    suite = unittest.TestSuite()
+    for test_name in test_names:
+        suite.addTest(TestLayerUtils(test_name))
+
+    #? Running the test suite
+    result = unittest.TextTestRunner().run(suite)
+    sys.exit(not result.wasSuccessful())
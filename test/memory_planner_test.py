@@ -0,0 +1,93 @@
+import unittest
+import sys
+import json
+import backend.gcc.memory_planner as memory_planner
+
+class TestMemoryPlanner(unittest.TestCase):
+    """Test class for the static memory planner of the GCC backend"""
+
+    #? Naming scheme for test classes: [test_MethodName_StateUnderTest_ExpectedBehavior]
+
+    dense_3layer_input = None
+    mnist_flatten_input = None
+    mnist_pool_input = None
+
+    def __init__(self, testname):
+        super(TestMemoryPlanner, self).__init__(testname)
+
+    def setUp(self):
+        """Preparation for test cases"""
+        self.dense_3layer_input = json.load(open('test/test_dense_3layer_input.json'))
+        self.mnist_flatten_input = json.load(open('test/test_mnist_flatten_input.json'))
+        self.mnist_pool_input = json.load(open('test/test_mnist_pool_input.json'))
+        return super().setUp()
+
+    def tearDown(self):
+        """Clean up after test cases"""
+        return super().tearDown()
+
+    def assertNoOverlappingBuffers(self, plan):
+        """Asserts that buffers which are live at the same time do not share memory"""
+        for buffer in plan.buffers:
+            for other in plan.buffers:
+                if (buffer is not other and buffer.overlaps(other)):
+                    self.assertTrue(buffer.offset + buffer.size <= other.offset or other.offset + other.size <= buffer.offset)
+
+    def test_planMemory_3DenseLayerInput_lowerBoundArenaSize(self):
+        """Test case for plan_memory function in 3 layer dense network"""
+        plan = memory_planner.plan_memory(self.dense_3layer_input)
+        self.assertNoOverlappingBuffers(plan)
+        self.assertTrue(plan.arena_size == plan.get_lower_bound())
+
+    def test_planMemory_flattenDropoutInput_noBuffersForAliasLayers(self):
+        """Test case for plan_memory function with flatten and dropout layers, which pass their input on to the next layer"""
+        plan = memory_planner.plan_memory(self.mnist_flatten_input)
+        #? The output of the first dense layer is read by the second dense layer through the dropout layer
+        self.assertTrue([buffer.name for buffer in plan.buffers] == ['output_1', 'output_3'] and plan.buffers[0].last_step == 3)
+        self.assertNoOverlappingBuffers(plan)
+
+    def test_planMemory_samePaddingInput_noPaddingBuffer(self):
+        """Test case for plan_memory function with a pooling layer with padding_same, which reads its input in place"""
+        self.mnist_pool_input['config']['layers'][0]['config']['padding'] = 'same'
+        self.mnist_pool_input['config']['layers'][0]['config']['pool_size'] = [3, 3]
+        plan = memory_planner.plan_memory(self.mnist_pool_input)
+        self.assertTrue(all(buffer.name.startswith('output_') for buffer in plan.buffers) and plan.buffers[0].size == 14*14)
+        self.assertNoOverlappingBuffers(plan)
+        self.assertTrue(plan.arena_size == plan.get_lower_bound())
+
+    def test_planMemory_im2colConvolutionInput_columnBuffersInArena(self):
+        """Test case for plan_memory function with convolution layers and the im2col variant"""
+        conv_input = json.load(open('test/test_conv_input.json'))
+        direct_plan = memory_planner.plan_memory(conv_input)
+        plan = memory_planner.plan_memory(conv_input, 'im2col')
+        column_buffers = [buffer for buffer in plan.buffers if buffer.name.startswith('columns_')]
+        #? The 72 output positions of the first convolution exceed a block, the 6 positions of the second do not
+        self.assertTrue([buffer.size for buffer in column_buffers] == [memory_planner.IM2COL_BLOCK * 27, 6 * 16]
+                        and plan.column_offsets[0] == column_buffers[0].offset and direct_plan.column_offsets == [0] * 5)
+        self.assertNoOverlappingBuffers(plan)
+        self.assertTrue(plan.arena_size == plan.get_lower_bound())
+
+    def test_assignOffsets_disjointLifetimes_sharedOffset(self):
+        """Test case for assign_offsets function with buffers which are never live at the same time"""
+        buffers = [memory_planner.Buffer('a', 10, 0, 1), memory_planner.Buffer('b', 4, 1, 2), memory_planner.Buffer('c', 8, 2, 3)]
+        memory_planner.assign_offsets(buffers)
+        self.assertTrue(buffers[0].offset == 0 and buffers[1].offset == 10 and buffers[2].offset == 0)
+
+#? ############### INFO ###############
+#? This script has to be run with -m switch from parent directory in order to get the imports right
+#? Directory: Neural-Network-Translator (repository root directory)
+#? Command: python -m test.memory_planner_test
+
+if __name__ == '__main__':
+    #? Searching for all test cases in TestMemoryPlanner
+    test_loader = unittest.TestLoader()
+    test_names = test_loader.getTestCaseNames(TestMemoryPlanner)
+
+    #? Adding all found test cases
+    suite = unittest.TestSuite()
+    for test_name in test_names:
+        suite.addTest(TestMemoryPlanner(test_name))
+
+    #? Running the test suite
+    result = unittest.TextTestRunner().run(suite)
+    sys.exit(not result.wasSuccessful())
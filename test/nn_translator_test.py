@@ -0,0 +1,114 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+import shutil
+import numpy as np
+import nn_translator
+import translation_cache
+
+class TestNNTranslator(unittest.TestCase):
+    """Test class for the command line translator and its batch mode"""
+
+    #? Naming scheme for test classes: [test_MethodName_StateUnderTest_ExpectedBehavior]
+
+    defaults = {'frontend': 'keras', 'backend': 'gcc', 'conversions': None, 'executable': None, 'weights': None,
+                'options': {'codegen': 'specialized'}, 'validate': 'structural'}
+
+    def __init__(self, testname):
+        super(TestNNTranslator, self).__init__(testname)
+
+    def setUp(self):
+        """Preparation for test cases"""
+        self.directory = tempfile.TemporaryDirectory()
+        return super().setUp()
+
+    def tearDown(self):
+        """Clean up after test cases"""
+        self.directory.cleanup()
+        return super().tearDown()
+
+    def test_getPluginOptions_keyValuePairs_correctDictionary(self):
+        """Test case for get_plugin_options function"""
+        self.assertTrue(nn_translator.get_plugin_options(['codegen=specialized', ' a = b=c ']) == {'codegen': 'specialized', 'a': 'b=c'})
+        self.assertTrue(nn_translator.get_plugin_options(None) == dict())
+
+    def test_getPluginOptions_optionWithoutValue_raisesValueError(self):
+        """Test case for get_plugin_options function with an option without value"""
+        with self.assertRaises(ValueError):
+            nn_translator.get_plugin_options(['codegen'])
+
+    def test_getManifestEntries_partialEntries_defaultsAndRelativePaths(self):
+        """Test case for get_manifest_entries function"""
+        filename = os.path.join(self.directory.name, 'manifest.json')
+        with open(filename, 'w') as file:
+            json.dump([{'input': 'a.h5'}, {'input': 'models/b.pt', 'frontend': 'pytorch', 'output': 'b_model', 'options': {'weight_alignment': '1'}}], file)
+        entries = nn_translator.get_manifest_entries(filename, self.defaults)
+        self.assertTrue(entries[0]['input'] == os.path.join(self.directory.name, 'a.h5') and entries[0]['output'] == 'a'
+                        and entries[0]['frontend'] == 'keras' and entries[0]['options'] == {'codegen': 'specialized'})
+        self.assertTrue(entries[1]['input'] == os.path.join(self.directory.name, 'models/b.pt') and entries[1]['output'] == 'b_model'
+                        and entries[1]['frontend'] == 'pytorch' and entries[1]['options'] == {'codegen': 'specialized', 'weight_alignment': '1'})
+
+    def test_getManifestEntries_entryWithoutInput_raisesValueError(self):
+        """Test case for get_manifest_entries function with an entry without input"""
+        filename = os.path.join(self.directory.name, 'manifest.json')
+        with open(filename, 'w') as file:
+            json.dump([{'output': 'a'}], file)
+        with self.assertRaises(ValueError):
+            nn_translator.get_manifest_entries(filename, self.defaults)
+
+    def test_getGlobEntries_matchingFiles_sortedEntries(self):
+        """Test case for get_glob_entries function"""
+        for name in ['b.h5', 'a.h5', 'c.txt']:
+            open(os.path.join(self.directory.name, name), 'w').close()
+        entries = nn_translator.get_glob_entries(os.path.join(self.directory.name, '*.h5'), self.defaults)
+        self.assertTrue([entry['output'] for entry in entries] == ['a', 'b'] and all(entry['backend'] == 'gcc' for entry in entries))
+
+    def test_translate_jsonBackend_floatKernelValuesKept(self):
+        """Test case for translate function with the json backend, which must not quantize the weights without the float2int conversion"""
+        intermediate = json.load(open('test/test_dense_2layer_input.json'))
+        input_file = os.path.join(self.directory.name, 'model.h5')
+        open(input_file, 'w').close()
+
+        #? The intermediate format is taken from the cache, so that the keras frontend is not required
+        cache = translation_cache.TranslationCache(os.path.join(self.directory.name, 'cache'))
+        intermediate_key, _ = nn_translator.get_cache_keys('keras', 'json', input_file, 'test_json_backend', None, None, dict(), 'structural', True)
+        cache.put_intermediate(intermediate_key, intermediate)
+        out_dir = nn_translator.backend_plugins.get_plugin('json').get_output_directory('test_json_backend')
+        try:
+            nn_translator.translate('keras', 'json', input_file, 'test_json_backend', verbose=False, cache=cache)
+            output = json.load(open(os.path.join(out_dir, 'test_json_backend.json')))
+        finally:
+            shutil.rmtree(out_dir, ignore_errors=True)
+        layers = output['config']['layers']
+        self.assertTrue(all('quantization' not in layer for layer in layers)
+                        and np.array_equal(np.array(layers[0]['kernel_values'], dtype=np.float32), np.array(intermediate['config']['layers'][0]['kernel_values'], dtype=np.float32)))
+
+    def test_translateBatch_failingEntries_allEntriesReported(self):
+        """Test case for translate_batch function, a failing entry must not abort the other translations"""
+        entries = [dict(self.defaults, input='missing.h5', output='missing', frontend='unknown'),
+                   dict(self.defaults, input='missing.h5', output='missing', backend='unknown')]
+        for jobs in [1, 2]:
+            reports = nn_translator.translate_batch(entries, jobs)
+            self.assertTrue(len(reports) == 2 and all(report['status'] == 'failed' for report in reports))
+            self.assertTrue(all(report['error'] == 'Selected frontend/backend is not available' for report in reports))
+
+#? ############### INFO ###############
+#? This script has to be run with -m switch from parent directory in order to get the imports right
+#? Directory: Neural-Network-Translator (repository root directory)
+#? Command: python -m test.nn_translator_test
+
+if __name__ == '__main__':
+    #? Searching for all test cases in TestNNTranslator
+    test_loader = unittest.TestLoader()
+    test_names = test_loader.getTestCaseNames(TestNNTranslator)
+
+    #? Adding all found test cases
+    suite = unittest.TestSuite()
+    for test_name in test_names:
+        suite.addTest(TestNNTranslator(test_name))
+
+    #? Running the test suite
+    result = unittest.TextTestRunner().run(suite)
+    sys.exit(not result.wasSuccessful())
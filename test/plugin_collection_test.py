@@ -0,0 +1,91 @@
+import unittest
+import sys
+import os
+from plugin_collection import PluginCollection, PluginInfo
+
+class TestPluginCollection(unittest.TestCase):
+    """Test class for the lazy plugin discovery of plugin_collection"""
+
+    #? Naming scheme for test classes: [test_MethodName_StateUnderTest_ExpectedBehavior]
+
+    def __init__(self, testname):
+        super(TestPluginCollection, self).__init__(testname)
+
+    def setUp(self):
+        """Preparation for test cases"""
+        return super().setUp()
+
+    def tearDown(self):
+        """Clean up after test cases"""
+        return super().tearDown()
+
+    def test_readFromSource_backendPluginWithLiteralArguments_correctMetadata(self):
+        """Test case for read_from_source function"""
+        source = ('from plugin_collection import BackendPlugin\n'
+                  'import some_heavy_framework\n'
+                  'class Test(BackendPlugin):\n'
+                  '    def __init__(self):\n'
+                  '        super().__init__("test", "Test Backend Plugin", ["float2int"])\n')
+        infos = PluginInfo.read_from_source(source, 'backend.test')
+        self.assertTrue(len(infos) == 1)
+        self.assertTrue(infos[0].identifier == 'test' and infos[0].description == 'Test Backend Plugin' and infos[0].prerequisites == ['float2int'])
+        self.assertTrue(infos[0].module_name == 'backend.test' and infos[0].class_name == 'Test')
+
+    def test_readFromSource_pluginWithComputedIdentifier_returnsNone(self):
+        """Test case for read_from_source function with metadata that can not be read without executing the module"""
+        source = ('from plugin_collection import FrontendPlugin\n'
+                  'class Test(FrontendPlugin):\n'
+                  '    def __init__(self):\n'
+                  '        super().__init__(get_identifier(), "Test Frontend Plugin")\n')
+        self.assertTrue(PluginInfo.read_from_source(source, 'frontend.test') is None)
+
+    def test_readFromSource_moduleWithoutPlugins_emptyList(self):
+        """Test case for read_from_source function with a module without plugin classes"""
+        source = ('class Helper(object):\n'
+                  '    def __init__(self):\n'
+                  '        super().__init__()\n')
+        self.assertTrue(PluginInfo.read_from_source(source, 'backend.helper') == [])
+
+    def test_init_frontendPackage_pluginModulesNotImported(self):
+        """Test case for the plugin discovery, which must not import the plugin modules"""
+        sys.modules.pop('frontend.pytorch', None)
+        plugins = PluginCollection('frontend')
+        self.assertTrue(sorted(plugin.identifier for plugin in plugins.plugins) == ['keras', 'pytorch'])
+        self.assertTrue('frontend.pytorch' not in sys.modules)
+
+    def test_getPlugin_backendInSubpackage_correctPluginInstance(self):
+        """Test case for get_plugin function"""
+        plugins = PluginCollection('backend')
+        plugin = plugins.get_plugin('json')
+        self.assertTrue(plugin.identifier == 'json' and plugin.prerequisites == [])
+        self.assertTrue(plugins.get_plugin('json') is plugin)
+
+    def test_getPluginSourcePaths_pluginInSubpackage_packageDirectory(self):
+        """Test case for get_plugin_source_paths function"""
+        self.assertTrue(PluginCollection('backend').get_plugin_source_paths('gcc') == [os.path.abspath(os.path.join('backend', 'gcc'))])
+        self.assertTrue(PluginCollection('frontend').get_plugin_source_paths('keras') == [os.path.abspath(os.path.join('frontend', 'keras.py'))])
+
+    def test_getPlugin_unknownIdentifier_raisesNotImplementedError(self):
+        """Test case for get_plugin function with an unknown identifier"""
+        plugins = PluginCollection('conversion')
+        with self.assertRaises(NotImplementedError):
+            plugins.get_plugin('unknown')
+
+#? ############### INFO ###############
+#? This script has to be run with -m switch from parent directory in order to get the imports right
+#? Directory: Neural-Network-Translator (repository root directory)
+#? Command: python -m test.plugin_collection_test
+
+if __name__ == '__main__':
+    #? Searching for all test cases in TestPluginCollection
+    test_loader = unittest.TestLoader()
+    test_names = test_loader.getTestCaseNames(TestPluginCollection)
+
+    #? Adding all found test cases
+    suite = unittest.TestSuite()
+    for test_name in test_names:
+        suite.addTest(TestPluginCollection(test_name))
+
+    #? Running the test suite
+    result = unittest.TextTestRunner().run(suite)
+    sys.exit(not result.wasSuccessful())
@@ -0,0 +1,85 @@
+import unittest
+import sys
+import json
+import numpy as np
+from conversion.pruning import Pruning
+from conversion.float2int import Float2Integer
+
+class TestPruningConversion(unittest.TestCase):
+    """Test class for pruning conversion"""
+
+    #? Naming scheme for test classes: [test_MethodName_StateUnderTest_ExpectedBehavior]
+
+    intermediate = None
+
+    def __init__(self, testname):
+        super(TestPruningConversion, self).__init__(testname)
+
+    def setUp(self):
+        """Preparation for test cases"""
+        self.intermediate = json.load(open('test/test_dense_2layer_input.json'))
+        return super().setUp()
+
+    def tearDown(self):
+        """Clean up after test cases"""
+        return super().tearDown()
+
+    def test_process_pruningSparsity_smallestValuesPruned(self):
+        """Test case for process function with 75% of the kernel values pruned"""
+        kernel = np.abs(np.array(self.intermediate['config']['layers'][0]['kernel_values']))
+        output = Pruning().process(self.intermediate, {'pruning_sparsity': '0.75'})
+        layer = output['config']['layers'][0]
+        pruned = np.array(layer['kernel_values'])
+        #? The first layer has 8x8 kernel values, of which 48 are pruned
+        self.assertTrue(np.count_nonzero(pruned) == 16 and layer['sparsity'] == {'format': 'csr', 'zero_fraction': 0.75} and
+                        np.abs(pruned[pruned != 0]).min() >= kernel[pruned == 0].max())
+
+    def test_process_noOptions_denseLayersUnchanged(self):
+        """Test case for process function with kernels without zero values"""
+        kernel_values = self.intermediate['config']['layers'][0]['kernel_values']
+        output = Pruning().process(self.intermediate)
+        self.assertTrue(all('sparsity' not in layer for layer in output['config']['layers']) and
+                        np.array_equal(output['config']['layers'][0]['kernel_values'], kernel_values))
+
+    def test_process_existingZeros_sparsityAboveThresholdOnly(self):
+        """Test case for process function with existing zero values and different sparsity thresholds"""
+        #? One of the eight input values of the first layer has only zero weights
+        self.intermediate['config']['layers'][0]['kernel_values'][0] = [0] * 8
+        output = Pruning().process(self.intermediate, {'sparsity_threshold': 0.1})
+        self.assertTrue('sparsity' in output['config']['layers'][0] and 'sparsity' not in output['config']['layers'][1])
+        output = Pruning().process(output, {'sparsity_threshold': 0.2})
+        self.assertTrue('sparsity' not in output['config']['layers'][0])
+
+    def test_process_invalidSparsity_raisesValueError(self):
+        """Test case for process function with a pruning sparsity outside of 0 to 1"""
+        with self.assertRaises(ValueError):
+            Pruning().process(self.intermediate, {'pruning_sparsity': '1.5'})
+        with self.assertRaises(ValueError):
+            Pruning().process(self.intermediate, {'sparsity_threshold': 'half'})
+
+    def test_process_quantizedLayers_valuesUnchanged(self):
+        """Test case for process function applied after the float2int conversion"""
+        output = Float2Integer().process(self.intermediate)
+        kernel_values = output['config']['layers'][0]['kernel_values']
+        output = Pruning().process(output, {'pruning_sparsity': 0.9})
+        self.assertTrue(np.array_equal(output['config']['layers'][0]['kernel_values'], kernel_values) and
+                        'sparsity' not in output['config']['layers'][0])
+
+#? ############### INFO ###############
+#? This script has to be run with -m switch from parent directory in order to get the imports right
+#? Directory: Neural-Network-Translator (repository root directory)
+#? Command: python -m test.pruning_conversion_test
+
+if __name__ == '__main__':
+    #? Searching for all test cases in TestPruningConversion
+    test_loader = unittest.TestLoader()
+    test_names = test_loader.getTestCaseNames(TestPruningConversion)
+
+    #? Adding all found test cases
+    suite = unittest.TestSuite()
+    for test_name in test_names:
+        suite.addTest(TestPruningConversion(test_name))
+
+    #? Running the test suite
+    result = unittest.TextTestRunner().run(suite)
+    sys.exit(not result.wasSuccessful())
@@ -0,0 +1,142 @@
+import unittest
+import sys
+import json
+import numpy as np
+import reference_executor
+from conversion.float2int import Float2Integer
+
+class TestReferenceExecutor(unittest.TestCase):
+    """Test class for the NumPy reference executor of the intermediate format"""
+
+    #? Naming scheme for test classes: [test_MethodName_StateUnderTest_ExpectedBehavior]
+
+    def __init__(self, testname):
+        super(TestReferenceExecutor, self).__init__(testname)
+
+    def setUp(self):
+        """Preparation for test cases"""
+        self.random = np.random.default_rng(0)
+        return super().setUp()
+
+    def tearDown(self):
+        """Clean up after test cases"""
+        return super().tearDown()
+
+    def get_pooling_model(self, class_name, pool_size, strides, padding):
+        """Returns a model in intermediate format with a single pooling layer for a 4x4x1 input"""
+        return {'class_name': 'Sequential', 'config': {'name': 'sequential', 'layers': [
+            {'class_name': class_name, 'config': {'batch_input_shape': [None, 4, 4, 1], 'pool_size': pool_size, 'strides': strides, 'padding': padding}}]}}
+
+    def test_predict_denseLayerInput_matchesMatrixProduct(self):
+        """Test case for predict function with dense layers"""
+        model = json.load(open('test/test_dense_2layer_input.json'))
+        inputs = self.random.normal(size=(5, 8))
+        expected = inputs
+        for layer in model['config']['layers']:
+            expected = expected @ np.asarray(layer['kernel_values']) + np.asarray(layer['bias_values'])
+            if (layer['config']['activation'] == 'relu'):
+                expected = np.maximum(expected, 0)
+            elif (layer['config']['activation'] == 'sigmoid'):
+                expected = 1 / (1 + np.exp(-expected))
+        self.assertTrue(np.allclose(reference_executor.predict(model, inputs), expected, atol=1e-5))
+
+    def test_predict_batchInput_sameAsSingleSamples(self):
+        """Test case for predict function with a batch of samples"""
+        executor = reference_executor.ReferenceExecutor(json.load(open('test/test_mnist_pool_input.json')))
+        inputs = self.random.random((4, executor.get_input_size())).astype(np.float32)
+        outputs = executor.predict(inputs)
+        self.assertTrue(outputs.shape == (4, executor.get_output_size()) and outputs.dtype == np.float32)
+        self.assertTrue(all(np.allclose(executor.predict(inputs[index])[0], outputs[index], rtol=1e-5, atol=1e-7) for index in range(4)))
+
+    def test_predict_maxPoolingSamePadding_borderWindowsClamped(self):
+        """Test case for predict function with max pooling and same padding, the padding does not take part in the maximum"""
+        outputs = reference_executor.predict(self.get_pooling_model('MaxPooling2D', [3, 3], [1, 1], 'same'), -np.ones(16))
+        self.assertTrue(np.array_equal(outputs[0], -np.ones(16)))
+
+    def test_predict_avgPoolingSamePadding_dividedByInputValuesInWindow(self):
+        """Test case for predict function with average pooling and same padding, border windows are divided by their number of input values"""
+        outputs = reference_executor.predict(self.get_pooling_model('AveragePooling2D', [3, 3], [1, 1], 'same'), np.ones(16))
+        self.assertTrue(np.array_equal(outputs[0], np.ones(16)))
+
+    def test_predict_maxPoolingSamePaddingEvenPoolSize_paddedAfterInput(self):
+        """Test case for predict function with max pooling, same padding and an even pool size, the padding is added after the input like in Keras"""
+        outputs = reference_executor.predict(self.get_pooling_model('MaxPooling2D', [2, 2], [1, 1], 'same'), np.arange(16))
+        self.assertTrue(np.array_equal(outputs[0], [5, 6, 7, 7, 9, 10, 11, 11, 13, 14, 15, 15, 13, 14, 15, 15]))
+
+    def test_predict_maxPoolingSamePaddingWithStride_windowsAlignedLikeKeras(self):
+        """Test case for predict function with max pooling, same padding and a stride of 2 on an even input, the first window starts at the input"""
+        outputs = reference_executor.predict(self.get_pooling_model('MaxPooling2D', [3, 3], [2, 2], 'same'), np.arange(16))
+        self.assertTrue(np.array_equal(outputs[0], [10, 11, 14, 15]))
+
+    def test_predict_avgPoolingValidPadding_meanOfWindows(self):
+        """Test case for predict function with average pooling"""
+        outputs = reference_executor.predict(self.get_pooling_model('AveragePooling2D', [2, 2], [2, 2], 'valid'), np.arange(16))
+        self.assertTrue(np.array_equal(outputs[0], [2.5, 4.5, 10.5, 12.5]))
+
+    def test_predict_convolutionLayer_matchesSlidingDotProducts(self):
+        """Test case for predict function with a convolution layer with padding same, stride and dilation rate"""
+        kernel = self.random.normal(size=(2, 3, 2, 3)).astype(np.float32)
+        model = {'class_name': 'Sequential', 'config': {'name': 'sequential', 'layers': [
+            {'class_name': 'Conv2D', 'config': {'batch_input_shape': [None, 5, 6, 2], 'filters': 3, 'kernel_size': [2, 3], 'strides': [2, 1], 'padding': 'same',
+                                                'dilation_rate': [1, 2], 'activation': 'linear', 'use_bias': False}, 'kernel_values': kernel}]}}
+        inputs = self.random.normal(size=(2, 5, 6))
+        outputs = reference_executor.predict(model, inputs.reshape(-1)).reshape(3, 3, 6)
+
+        #? The output has 3x6 positions, the padding is 0 rows above and 2 columns left of the input
+        padded = np.pad(inputs, ((0, 0), (0, 1), (2, 2)))
+        expected = np.zeros((3, 3, 6))
+        for row in range(3):
+            for column in range(6):
+                expected[:, row, column] = np.einsum('dij,ijdf->f', padded[:, 2*row:2*row + 2, column:column + 5:2], kernel)
+        self.assertTrue(np.allclose(outputs, expected, atol=1e-5))
+
+    def test_predict_softmaxActivation_outputsSumToOne(self):
+        """Test case for predict function with a softmax activation, large values must not overflow"""
+        model = json.load(open('test/test_dense_2layer_input.json'))
+        model['config']['layers'][-1]['config']['activation'] = 'softmax'
+        outputs = reference_executor.predict(model, self.random.normal(size=(3, 8)) * 1000)
+        self.assertTrue(np.all(np.isfinite(outputs)) and np.allclose(np.sum(outputs, axis=1), 1))
+
+    def test_predict_quantizedModel_closeToFloatModel(self):
+        """Test case for predict function with int8 weights"""
+        model = json.load(open('test/test_dense_3layer_input.json'))
+        inputs = self.random.normal(size=(5, reference_executor.ReferenceExecutor(model).get_input_size()))
+        expected = reference_executor.predict(model, inputs)
+        outputs = reference_executor.predict(Float2Integer().process(model), inputs)
+        self.assertTrue(np.allclose(outputs, expected, atol=0.05))
+
+    def test_predict_quantizedModelLargeBias_closeToFloatModel(self):
+        """Test case for predict function with int8 weights and biases of different magnitudes, which are not quantized"""
+        model = json.load(open('test/test_dense_2layer_input.json'))
+        model['config']['layers'][-1]['config']['activation'] = 'linear'
+        for layer in model['config']['layers']:
+            layer['bias_values'] = (np.asarray(layer['bias_values']) * 0.01).tolist()
+        model['config']['layers'][-1]['bias_values'][0] = 100.0
+        inputs = self.random.normal(size=(5, 8))
+        expected = reference_executor.predict(model, inputs)
+        outputs = reference_executor.predict(Float2Integer().process(model), inputs)
+        self.assertTrue(np.allclose(outputs, expected, atol=0.05))
+
+    def test_predict_wrongInputSize_raisesValueError(self):
+        """Test case for predict function with inputs of the wrong size"""
+        with self.assertRaises(ValueError):
+            reference_executor.predict(json.load(open('test/test_dense_2layer_input.json')), np.zeros((2, 7)))
+
+#? ############### INFO ###############
+#? This script has to be run with -m switch from parent directory in order to get the imports right
+#? Directory: Neural-Network-Translator (repository root directory)
+#? Command: python -m test.reference_executor_test
+
+if __name__ == '__main__':
+    #? Searching for all test cases in TestReferenceExecutor
+    test_loader = unittest.TestLoader()
+    test_names = test_loader.getTestCaseNames(TestReferenceExecutor)
+
+    #? Adding all found test cases
+    suite = unittest.TestSuite()
+    for test_name in test_names:
+        suite.addTest(TestReferenceExecutor(test_name))
+
+    #? Running the test suite
+    result = unittest.TextTestRunner().run(suite)
+    sys.exit(not result.wasSuccessful())
@@ -0,0 +1,102 @@
+import unittest
+import sys
+import json
+import numpy as np
+from jsonschema import ValidationError
+import schema_validation
+
+class TestSchemaValidation(unittest.TestCase):
+    """Test class for the validation of the intermediate format"""
+
+    #? Naming scheme for test classes: [test_MethodName_StateUnderTest_ExpectedBehavior]
+
+    intermediate = None
+
+    def __init__(self, testname):
+        super(TestSchemaValidation, self).__init__(testname)
+
+    def setUp(self):
+        """Preparation for test cases"""
+        self.intermediate = json.load(open('test/test_dense_2layer_input.json'))
+        return super().setUp()
+
+    def tearDown(self):
+        """Clean up after test cases"""
+        return super().tearDown()
+
+    def test_validateIntermediate_listWeightsAllModes_noError(self):
+        """Test case for validate_intermediate function with weights held as lists"""
+        for mode in schema_validation.VALIDATION_MODES:
+            schema_validation.validate_intermediate(self.intermediate, mode)
+
+    def test_validateIntermediate_numpyWeightsAllModes_noError(self):
+        """Test case for validate_intermediate function with weights held as numpy arrays"""
+        for layer in self.intermediate['config']['layers']:
+            layer['kernel_values'] = np.asarray(layer['kernel_values'], dtype=np.float32)
+            layer['bias_values'] = np.asarray(layer['bias_values'], dtype=np.float32)
+        for mode in schema_validation.VALIDATION_MODES:
+            schema_validation.validate_intermediate(self.intermediate, mode)
+        self.assertTrue(isinstance(self.intermediate['config']['layers'][0]['kernel_values'], np.ndarray))
+
+    def test_validateIntermediate_convolutionKernelListsAllModes_noError(self):
+        """Test case for validate_intermediate function with four-dimensional kernels of convolution layers"""
+        intermediate = json.load(open('test/test_conv_input.json'))
+        for mode in schema_validation.VALIDATION_MODES:
+            schema_validation.validate_intermediate(intermediate, mode)
+
+    def test_validateIntermediate_biasesNotMatchingKernel_raisesValidationError(self):
+        """Test case for validate_intermediate function with more biases than units"""
+        self.intermediate['config']['layers'][0]['bias_values'] = np.zeros(9, dtype=np.float32)
+        with self.assertRaises(ValidationError):
+            schema_validation.validate_intermediate(self.intermediate, 'structural')
+
+    def test_validateIntermediate_unsupportedDtype_raisesValidationError(self):
+        """Test case for validate_intermediate function with boolean weights"""
+        self.intermediate['config']['layers'][0]['kernel_values'] = np.ones((8, 8), dtype=bool)
+        with self.assertRaises(ValidationError):
+            schema_validation.validate_intermediate(self.intermediate, 'structural')
+
+    def test_validateIntermediate_raggedWeightLists_raisesValidationError(self):
+        """Test case for validate_intermediate function with rows of different lengths"""
+        self.intermediate['config']['layers'][0]['kernel_values'][0].append(1.0)
+        with self.assertRaises(ValidationError):
+            schema_validation.validate_intermediate(self.intermediate, 'structural')
+
+    def test_validateIntermediate_invalidLayerConfig_raisesValidationError(self):
+        """Test case for validate_intermediate function with a layer config that does not match the schema"""
+        self.intermediate['config']['layers'][0]['config']['activation'] = 3
+        with self.assertRaises(ValidationError):
+            schema_validation.validate_intermediate(self.intermediate, 'structural')
+
+    def test_validateIntermediate_invalidLayerConfigModeOff_noError(self):
+        """Test case for validate_intermediate function with disabled validation"""
+        self.intermediate['config']['layers'][0]['config']['activation'] = 3
+        schema_validation.validate_intermediate(self.intermediate, 'off')
+
+    def test_validateIntermediate_unknownMode_raisesValueError(self):
+        """Test case for validate_intermediate function with an unknown validation mode"""
+        with self.assertRaises(ValueError):
+            schema_validation.validate_intermediate(self.intermediate, 'partial')
+
+    def test_getValidator_calledTwice_sameCompiledValidator(self):
+        """Test case for get_validator function"""
+        self.assertTrue(schema_validation.get_validator() is schema_validation.get_validator())
+
+#? ############### INFO ###############
+#? This script has to be run with -m switch from parent directory in order to get the imports right
+#? Directory: Neural-Network-Translator (repository root directory)
+#? Command: python -m test.schema_validation_test
+
+if __name__ == '__main__':
+    #? Searching for all test cases in TestSchemaValidation
+    test_loader = unittest.TestLoader()
+    test_names = test_loader.getTestCaseNames(TestSchemaValidation)
+
+    #? Adding all found test cases
+    suite = unittest.TestSuite()
+    for test_name in test_names:
+        suite.addTest(TestSchemaValidation(test_name))
+
+    #? Running the test suite
+    result = unittest.TextTestRunner().run(suite)
+    sys.exit(not result.wasSuccessful())
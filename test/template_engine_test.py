@@ -0,0 +1,65 @@
+import unittest
+import sys
+import os
+import tempfile
+import backend.gcc.template_engine as template_engine
+
+class TestTemplateEngine(unittest.TestCase):
+    """Test class for the template engine of the GCC backend"""
+
+    #? Naming scheme for test classes: [test_MethodName_StateUnderTest_ExpectedBehavior]
+
+    def __init__(self, testname):
+        super(TestTemplateEngine, self).__init__(testname)
+
+    def setUp(self):
+        """Preparation for test cases"""
+        return super().setUp()
+
+    def tearDown(self):
+        """Clean up after test cases"""
+        return super().tearDown()
+
+    def test_renderToString_templateWithMultipleSameMarkers_correctReplacedMarkers(self):
+        """Test case for render_to_string function"""
+        template = template_engine.Template('abc ###marker### def ###marker### ###other###')
+        self.assertTrue(template.render_to_string({'###marker###': 'hij', '###other###': 1}) == 'abc hij def hij 1')
+
+    def test_render_markerWithoutValue_raisesValueError(self):
+        """Test case for render function with a marker that has no value"""
+        template = template_engine.Template('abc ###marker### def ###missing###')
+        with self.assertRaises(ValueError):
+            template.render_to_string({'###marker###': 'hij'})
+
+    def test_getUnusedMarkers_markerNotInTemplates_unusedMarkerReported(self):
+        """Test case for get_unused_markers function"""
+        templates = [template_engine.Template('###first###'), template_engine.Template('###second###')]
+        markers = {'###first###': 1, '###second###': 2, '###third###': 3}
+        self.assertTrue(template_engine.get_unused_markers(markers, templates) == ['###third###'])
+
+    def test_loadTemplate_unmodifiedFile_cachedTemplate(self):
+        """Test case for load_template function"""
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'template')
+            with open(filename, 'w') as file:
+                file.write('abc ###marker###')
+            self.assertTrue(template_engine.load_template(filename) is template_engine.load_template(filename))
+
+#? ############### INFO ###############
+#? This script has to be run with -m switch from parent directory in order to get the imports right
+#? Directory: Neural-Network-Translator (repository root directory)
+#? Command: python -m test.template_engine_test
+
+if __name__ == '__main__':
+    #? Searching for all test cases in TestTemplateEngine
+    test_loader = unittest.TestLoader()
+    test_names = test_loader.getTestCaseNames(TestTemplateEngine)
+
+    #? Adding all found test cases
+    suite = unittest.TestSuite()
+    for test_name in test_names:
+        suite.addTest(TestTemplateEngine(test_name))
+
+    #? Running the test suite
+    result = unittest.TextTestRunner().run(suite)
+    sys.exit(not result.wasSuccessful())
@@ -0,0 +1,140 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+import numpy as np
+import translation_cache
+
+class TestTranslationCache(unittest.TestCase):
+    """Test class for the content-addressed translation cache"""
+
+    #? Naming scheme for test classes: [test_MethodName_StateUnderTest_ExpectedBehavior]
+
+    intermediate = None
+
+    def __init__(self, testname):
+        super(TestTranslationCache, self).__init__(testname)
+
+    def setUp(self):
+        """Preparation for test cases"""
+        self.intermediate = json.load(open('test/test_dense_2layer_input.json'))
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = translation_cache.TranslationCache(os.path.join(self.directory.name, 'cache'))
+        return super().setUp()
+
+    def tearDown(self):
+        """Clean up after test cases"""
+        self.directory.cleanup()
+        return super().tearDown()
+
+    def write_file(self, filename, content):
+        """Writes the given content to the given file in the temporary directory and returns its path"""
+        path = os.path.join(self.directory.name, filename)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as file:
+            file.write(content)
+        return path
+
+    def test_getKey_differentParts_differentKeys(self):
+        """Test case for get_key function"""
+        self.assertTrue(translation_cache.get_key('a', {'x': 1, 'y': 2}) == translation_cache.get_key('a', {'y': 2, 'x': 1}))
+        self.assertTrue(translation_cache.get_key('a', ['float2int']) != translation_cache.get_key('a', []))
+
+    def test_getSourceHash_modifiedTemplate_differentHash(self):
+        """Test case for get_source_hash function with a modified file in a plugin directory"""
+        self.write_file('plugin/plugin.py', 'code')
+        self.write_file('plugin/model.c-template', 'template')
+        source_hash = translation_cache.get_source_hash([os.path.join(self.directory.name, 'plugin')])
+        self.write_file('plugin/model.c-template', 'modified template')
+        self.assertTrue(translation_cache.get_source_hash([os.path.join(self.directory.name, 'plugin')]) != source_hash)
+
+    def test_getIntermediate_storedNumpyWeights_sameValuesAndDtypes(self):
+        """Test case for get_intermediate function after put_intermediate"""
+        layer = self.intermediate['config']['layers'][0]
+        layer['kernel_values'] = np.asarray(layer['kernel_values'], dtype=np.float64)
+        layer['bias_values'] = np.asarray(layer['bias_values'], dtype=np.float32)
+        self.cache.put_intermediate('key', self.intermediate)
+        output = self.cache.get_intermediate('key')
+        self.assertTrue(np.array_equal(output['config']['layers'][0]['kernel_values'], layer['kernel_values'])
+                        and output['config']['layers'][0]['kernel_values'].dtype == np.float64
+                        and output['config']['layers'][0]['bias_values'].dtype == np.float32)
+        self.assertTrue(output['config']['layers'][1]['config'] == self.intermediate['config']['layers'][1]['config'])
+
+    def test_getIntermediate_missingEntry_returnsNone(self):
+        """Test case for get_intermediate function without entry"""
+        self.assertTrue(self.cache.get_intermediate('key') is None)
+
+    def test_getOutputs_storedOutputs_onlyModifiedFilesRestored(self):
+        """Test case for get_outputs function after put_outputs"""
+        out_dir = os.path.join(self.directory.name, 'out')
+        self.write_file('out/old.c', 'old')
+        state = translation_cache.get_directory_state(out_dir)
+        self.write_file('out/nn_model.c', 'model')
+        self.write_file('out/include/nn_model.h', 'header')
+        self.cache.put_outputs('key', out_dir, state)
+
+        restored_dir = os.path.join(self.directory.name, 'restored')
+        self.assertTrue(self.cache.get_outputs('key', restored_dir))
+        self.assertTrue(sorted(translation_cache.get_directory_state(restored_dir)) == sorted(['nn_model.c', os.path.join('include', 'nn_model.h')]))
+        self.assertTrue(not self.cache.get_outputs('other', restored_dir))
+
+    def test_getOutputs_existingOutputDirectory_filesOverwritten(self):
+        """Test case for get_outputs function with an output directory which already contains generated files"""
+        out_dir = os.path.join(self.directory.name, 'out')
+        self.write_file('out/include/nn_model.h', 'header')
+        self.cache.put_outputs('key', out_dir, dict())
+        self.write_file('restored/include/nn_model.h', 'stale')
+        self.write_file('restored/main.c', 'main')
+
+        restored_dir = os.path.join(self.directory.name, 'restored')
+        self.assertTrue(self.cache.get_outputs('key', restored_dir))
+        with open(os.path.join(restored_dir, 'include', 'nn_model.h'), 'r') as file:
+            self.assertTrue(file.read() == 'header' and os.path.isfile(os.path.join(restored_dir, 'main.c')))
+
+    def test_getOutputs_unwritableOutputDirectory_cacheMiss(self):
+        """Test case for get_outputs function with an output directory which is a file"""
+        out_dir = os.path.join(self.directory.name, 'out')
+        self.write_file('out/nn_model.c', 'model')
+        self.cache.put_outputs('key', out_dir, dict())
+        self.assertTrue(not self.cache.get_outputs('key', self.write_file('restored', 'file')))
+
+    def test_getSummary_storedOutputsWithSummary_summaryRestored(self):
+        """Test case for get_summary function after put_outputs with the summary returned by the backend"""
+        out_dir = os.path.join(self.directory.name, 'out')
+        self.write_file('out/nn_model.c', 'model')
+        self.cache.put_outputs('key', out_dir, dict(), {'Peak RAM of predict (bytes)': 36})
+        self.cache.put_outputs('other', out_dir, dict())
+        self.assertTrue(self.cache.get_summary('key') == {'Peak RAM of predict (bytes)': 36} and self.cache.get_summary('other') is None)
+
+    def test_evict_cacheExceedsSize_leastRecentlyUsedEntriesRemoved(self):
+        """Test case for evict function"""
+        self.cache.max_size = 2000
+        out_dir = os.path.join(self.directory.name, 'out')
+        self.write_file('out/nn_model.c', 'x' * 900)
+        for index, key in enumerate(['a', 'b']):
+            self.cache.put_outputs(key, out_dir, dict())
+            os.utime(self.cache.get_entry_directory(key), (index, index))
+        #? Using entry a makes entry b the least recently used entry
+        self.cache.get_outputs('a', os.path.join(self.directory.name, 'restored'))
+        self.cache.put_outputs('c', out_dir, dict())
+        self.assertTrue(sorted(os.listdir(self.cache.directory)) == ['a', 'c'])
+
+#? ############### INFO ###############
+#? This script has to be run with -m switch from parent directory in order to get the imports right
+#? Directory: Neural-Network-Translator (repository root directory)
+#? Command: python -m test.translation_cache_test
+
+if __name__ == '__main__':
+    #? Searching for all test cases in TestTranslationCache
+    test_loader = unittest.TestLoader()
+    test_names = test_loader.getTestCaseNames(TestTranslationCache)
+
+    #? Adding all found test cases
+    suite = unittest.TestSuite()
+    for test_name in test_names:
+        suite.addTest(TestTranslationCache(test_name))
+
+    #? Running the test suite
+    result = unittest.TextTestRunner().run(suite)
+    sys.exit(not result.wasSuccessful())
@@ -0,0 +1,76 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+import numpy as np
+import weight_storage
+
+class TestWeightStorage(unittest.TestCase):
+    """Test class for weight sidecar files"""
+
+    #? Naming scheme for test classes: [test_MethodName_StateUnderTest_ExpectedBehavior]
+
+    intermediate = None
+
+    def __init__(self, testname):
+        super(TestWeightStorage, self).__init__(testname)
+
+    def setUp(self):
+        """Preparation for test cases"""
+        self.intermediate = json.load(open('test/test_dense_2layer_input.json'))
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, 'model.weights')
+        return super().setUp()
+
+    def tearDown(self):
+        """Clean up after test cases"""
+        self.directory.cleanup()
+        return super().tearDown()
+
+    def test_saveWeights_denseLayerInput_alignedReferences(self):
+        """Test case for save_weights function"""
+        output = weight_storage.save_weights(self.intermediate, self.filename)
+        references = [layer[key] for layer in output['config']['layers'] for key in weight_storage.WEIGHT_KEYS if key in layer]
+        self.assertTrue(len(references) == 4 and all(weight_storage.is_reference(reference) for reference in references) and
+                        all(reference['offset'] % weight_storage.SIDECAR_ALIGNMENT == 0 for reference in references) and
+                        references[0]['shape'] == [8, 8] and references[0]['dtype'] == 'float32' and
+                        isinstance(self.intermediate['config']['layers'][0]['kernel_values'], list))
+
+    def test_loadWeights_savedWeights_memoryMappedArraysWithEqualValues(self):
+        """Test case for load_weights function"""
+        output = weight_storage.load_weights(weight_storage.save_weights(self.intermediate, self.filename), self.directory.name)
+        kernel_values = output['config']['layers'][0]['kernel_values']
+        self.assertTrue(isinstance(kernel_values, np.memmap) and
+                        np.allclose(kernel_values, self.intermediate['config']['layers'][0]['kernel_values']))
+
+    def test_getArray_unloadedReference_raisesValueError(self):
+        """Test case for get_array function with a reference which has not been loaded"""
+        output = weight_storage.save_weights(self.intermediate, self.filename)
+        with self.assertRaises(ValueError):
+            weight_storage.get_array(output['config']['layers'][0]['kernel_values'])
+
+    def test_jsonDefault_numpyWeights_jsonLists(self):
+        """Test case for json_default function"""
+        self.intermediate['config']['layers'][0]['bias_values'] = np.asarray(self.intermediate['config']['layers'][0]['bias_values'])
+        output = json.loads(json.dumps(self.intermediate, default=weight_storage.json_default))
+        self.assertTrue(output['config']['layers'][0]['bias_values'] == self.intermediate['config']['layers'][0]['bias_values'].tolist())
+
+#? ############### INFO ###############
+#? This script has to be run with -m switch from parent directory in order to get the imports right
+#? Directory: Neural-Network-Translator (repository root directory)
+#? Command: python -m test.weight_storage_test
+
+if __name__ == '__main__':
+    #? Searching for all test cases in TestWeightStorage
+    test_loader = unittest.TestLoader()
+    test_names = test_loader.getTestCaseNames(TestWeightStorage)
+
+    #? Adding all found test cases
+    suite = unittest.TestSuite()
+    for test_name in test_names:
+        suite.addTest(TestWeightStorage(test_name))
+
+    #? Running the test suite
+    result = unittest.TextTestRunner().run(suite)
+    sys.exit(not result.wasSuccessful())
@@ -0,0 +1,192 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import weight_storage
+
+#? Version of the layout of the cache entries, changing it invalidates all existing entries
+CACHE_VERSION = 1
+
+#? Default location and size limit of the cache, the location can be changed with the NNT_CACHE_DIR environment variable
+DEFAULT_CACHE_DIRECTORY = os.environ.get('NNT_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'nn_translator'))
+DEFAULT_CACHE_SIZE = 1024 * 1024 * 1024
+
+#? Names of the files and directories inside a cache entry
+INTERMEDIATE_FILE_NAME = 'intermediate.json'
+INTERMEDIATE_WEIGHTS_FILE_NAME = 'intermediate.weights'
+OUTPUTS_DIRECTORY_NAME = 'outputs'
+SUMMARY_FILE_NAME = 'summary.json'
+
+#? Hashes of files by path, together with the modification time and size of the file when it was hashed
+file_hash_cache = dict()
+
+def get_file_hash(filename):
+    """Returns the sha256 hex digest of the content of the given file, the file is hashed again only if it was modified"""
+    status = os.stat(filename)
+    cached = file_hash_cache.get(filename)
+    if (cached is None or cached[0] != (status.st_mtime_ns, status.st_size)):
+        digest = hashlib.sha256()
+        with open(filename, 'rb') as file:
+            for chunk in iter(lambda: file.read(1024 * 1024), b''):
+                digest.update(chunk)
+        cached = ((status.st_mtime_ns, status.st_size), digest.hexdigest())
+        file_hash_cache[filename] = cached
+    return cached[1]
+
+def get_source_hash(paths):
+    """Returns a hash of the content of the given files and of all files in the given directories, e.g. the source and templates of a plugin"""
+    digest = hashlib.sha256()
+    for path in paths:
+        filenames = [path]
+        if (os.path.isdir(path)):
+            filenames = []
+            for directory, subdirectories, names in os.walk(path):
+                #? Compiled python files do not change the behaviour of a plugin
+                subdirectories[:] = sorted(name for name in subdirectories if name != '__pycache__')
+                filenames.extend(os.path.join(directory, name) for name in sorted(names) if not name.endswith('.pyc'))
+        for filename in filenames:
+            digest.update(os.path.relpath(filename, path).encode('utf-8'))
+            digest.update(get_file_hash(filename).encode('ascii'))
+    return digest.hexdigest()
+
+def get_key(*parts):
+    """Returns the cache key of the given json serializable parts"""
+    return hashlib.sha256(json.dumps([CACHE_VERSION] + list(parts), sort_keys=True).encode('utf-8')).hexdigest()
+
+def get_directory_size(directory):
+    """Returns the total size in bytes of all files in the given directory"""
+    size = 0
+    for path, _, names in os.walk(directory):
+        for name in names:
+            size = size + os.path.getsize(os.path.join(path, name))
+    return size
+
+def get_directory_state(directory):
+    """Returns a dict with the modification time and size of each file in the given directory by its path relative to the directory"""
+    state = dict()
+    for path, _, names in os.walk(directory):
+        for name in names:
+            filename = os.path.join(path, name)
+            status = os.stat(filename)
+            state[os.path.relpath(filename, directory)] = (status.st_mtime_ns, status.st_size)
+    return state
+
+def copy_directory(source, destination):
+    """Copies the files of the given source directory into the given destination directory, existing files are overwritten.
+       Raises an OSError if the source directory does not exist. shutil.copytree only merges into existing directories from Python 3.8"""
+    def raise_error(error):
+        raise error
+
+    for path, _, names in os.walk(source, onerror=raise_error):
+        target_path = os.path.join(destination, os.path.relpath(path, source))
+        os.makedirs(target_path, exist_ok=True)
+        for name in names:
+            shutil.copy2(os.path.join(path, name), os.path.join(target_path, name))
+
+class TranslationCache(object):
+    """Content-addressed on-disk cache of intermediate formats and generated backend outputs.
+       Each entry is a directory named by its key, the least recently used entries are evicted when the cache exceeds its size limit"""
+
+    def __init__(self, directory=DEFAULT_CACHE_DIRECTORY, max_size=DEFAULT_CACHE_SIZE):
+        self.directory = directory
+        self.max_size = max_size
+
+    def get_entry_directory(self, key):
+        """Returns the directory of the entry with the given key"""
+        return os.path.join(self.directory, key)
+
+    def touch(self, key):
+        """Marks the entry with the given key as most recently used"""
+        os.utime(self.get_entry_directory(key))
+
+    def put(self, key, write_entry):
+        """Adds an entry with the given key, write_entry is called with a temporary directory to write the content of the entry to.
+           The entry is moved to its final location only when it is complete, so that concurrent translations never see partial entries"""
+        os.makedirs(self.directory, exist_ok=True)
+        temporary_directory = tempfile.mkdtemp(prefix='.tmp-', dir=self.directory)
+        try:
+            write_entry(temporary_directory)
+            os.rename(temporary_directory, self.get_entry_directory(key))
+        except OSError:
+            #? The entry was added by a concurrent translation in the meantime
+            shutil.rmtree(temporary_directory, ignore_errors=True)
+        except BaseException:
+            shutil.rmtree(temporary_directory, ignore_errors=True)
+            raise
+        self.evict()
+
+    def get_intermediate(self, key):
+        """Returns the intermediate format stored with the given key with memory-mapped weights, or None if there is no such entry"""
+        entry_directory = self.get_entry_directory(key)
+        try:
+            with open(os.path.join(entry_directory, INTERMEDIATE_FILE_NAME), 'r') as file:
+                intermediate = json.load(file)
+            intermediate = weight_storage.load_weights(intermediate, entry_directory)
+            self.touch(key)
+        except (OSError, ValueError):
+            return None
+        return intermediate
+
+    def put_intermediate(self, key, intermediate):
+        """Stores the given intermediate format with the given key, the weights are stored in a sidecar file with their dtype"""
+        def write_entry(entry_directory):
+            output = weight_storage.save_weights(intermediate, os.path.join(entry_directory, INTERMEDIATE_WEIGHTS_FILE_NAME), dtype=None)
+            with open(os.path.join(entry_directory, INTERMEDIATE_FILE_NAME), 'w') as file:
+                json.dump(output, file, default=weight_storage.json_default)
+        self.put(key, write_entry)
+
+    def get_outputs(self, key, out_dir):
+        """Copies the generated files stored with the given key to the given output directory, returns whether there was such an entry"""
+        outputs_directory = os.path.join(self.get_entry_directory(key), OUTPUTS_DIRECTORY_NAME)
+        try:
+            copy_directory(outputs_directory, out_dir)
+            self.touch(key)
+        except Exception:
+            #? Any failure to restore the entry is a cache miss, the translation then regenerates and overwrites the files
+            return False
+        return True
+
+    def get_summary(self, key):
+        """Returns the summary of the generated code stored with the given key, or None if there is no summary"""
+        try:
+            with open(os.path.join(self.get_entry_directory(key), SUMMARY_FILE_NAME), 'r') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def put_outputs(self, key, out_dir, previous_state, summary=None):
+        """Stores the files of the given output directory which were created or modified since the given directory state with the given key,
+           together with the given summary of the generated code returned by the backend"""
+        state = get_directory_state(out_dir)
+        filenames = [filename for filename, file_state in state.items() if previous_state.get(filename) != file_state]
+
+        def write_entry(entry_directory):
+            for filename in filenames:
+                target = os.path.join(entry_directory, OUTPUTS_DIRECTORY_NAME, filename)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                shutil.copyfile(os.path.join(out_dir, filename), target)
+            if (summary):
+                with open(os.path.join(entry_directory, SUMMARY_FILE_NAME), 'w') as file:
+                    json.dump(summary, file)
+        self.put(key, write_entry)
+
+    def evict(self):
+        """Removes the least recently used entries until the total size of the cache is within its size limit"""
+        entries = []
+        for name in os.listdir(self.directory):
+            entry_directory = os.path.join(self.directory, name)
+            if (name.startswith('.') or not os.path.isdir(entry_directory)):
+                continue
+            try:
+                entries.append((os.path.getmtime(entry_directory), get_directory_size(entry_directory), entry_directory))
+            except OSError:
+                #? The entry was evicted by a concurrent translation
+                continue
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, entry_directory in sorted(entries):
+            if (total_size <= self.max_size):
+                break
+            shutil.rmtree(entry_directory, ignore_errors=True)
+            total_size = total_size - size
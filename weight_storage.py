@@ -0,0 +1,77 @@
+import os
+import numpy as np
+
+#? Keys of the layer objects which hold weight values, batch normalization layers hold their parameters and moving statistics
+WEIGHT_KEYS = ['kernel_values', 'bias_values', 'gamma_values', 'beta_values', 'moving_mean_values', 'moving_variance_values']
+
+#? Arrays in the sidecar file are aligned to this number of bytes, so that they can be read with aligned SIMD loads
+SIDECAR_ALIGNMENT = 64
+
+def is_reference(value):
+    """Returns whether the given weight values are a reference to a sidecar file"""
+    return isinstance(value, dict) and 'file' in value
+
+def get_array(value):
+    """Returns the given weight values as numpy array, numpy arrays and memory-mapped arrays are returned without copying"""
+    if (is_reference(value)):
+        raise ValueError('Weight reference to "' + value['file'] + '" has not been loaded, see load_weights')
+    return np.asarray(value)
+
+def copy_layers(input):
+    """Returns a copy of the given intermediate format which shares everything but the layer objects with the input"""
+    output = dict(input)
+    output['config'] = dict(input['config'])
+    output['config']['layers'] = [dict(layer) for layer in input['config']['layers']]
+    return output
+
+def save_weights(input, filename, dtype='float32'):
+    """Writes the weight values of all layers to the given raw sidecar file and returns a copy of the input
+       in which the weight values are replaced by references. Floating point values are stored with the given dtype or keep their dtype
+       if dtype is None, integer values (e.g. quantized weights) keep their dtype. All values are stored in little endian byte order"""
+    output = copy_layers(input)
+    offset = 0
+    with open(filename, 'wb') as file:
+        for layer in output['config']['layers']:
+            for key in WEIGHT_KEYS:
+                if (key not in layer or is_reference(layer[key])):
+                    continue
+
+                array = np.asarray(layer[key])
+                if (array.dtype.kind == 'O' or (array.dtype.kind == 'f' and dtype is not None)):
+                    array = array.astype(dtype or np.float64)
+                array = np.ascontiguousarray(array, dtype=array.dtype.newbyteorder('<'))
+
+                #? Padding the previous array, so that each array starts at an aligned offset
+                padding = (-offset) % SIDECAR_ALIGNMENT
+                file.write(bytes(padding))
+                offset = offset + padding
+
+                file.write(array.tobytes())
+                layer[key] = {'file': os.path.basename(filename), 'offset': offset, 'shape': list(array.shape), 'dtype': array.dtype.name}
+                offset = offset + array.nbytes
+    return output
+
+def load_weights(input, directory):
+    """Returns a copy of the given input in which all references to sidecar files are replaced by read-only memory-mapped arrays.
+       The file names of the references are relative to the given directory"""
+    output = copy_layers(input)
+    for layer in output['config']['layers']:
+        for key in WEIGHT_KEYS:
+            if (key in layer and is_reference(layer[key])):
+                reference = layer[key]
+                dtype = np.dtype(reference['dtype']).newbyteorder('<')
+                shape = tuple(reference['shape'])
+                #? Empty arrays can not be memory-mapped
+                if (int(np.prod(shape)) == 0):
+                    layer[key] = np.zeros(shape, dtype=dtype)
+                else:
+                    layer[key] = np.memmap(os.path.join(directory, reference['file']), dtype=dtype, mode='r', offset=reference.get('offset', 0), shape=shape)
+    return output
+
+def json_default(value):
+    """Returns a json serializable representation of numpy values, used as default function of json.dump"""
+    if (isinstance(value, np.ndarray)):
+        return value.tolist()
+    if (isinstance(value, np.generic)):
+        return value.item()
+    raise TypeError('Object of type ' + type(value).__name__ + ' is not JSON serializable')